@@ -0,0 +1,111 @@
+"""
+expected value advice for buying and building. markov.MarkovBoard gives how often each square is landed on, which turns
+every rent level of a place into the rent an opponent pays per turn. every buy (for each set of the group's places the
+buyer already has) and every build is then worked out once per ruleset and opponent count, so the advice shown at a
+prompt is a dictionary lookup
+"""
+import argparse
+from itertools import combinations
+
+import main
+from markov import MarkovBoard
+
+ROLLS_PER_TURN = 1 + 1/6 + 1/36 # one roll, and another for each of up to two doubles
+
+_chains = {} # ruleset -> MarkovBoard of its board
+_advisors = {} # (ruleset, opponents) -> Advisor
+
+class Advice():
+	"""what a buy or build costs, the rent it adds per round of opponents' turns, and how many rounds it takes to pay back"""
+	def __init__(self, cost: int, income: float):
+		self.cost = cost
+		self.income = income
+		self.payback = cost / income if income > 0 else None
+
+	def describe(self) -> str:
+		if self.payback == None: return "it won't bring in any more rent"
+		return f"about £{self.income:.1f} more rent a round, paying back the £{self.cost} in {self.payback:.0f} rounds"
+
+class Advisor():
+	"""
+	every buy and build on a board, for a number of opponents. a round is every opponent taking one turn. mortgages
+	are ignored, so places count as earning whether or not they're mortgaged
+	"""
+	def __init__(self, opponents: int, chain: MarkovBoard = None):
+		self.opponents = opponents
+		self.chain = chain or MarkovBoard()
+		board = self.chain.tables.board
+
+		# rent an opponent pays per turn, by position and rent level
+		self.rents = {}
+		for place in board:
+			if isinstance(place, main.Utility): landings = self.chain.dice_landings[place.position]
+			elif isinstance(place, main.OwnablePlace): landings = self.chain.landings[place.position]
+			else: continue
+			self.rents[place.position] = tuple(float(landings * rent * ROLLS_PER_TURN * opponents) for rent in place.rent_table)
+
+		self.buys = {} # (position, positions of the group the buyer already has) -> Advice
+		self.builds = {} # (position, rent level) -> Advice of the next building
+		for place in board:
+			if not isinstance(place, main.OwnablePlace): continue
+			others = [other.position for other in place.group_places if other is not place]
+			for count in range(len(others) + 1):
+				for owned in combinations(others, count):
+					self.buys[(place.position, owned)] = self.buyAdvice(place, owned)
+			if isinstance(place, main.Property):
+				for level in range(1, len(place.rent_table) - 1):
+					income = self.rents[place.position][level + 1] - self.rents[place.position][level]
+					self.builds[(place.position, level)] = Advice(place.house_cost, income)
+
+	def rentLevel(self, place: main.OwnablePlace, owned: int) -> int:
+		"""the rent level of an unbuilt place whose owner has `owned` of its group"""
+		if isinstance(place, main.Property): return 1 if owned == len(place.group_places) else 0
+		return owned - 1
+
+	def buyAdvice(self, place: main.OwnablePlace, owned: tuple) -> Advice:
+		"""the rent gained by buying `place` with `owned` already, counting the rent it adds to them"""
+		before = sum(self.rents[position][self.rentLevel(place, len(owned))] for position in owned)
+		after = sum(self.rents[position][self.rentLevel(place, len(owned) + 1)] for position in owned + (place.position,))
+		return Advice(place.cost, after - before)
+
+	def adviseBuy(self, player: main.Player, place: main.OwnablePlace) -> Advice:
+		owned = tuple(other.position for other in place.group_places if other.owner is player and other is not place)
+		return self.buys[(place.position, owned)]
+
+	def adviseBuild(self, place: main.Property) -> Advice:
+		return self.builds.get((place.position, place.rent_level))
+
+def opponentsOf(player: main.Player) -> int:
+	return max(sum(not other.bankrupt for other in player.getPlayerList()) - 1, 1)
+
+def advisorFor(opponents: int) -> Advisor:
+	"""the Advisor for main.game's ruleset, worked out the first time it's asked for"""
+	ruleset = main.game.ruleset
+	key = (ruleset, opponents)
+	if key not in _advisors:
+		if ruleset not in _chains: _chains[ruleset] = MarkovBoard()
+		_advisors[key] = Advisor(opponents, _chains[ruleset])
+	return _advisors[key]
+
+def adviseBuy(player: main.Player, place: main.OwnablePlace) -> Advice:
+	return advisorFor(opponentsOf(player)).adviseBuy(player, place)
+
+def adviseBuild(place: main.Property) -> Advice:
+	return advisorFor(opponentsOf(place.owner)).adviseBuild(place)
+
+def run(argv: list = None) -> None:
+	parser = argparse.ArgumentParser(description="rounds to pay back buying each place and building on it")
+	parser.add_argument("-o", "--opponents", type=int, default=3)
+	args = parser.parse_args(argv)
+
+	advisor = advisorFor(args.opponents)
+	print(f"rounds to pay back, against {args.opponents} opponents (buying alone, buying the last of the group, each building)")
+	for place in advisor.chain.tables.board:
+		if not isinstance(place, main.OwnablePlace): continue
+		others = tuple(other.position for other in place.group_places if other is not place)
+		paybacks = [advisor.buys[(place.position, ())], advisor.buys[(place.position, others)]]
+		if isinstance(place, main.Property): paybacks += [advisor.builds[(place.position, level)] for level in range(1, len(place.rent_table) - 1)]
+		print(f"{place.position:>2} {place.name:<25}" + "".join(f"{advice.payback:>7.0f}" if advice.payback != None else "      -" for advice in paybacks))
+
+if __name__ == "__main__":
+	run()
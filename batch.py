@@ -0,0 +1,494 @@
+"""
+plays thousands of games at once in lockstep with numpy. every step each game rolls once for whoever's turn it is, and
+the dice, moving, jail, cards, buying, auctions, trades, building, rent, mortgages and bankruptcy of all of them are
+array operations. a game that finishes is added to the Stats and a new one is started in its row, so the arrays stay
+full until the last games.
+
+the rules are those BotPlayer plays by, for statistics rather than replays. cards are drawn at random from the ones
+still in the pile instead of from a shuffled pile, and each policy is its reserve in RESERVES rather than a Policy.
+players in debt mortgage and sell buildings as in Player.raiseMoney, and whoever they owed gets what's left if they
+still go bankrupt. a game that reaches max_turns is won by the richest player, as in simulation.gameResult
+"""
+import argparse
+import time
+
+import numpy as np
+
+import main
+from ruleset import DEFAULT_RULESET, loadRuleset
+from simulation import GameResult, Stats, printSummary
+
+RESERVES = {"buy-all": 0, "reserve": 200, "never-buy": 1 << 30} # money each policy keeps back when buying or building
+NOBODY = -1 # owner of a place the bank has, and the creditor of a debt to the bank
+NO_MOVE = -1 # card destinations
+TO_JAIL = -2
+HOTEL = main.HOTEL_LEVEL
+JAIL_TURNS = 3
+
+class BatchTables():
+	"""the board of a ruleset as arrays indexed by square, read from a board of its own"""
+	def __init__(self, ruleset: object):
+		board = main.Game(ruleset).board
+		size = len(board)
+		self.size = size
+		self.starting_money = ruleset.starting_money
+		self.salary = board[0].salary
+		self.jail_position = next(place.position for place in board if isinstance(place, main.Jail))
+
+		self.ownable = np.array([isinstance(place, main.OwnablePlace) for place in board])
+		self.property = np.array([isinstance(place, main.Property) for place in board])
+		self.utility = np.array([isinstance(place, main.Utility) for place in board])
+		self.go_to_jail = np.array([isinstance(place, main.GoToJail) for place in board])
+		self.tax = np.array([place.to_pay if isinstance(place, main.TaxPlace) else 0 for place in board], dtype=np.int64)
+		self.cost = np.array([getattr(place, "cost", 0) for place in board], dtype=np.int64)
+		self.house_cost = np.array([getattr(place, "house_cost", 0) for place in board], dtype=np.int64)
+		self.hotel_cost = np.array([getattr(place, "hotel_cost", 0) for place in board], dtype=np.int64)
+		self.mortgage_value = self.cost // 2
+		self.unmortgage_cost = self.mortgage_value + self.mortgage_value // 10
+
+		# rent by rent level, as in OwnablePlace.rent_table. utilities hold dice multipliers
+		self.rents = np.zeros((size, HOTEL + 2), dtype=np.int64)
+		self.members = np.zeros((size, size), dtype=bool) # square -> the squares of its group
+		for place in board:
+			if not isinstance(place, main.OwnablePlace): continue
+			self.rents[place.position, :len(place.rent_table)] = place.rent_table
+			for other in place.group_places: self.members[place.position, other.position] = True
+		self.group_size = self.members.sum(axis=1)
+		self.group_matrix = self.members.astype(np.float32) # counts group members a player owns with one matrix product
+		self.nearly_complete = np.where(self.group_size > 1, self.group_size - 1, -1) # owned of a group one place short
+
+		# each card square gets a row of its deck's cards, get out of jail free cards last so the ones players hold can
+		# be left out of a draw, padded with zeros
+		decks = [getattr(place, "deck", None) for place in board]
+		unique = list({id(deck): deck for deck in decks if deck != None}.values())
+		self.decks = len(unique)
+		self.deck = np.array([unique.index(deck) if deck != None else -1 for deck in decks], dtype=np.intp)
+		width = max(len(deck.cards) for deck in unique)
+		self.deck_size = np.array([len(deck.cards) if deck != None else 0 for deck in decks])
+		self.card_move = np.full((size, width), NO_MOVE, dtype=np.intp)
+		self.card_money = np.zeros((size, width), dtype=np.int64)
+		self.card_collect = np.zeros((size, width), dtype=np.int64) # from every other player
+		self.card_lands = np.zeros((size, width), dtype=bool) # whether the player lands on where they're moved
+		self.card_keep = np.zeros((size, width), dtype=bool) # get out of jail free
+		for position, deck in enumerate(decks):
+			if deck == None: continue
+			cards = sorted(deck.cards, key=lambda card: isinstance(card, main.jailFreeCard))
+			for index, card in enumerate(cards): self.addCard(position, index, card)
+
+	def addCard(self, position: int, index: int, card: main.Card) -> None:
+		if isinstance(card, main.goCard):
+			self.card_move[position, index] = 0
+			self.card_money[position, index] = card.salary
+		elif isinstance(card, main.collectCard): self.card_money[position, index] = card.collect_amount
+		elif isinstance(card, main.payCard): self.card_money[position, index] = -card.pay_amount
+		elif isinstance(card, main.jailCard): self.card_move[position, index] = TO_JAIL
+		elif isinstance(card, main.collectPlayersCard): self.card_collect[position, index] = card.collect_amount
+		elif isinstance(card, main.jailFreeCard): self.card_keep[position, index] = True
+		elif isinstance(card, main.AdvanceCard):
+			self.card_move[position, index] = card.jump_position
+			self.card_lands[position, index] = True
+			if card.collect_go and position > card.jump_position: self.card_money[position, index] = card.salary
+
+class BatchEngine():
+	"""
+	plays `games` games between bots with the policies in `policy_names`, `batch_size` of them at a time. one row of
+	the arrays is one game, and one column of the per player arrays is one seat
+	"""
+	def __init__(self, policy_names: list, games: int, batch_size: int = 4096, max_turns: int = 1000,
+							 seed: int = None, ruleset: object = None):
+		self.tables = BatchTables(ruleset or loadRuleset(DEFAULT_RULESET))
+		self.reserves = np.array([RESERVES[name] for name in policy_names], dtype=np.int64)
+		self.seats = len(policy_names)
+		self.games = games
+		self.max_turns = max_turns
+		self.rng = np.random.default_rng(seed)
+		self.stats = Stats()
+		self.started = 0
+
+		rows = min(batch_size, games)
+		size = self.tables.size
+		self.money = np.zeros((rows, self.seats), dtype=np.int64)
+		self.position = np.zeros((rows, self.seats), dtype=np.intp)
+		self.in_jail = np.zeros((rows, self.seats), dtype=bool)
+		self.jail_turns = np.zeros((rows, self.seats), dtype=np.int8)
+		self.jail_cards = np.zeros((rows, self.seats, self.tables.decks), dtype=np.int8) # held, by the deck they're from
+		self.alive = np.zeros((rows, self.seats), dtype=bool)
+		self.creditor = np.zeros((rows, self.seats), dtype=np.intp) # who a player in debt owes, NOBODY for the bank
+		self.bankrupt_turn = np.zeros((rows, self.seats), dtype=np.int64)
+		self.owner = np.zeros((rows, size), dtype=np.intp)
+		self.houses = np.zeros((rows, size), dtype=np.int8) # HOTEL for a hotel
+		self.mortgaged = np.zeros((rows, size), dtype=bool)
+		self.bank_houses = np.zeros(rows, dtype=np.int64)
+		self.bank_hotels = np.zeros(rows, dtype=np.int64)
+		self.landings = np.zeros((rows, size), dtype=np.int64)
+		self.seat = np.zeros(rows, dtype=np.intp) # whose turn it is
+		self.doubles = np.zeros(rows, dtype=np.int8) # rolled this turn
+		self.turns = np.zeros(rows, dtype=np.int64)
+		self.live = np.zeros(rows, dtype=bool) # whether the row has a game in it
+
+		# the 36 equally likely rolls of two dice, so a roll is one random number
+		first, second = np.divmod(np.arange(36), 6)
+		self.roll_totals = first + second + 2
+		self.roll_doubles = first == second
+
+		self.start(np.arange(rows))
+
+	def start(self, rows: np.ndarray) -> None:
+		"""sets up a new game in each of `rows`"""
+		self.money[rows] = self.tables.starting_money
+		self.position[rows] = 0
+		self.in_jail[rows] = False
+		self.jail_turns[rows] = 0
+		self.jail_cards[rows] = 0
+		self.alive[rows] = True
+		self.creditor[rows] = NOBODY
+		self.bankrupt_turn[rows] = -1
+		self.owner[rows] = NOBODY
+		self.houses[rows] = 0
+		self.mortgaged[rows] = False
+		self.bank_houses[rows] = main.BANK_HOUSES
+		self.bank_hotels[rows] = main.BANK_HOTELS
+		self.landings[rows] = 0
+		self.seat[rows] = 0
+		self.doubles[rows] = 0
+		self.turns[rows] = 0
+		self.live[rows] = True
+		self.started += len(rows)
+
+	def run(self) -> Stats:
+		while self.live.any(): self.step()
+		return self.stats
+
+	def step(self) -> None:
+		"""one roll in every game. the player rolls again next step after a double, as in Player.rollTurn"""
+		rows = np.flatnonzero(self.live)
+		seat = self.seat[rows]
+		starting = self.doubles[rows] == 0
+		self.startTurn(rows[starting], seat[starting])
+		roll = self.rng.integers(0, 36, size=(2, len(rows)))
+
+		# a player out of jail turns walks out and rolls. the others roll for a double to escape, then roll again to move
+		jailed = self.in_jail[rows, seat]
+		freed = jailed & (self.jail_turns[rows, seat] == 0)
+		jailed &= ~freed
+		escaped = jailed & self.roll_doubles[roll[0]]
+		self.jail_turns[rows[jailed], seat[jailed]] -= 1
+		out = freed | escaped
+		self.in_jail[rows[out], seat[out]] = False
+		roll = np.where(jailed, roll[1], roll[0])
+		total = self.roll_totals[roll]
+		double = self.roll_doubles[roll] & ~jailed # no rolling again after escaping
+
+		stays = jailed & ~escaped
+		self.doubles[rows] += double
+		speeding = ~stays & (self.doubles[rows] == 3)
+		self.goToJail(rows[speeding], seat[speeding])
+
+		moving = ~stays & ~speeding
+		moved_rows, moved_seats, moved_totals = rows[moving], seat[moving], total[moving]
+		position = self.position[moved_rows, moved_seats] + moved_totals
+		passed_go = position >= self.tables.size
+		position[passed_go] -= self.tables.size
+		self.money[moved_rows, moved_seats] += passed_go * self.tables.salary
+		self.position[moved_rows, moved_seats] = position
+		self.land(moved_rows, moved_seats, moved_totals)
+
+		in_debt = self.alive[rows] & (self.money[rows] < 0)
+		if in_debt.any():
+			for seat_in_debt in range(self.seats):
+				debt_rows = rows[in_debt[:, seat_in_debt]]
+				if len(debt_rows): self.raiseMoney(debt_rows, np.full(len(debt_rows), seat_in_debt))
+			broke = self.alive[rows] & (self.money[rows] < 0)
+			if broke.any(): self.bankrupt(rows, broke)
+
+		again = moving & double & ~self.in_jail[rows, seat] & self.alive[rows, seat]
+		over = ~again
+		self.endTurn(rows[over], seat[over])
+
+	def startTurn(self, rows: np.ndarray, seats: np.ndarray) -> None:
+		"""
+		what BotPlayer.manageAssets and Player.startTurn do before the first roll: offer a trade, pay off mortgages and
+		use a get out of jail free card
+		"""
+		tables = self.tables
+		owner = self.owner[rows]
+		theirs = owner == seats[:, None]
+
+		# Policy.proposeTrade: the price of the last place of a group times TRADE_PREMIUM, which its owner always takes
+		owned = theirs.astype(np.float32) @ tables.group_matrix
+		missing = (owned == tables.nearly_complete) & ~theirs & (owner != NOBODY)
+		nearly = missing.any(axis=1)
+		if nearly.any():
+			trade_rows, trade_seats, missing = rows[nearly], seats[nearly], missing[nearly]
+			cash = tables.cost * main.TRADE_PREMIUM
+			missing &= (self.money[trade_rows, trade_seats] - self.reserves[trade_seats])[:, None] >= cash
+			trades = missing.any(axis=1)
+			square = missing.argmax(axis=1)[trades]
+			trade_rows, trade_seats = trade_rows[trades], trade_seats[trades]
+			self.money[trade_rows, self.owner[trade_rows, square]] += cash[square]
+			self.money[trade_rows, trade_seats] -= cash[square]
+			self.owner[trade_rows, square] = trade_seats
+			theirs[np.flatnonzero(nearly)[trades], square] = True
+
+		# mortgages are paid off in board order while the money lasts
+		mortgaged = theirs & self.mortgaged[rows]
+		pays_off = mortgaged.any(axis=1)
+		if pays_off.any():
+			mortgage_rows, mortgage_seats, mortgaged = rows[pays_off], seats[pays_off], mortgaged[pays_off]
+			costs = np.where(mortgaged, tables.unmortgage_cost, 0)
+			budget = self.money[mortgage_rows, mortgage_seats] - self.reserves[mortgage_seats]
+			paid_off = mortgaged & (np.cumsum(costs, axis=1) <= budget[:, None])
+			self.mortgaged[mortgage_rows] &= ~paid_off
+			self.money[mortgage_rows, mortgage_seats] -= (costs * paid_off).sum(axis=1)
+
+		use = self.in_jail[rows, seats] & (self.jail_turns[rows, seats] > 0)
+		use[use] = self.jail_cards[rows[use], seats[use]].any(axis=1)
+		if use.any():
+			use_rows, use_seats = rows[use], seats[use]
+			deck = self.jail_cards[use_rows, use_seats].argmax(axis=1)
+			self.jail_cards[use_rows, use_seats, deck] -= 1
+			self.in_jail[use_rows, use_seats] = False
+
+	def land(self, rows: np.ndarray, seats: np.ndarray, totals: np.ndarray) -> None:
+		"""does what the squares the players moved to ask of them"""
+		tables = self.tables
+		position = self.position[rows, seats]
+		self.landings[rows, position] += 1
+
+		cards = tables.deck_size[position] > 0
+		if cards.any():
+			card_rows, card_seats, card_squares = rows[cards], seats[cards], position[cards]
+			deck = tables.deck[card_squares]
+			left = tables.deck_size[card_squares] - self.jail_cards[card_rows, :, deck].sum(axis=1)
+			card = (self.rng.random(len(card_rows)) * left).astype(np.intp)
+			move = tables.card_move[card_squares, card]
+			self.money[card_rows, card_seats] += tables.card_money[card_squares, card]
+			moves = move >= 0
+			self.position[card_rows[moves], card_seats[moves]] = move[moves]
+			lands = tables.card_lands[card_squares, card]
+			self.landings[card_rows[lands], move[lands]] += 1
+			jail = move == TO_JAIL
+			self.goToJail(card_rows[jail], card_seats[jail])
+			keep = tables.card_keep[card_squares, card]
+			self.jail_cards[card_rows[keep], card_seats[keep], deck[keep]] += 1
+			collect = tables.card_collect[card_squares, card]
+			collects = collect > 0
+			if collects.any(): self.collectFromPlayers(card_rows[collects], card_seats[collects], collect[collects])
+			position = self.position[rows, seats]
+
+		jail = tables.go_to_jail[position]
+		self.goToJail(rows[jail], seats[jail])
+		self.money[rows, seats] -= tables.tax[position]
+		ownable = tables.ownable[position]
+		self.landOwnable(rows[ownable], seats[ownable], position[ownable], totals[ownable])
+
+	def landOwnable(self, rows: np.ndarray, seats: np.ndarray, position: np.ndarray, totals: np.ndarray) -> None:
+		"""buys or auctions the place, pays rent on it or builds on it"""
+		tables = self.tables
+		owner = self.owner[rows, position]
+		owned = ((self.owner[rows] == owner[:, None]) & tables.members[position]).sum(axis=1) # of the group, by the owner
+		houses = self.houses[rows, position]
+		money = self.money[rows, seats]
+		reserve = self.reserves[seats]
+
+		cost = tables.cost[position]
+		unowned = owner == NOBODY
+		buy = unowned & (money >= cost) & (money - cost >= reserve)
+		self.owner[rows[buy], position[buy]] = seats[buy]
+		self.money[rows[buy], seats[buy]] -= cost[buy]
+		auctioned = unowned & ~buy
+		if auctioned.any(): self.auction(rows[auctioned], seats[auctioned], position[auctioned])
+
+		pays = ~unowned & (owner != seats) & ~self.mortgaged[rows, position]
+		if pays.any():
+			rent_rows, rent_seats, rent_owners, rent_squares = rows[pays], seats[pays], owner[pays], position[pays]
+			complete = owned[pays] == tables.group_size[rent_squares]
+			level = np.where(tables.property[rent_squares], np.where(houses[pays] > 0, houses[pays] + 1, complete), owned[pays] - 1)
+			rent = tables.rents[rent_squares, level] * np.where(tables.utility[rent_squares], totals[pays], 1)
+			self.money[rent_rows, rent_owners] += self.payMoney(rent_rows, rent_seats, rent, rent_owners)
+
+		# houses go up evenly across a complete, unmortgaged group, and only while the bank has them
+		house_cost = tables.house_cost[position]
+		builds = (owner == seats) & tables.property[position] & (owned == tables.group_size[position]) & (houses < HOTEL) \
+			& (money >= house_cost) & (money - house_cost >= reserve) \
+			& np.where(houses < 4, self.bank_houses[rows] > 0, self.bank_hotels[rows] > 0)
+		builds[builds] = ~(self.mortgaged[rows[builds]] & tables.members[position[builds]]).any(axis=1)
+		if builds.any():
+			build_rows, build_squares = rows[builds], position[builds]
+			fewest = np.where(tables.members[build_squares], self.houses[build_rows], HOTEL + 1).min(axis=1)
+			even = houses[builds] == fewest
+			build_rows, build_squares, build_seats = build_rows[even], build_squares[even], seats[builds][even]
+			hotel = self.houses[build_rows, build_squares] == 4
+			self.houses[build_rows, build_squares] += 1
+			self.bank_houses[build_rows] += np.where(hotel, 4, -1)
+			self.bank_hotels[build_rows] -= hotel
+			self.money[build_rows, build_seats] -= tables.house_cost[build_squares]
+
+	def auction(self, rows: np.ndarray, seats: np.ndarray, position: np.ndarray) -> None:
+		"""
+		sells the places the players in `seats` didn't buy as main.auction does. everyone still in bids what their
+		policy would, asked from the player who landed round, and the first highest bid wins at £1 over the second
+		"""
+		order = (seats[:, None] + np.arange(self.seats)) % self.seats
+		money = self.money[rows[:, None], order]
+		bids = np.minimum(self.tables.cost[position][:, None], money - self.reserves[order])
+		bids = np.where(self.alive[rows[:, None], order] & (money > 0), np.clip(bids, 0, money), 0)
+		first = bids.argmax(axis=1)
+		every = np.arange(len(rows))
+		best = bids[every, first]
+		second = np.sort(bids, axis=1)[:, -2] if self.seats > 1 else np.zeros_like(best)
+		sold = best > 0
+		winners = order[every, first][sold]
+		self.owner[rows[sold], position[sold]] = winners
+		self.money[rows[sold], winners] -= np.minimum(second + 1, best)[sold]
+
+	def payMoney(self, rows: np.ndarray, seats: np.ndarray, amounts: np.ndarray, creditors: np.ndarray) -> np.ndarray:
+		"""
+		takes money owed to other players, raising more if it's needed, as Player.payMoney does. returns how much of it
+		was covered
+		"""
+		debt = np.maximum(-self.money[rows, seats], 0)
+		self.money[rows, seats] -= amounts
+		self.raiseMoney(rows, seats)
+		self.creditor[rows, seats] = np.where(self.money[rows, seats] < 0, creditors, NOBODY) # only while they're in debt
+		return np.clip(amounts - np.maximum(-self.money[rows, seats], 0) + debt, 0, amounts)
+
+	def raiseMoney(self, rows: np.ndarray, seats: np.ndarray) -> None:
+		"""
+		mortgages places and sells buildings until the players aren't in debt or have nothing left, as in
+		Player.raiseMoney. places furthest from a whole group are mortgaged first, and buildings are only sold once
+		there's nothing left to mortgage, from the most built up place. `rows` mustn't repeat
+		"""
+		tables = self.tables
+		while True:
+			debt = self.money[rows, seats] < 0
+			rows, seats = rows[debt], seats[debt]
+			if not len(rows): return
+			theirs = self.owner[rows] == seats[:, None]
+			built = (self.houses[rows] > 0).astype(np.float32) @ tables.group_matrix > 0
+			mortgageable = theirs & ~self.mortgaged[rows] & ~built
+			mortgages = mortgageable.any(axis=1)
+			sells = ~mortgages & (theirs & (self.houses[rows] > 0)).any(axis=1)
+			if not (mortgages | sells).any(): return
+
+			if mortgages.any():
+				mortgage_rows, mortgage_seats, mortgageable = rows[mortgages], seats[mortgages], mortgageable[mortgages]
+				every = np.arange(len(mortgage_rows))[:, None]
+				owned = theirs[mortgages].astype(np.float32) @ tables.group_matrix
+				key = np.where(mortgageable, owned * (tables.cost.max() + 1) + tables.cost, np.inf)
+				order = np.argsort(key, axis=1, kind="stable")
+				values = np.where(mortgageable, tables.mortgage_value, 0)[every, order]
+				short = -self.money[mortgage_rows, mortgage_seats]
+				mortgage = np.zeros_like(mortgageable)
+				mortgage[every, order] = mortgageable[every, order] & (np.cumsum(values, axis=1) - values < short[:, None])
+				self.mortgaged[mortgage_rows] |= mortgage
+				self.money[mortgage_rows, mortgage_seats] += (mortgage * tables.mortgage_value).sum(axis=1)
+
+			if sells.any():
+				sell_rows, sell_seats = rows[sells], seats[sells]
+				levels = np.where(theirs[sells], self.houses[sell_rows], -1)
+				square = levels.argmax(axis=1)
+				hotel = levels[np.arange(len(sell_rows)), square] == HOTEL
+				houses = np.where(hotel, np.minimum(4, self.bank_houses[sell_rows]), self.houses[sell_rows, square] - 1)
+				half_house = tables.house_cost[square] // 2
+				self.money[sell_rows, sell_seats] += np.where(hotel, tables.hotel_cost[square] // 2 + (4 - houses) * half_house, half_house)
+				self.bank_hotels[sell_rows] += hotel
+				self.bank_houses[sell_rows] += np.where(hotel, -houses, 1)
+				self.houses[sell_rows, square] = houses
+
+	def collectFromPlayers(self, rows: np.ndarray, seats: np.ndarray, amounts: np.ndarray) -> None:
+		for payer in range(self.seats):
+			pays = self.alive[rows, payer] & (seats != payer)
+			if not pays.any(): continue
+			pay_rows = rows[pays]
+			paid = self.payMoney(pay_rows, np.full(len(pay_rows), payer), amounts[pays], seats[pays])
+			self.money[pay_rows, seats[pays]] += paid
+
+	def goToJail(self, rows: np.ndarray, seats: np.ndarray) -> None:
+		self.in_jail[rows, seats] = True
+		self.position[rows, seats] = self.tables.jail_position
+		self.jail_turns[rows, seats] = JAIL_TURNS
+
+	def bankrupt(self, rows: np.ndarray, broke: np.ndarray) -> None:
+		"""
+		takes players in debt out of their games, as Player.goBankrupt does. whoever they owed gets their places and
+		held cards, or the bank takes them back if it was the bank
+		"""
+		for seat in range(self.seats):
+			seat_rows = rows[broke[:, seat]]
+			if not len(seat_rows): continue
+			creditor = self.creditor[seat_rows, seat]
+			to_player = creditor != NOBODY
+			to_player[to_player] = self.alive[seat_rows[to_player], creditor[to_player]]
+
+			player_rows, to = seat_rows[to_player], creditor[to_player]
+			self.owner[player_rows] = np.where(self.owner[player_rows] == seat, to[:, None], self.owner[player_rows])
+			self.jail_cards[player_rows, to] += self.jail_cards[player_rows, seat]
+
+			bank_rows = seat_rows[~to_player]
+			theirs = self.owner[bank_rows] == seat
+			houses = np.where(theirs, self.houses[bank_rows], 0)
+			self.bank_hotels[bank_rows] += (houses == HOTEL).sum(axis=1)
+			self.bank_houses[bank_rows] += np.where(houses < HOTEL, houses, 0).sum(axis=1)
+			self.houses[bank_rows] -= houses
+			self.mortgaged[bank_rows] &= ~theirs
+			self.owner[bank_rows] = np.where(theirs, NOBODY, self.owner[bank_rows])
+
+			self.jail_cards[seat_rows, seat] = 0
+			self.alive[seat_rows, seat] = False
+			self.bankrupt_turn[seat_rows, seat] = self.turns[seat_rows] + 1 # the turn being played
+
+	def endTurn(self, rows: np.ndarray, seats: np.ndarray) -> None:
+		"""moves on to the next player still in, then scores and replaces the games that have finished"""
+		self.turns[rows] += 1
+		self.doubles[rows] = 0
+		following = (seats[:, None] + np.arange(1, self.seats + 1)) % self.seats
+		first_alive = self.alive[rows[:, None], following].argmax(axis=1)
+		self.seat[rows] = following[np.arange(len(rows)), first_alive]
+
+		finished = rows[(self.alive[rows].sum(axis=1) <= 1) | (self.turns[rows] >= self.max_turns)]
+		if not len(finished): return
+		for row in finished: self.stats.add(self.result(row))
+		self.live[finished] = False
+		refill = finished[:max(self.games - self.started, 0)]
+		if len(refill): self.start(refill)
+
+	def netWorth(self, row: int) -> np.ndarray:
+		"""Player.netWorth of each seat in a game"""
+		tables = self.tables
+		values = np.where(self.mortgaged[row], tables.mortgage_value, tables.cost) + self.houses[row] * tables.house_cost
+		return self.money[row] + np.array([values[self.owner[row] == seat].sum() for seat in range(self.seats)])
+
+	def result(self, row: int) -> GameResult:
+		letters = [chr(ord("a") + seat) for seat in range(self.seats)]
+		alive = np.flatnonzero(self.alive[row])
+		winner = letters[alive[self.netWorth(row)[alive].argmax()]] if len(alive) else None
+		balances = {letter: int(money) for letter, money in zip(letters, self.money[row])}
+		bankrupt_turns = {letter: int(turn) for letter, turn in zip(letters, self.bankrupt_turn[row]) if turn >= 0}
+		return GameResult(winner, int(self.turns[row]), balances, bankrupt_turns, self.landings[row].tolist(), len(alive) > 1)
+
+def playBatch(games: int, policy_names: list, max_turns: int = 1000, seed: int = None,
+							batch_size: int = 4096, ruleset_name: str = None) -> Stats:
+	ruleset = loadRuleset(ruleset_name or DEFAULT_RULESET)
+	return BatchEngine(policy_names, games, batch_size, max_turns, seed, ruleset).run()
+
+def run(argv: list = None) -> None:
+	parser = argparse.ArgumentParser(description="play many monopoly games between bots at once with numpy")
+	parser.add_argument("-n", "--games", type=int, default=10000)
+	parser.add_argument("-p", "--players", type=int, default=4)
+	parser.add_argument("--policy", choices=RESERVES, action="append", dest="policies",
+											help="policy for each seat, repeat to give seats different policies")
+	parser.add_argument("--max-turns", type=int, default=1000)
+	parser.add_argument("-s", "--seed", type=int, default=0)
+	parser.add_argument("-b", "--batch-size", type=int, default=4096, help="games played at once")
+	parser.add_argument("-r", "--ruleset", help="a board from rulesets/ or the path of a ruleset json file (default uk)")
+	args = parser.parse_args(argv)
+	names = args.policies or ["buy-all"]
+	policy_names = [names[i % len(names)] for i in range(args.players)]
+
+	start = time.perf_counter()
+	stats = playBatch(args.games, policy_names, args.max_turns, args.seed, args.batch_size, args.ruleset)
+	printSummary(stats, time.perf_counter() - start)
+
+if __name__ == "__main__":
+	run()
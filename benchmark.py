@@ -0,0 +1,141 @@
+"""
+times the main paths of the game and compares them against a saved baseline, failing when one has regressed by more
+than the threshold. save a baseline on the machine it'll be compared on with --save
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import main
+from main import BotPlayer, Policy
+from simulation import playChunk, playGame
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "benchmark-baseline.json")
+LOWER_IS_BETTER = ("bytes",)
+
+def best(function: object, repeat: int) -> float:
+	"""the fastest of `repeat` timings of function(), in seconds"""
+	times = []
+	for _ in range(repeat):
+		gc.collect()
+		start = time.perf_counter()
+		function()
+		times.append(time.perf_counter() - start)
+	return min(times)
+
+def benchmarkGames(games: int, players: int, repeat: int) -> dict:
+	"""games and turns per second of bots playing whole prompt free games"""
+	turns = playChunk((0, games, ["buy-all"]*players, 1000, 0, None)).turns
+	seconds = best(lambda: playChunk((0, games, ["buy-all"]*players, 1000, 0, None)), repeat)
+	return {"games_per_second": games/seconds, "turns_per_second": turns/seconds}
+
+def benchmarkBatch(games: int, players: int, repeat: int) -> dict:
+	"""games and turns per second of batch.BatchEngine playing the games of benchmarkGames in lockstep"""
+	from batch import playBatch # needs numpy, so left out of runBenchmarks without it
+	turns = playBatch(games, ["buy-all"]*players, 1000, 0).turns
+	seconds = best(lambda: playBatch(games, ["buy-all"]*players, 1000, 0), repeat)
+	return {"batch_games_per_second": games/seconds, "batch_turns_per_second": turns/seconds}
+
+def benchmarkRendering(renders: int, repeat: int) -> dict:
+	"""
+	BoardDisplayer.printBoard per second into a null sink, redrawing after a move and redrawing the whole board. it
+	draws in colour on a game of its own, and puts main's colours and game back after
+	"""
+	colours = (main.Text, main.Back, main.Style, dict(main.colour_backs))
+	live_game = main.game
+	stdout = sys.stdout
+	try:
+		main.enableColour()
+		main.game = main.Game()
+		players = [BotPlayer(letter, Policy()) for letter in "abcd"]
+		displayer = main.BoardDisplayer()
+		displayer.setPositionIndex(main.setupBoard(players))
+
+		def moves() -> None:
+			for i in range(renders):
+				player = players[i % len(players)]
+				player.position = (player.position + 7) % len(main.game.board)
+				displayer.printBoard()
+
+		def redraws() -> None:
+			for _ in range(renders):
+				displayer.redraw()
+				displayer.printBoard()
+
+		with open(os.devnull, "w") as null:
+			sys.stdout = null
+			return {"renders_per_second": renders/best(moves, repeat), "full_renders_per_second": renders/best(redraws, repeat)}
+	finally:
+		sys.stdout = stdout
+		main.game = live_game
+		main.Text, main.Back, main.Style = colours[:3]
+		main.colour_backs.clear()
+		main.colour_backs.update(colours[3])
+
+def benchmarkMemory(player_counts: range) -> dict:
+	"""the most memory a game allocates while it's played, for each player count"""
+	results = {}
+	for players in player_counts:
+		gc.collect()
+		tracemalloc.start()
+		playGame([Policy()]*players, 1000, 0)
+		results[f"peak_bytes_{players}_players"] = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+	return results
+
+def runBenchmarks(games: int = 50, renders: int = 2000, repeat: int = 3) -> dict:
+	results = {}
+	results.update(benchmarkGames(games, 4, repeat))
+	try: results.update(benchmarkBatch(games*20, 4, repeat))
+	except ImportError: pass
+	results.update(benchmarkRendering(renders, repeat))
+	results.update(benchmarkMemory(range(2, 9)))
+	return results
+
+def regressions(results: dict, baseline: dict, threshold: float) -> list:
+	"""(name, baseline, result, change) for each result worse than its baseline by more than `threshold`"""
+	worse = []
+	for name, expected in baseline.items():
+		if name not in results or not expected: continue
+		change = (results[name] - expected) / expected
+		if any(marker in name for marker in LOWER_IS_BETTER): change = -change
+		if change < -threshold: worse.append((name, expected, results[name], change))
+	return worse
+
+def run(argv: list = None) -> None:
+	parser = argparse.ArgumentParser(description="benchmark the game loop and rendering against a baseline")
+	parser.add_argument("-b", "--baseline", default=BASELINE_PATH)
+	parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+	parser.add_argument("-t", "--threshold", type=float, default=0.1, help="allowed slowdown as a fraction, 0.1 = 10%%")
+	parser.add_argument("-n", "--games", type=int, default=50)
+	parser.add_argument("-r", "--renders", type=int, default=2000)
+	parser.add_argument("--repeat", type=int, default=3)
+	args = parser.parse_args(argv)
+
+	results = runBenchmarks(args.games, args.renders, args.repeat)
+	baseline = None
+	if os.path.exists(args.baseline) and not args.save:
+		with open(args.baseline) as file: baseline = json.load(file)
+
+	for name, value in results.items():
+		line = f"{name:<28}{value:>16,.1f}"
+		if baseline and baseline.get(name): line += f"  {(value - baseline[name]) / baseline[name]:+.1%}"
+		print(line)
+
+	if args.save or baseline == None:
+		os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+		with open(args.baseline, "w") as file: json.dump(results, file, indent=1)
+		print(f"saved the baseline to {args.baseline}")
+		return
+
+	worse = regressions(results, baseline, args.threshold)
+	for name, expected, result, change in worse:
+		print(f"regression: {name} {result:,.1f} against a baseline of {expected:,.1f} ({change:+.1%})")
+	if worse: sys.exit(1)
+
+if __name__ == "__main__":
+	run()
@@ -0,0 +1,106 @@
+"""
+shows a game's board to any number of viewers. each board state is rendered and encoded once, as the squares that
+changed since the last frame, and the same bytes are queued for every viewer. queues are bounded: a viewer that falls
+a whole queue behind has it swapped for a keyframe of the latest frame, which redraws the board from nothing, so a slow
+viewer costs a dropped frame rather than memory or time at the table
+"""
+import asyncio
+import json
+
+import main
+
+VIEWER_QUEUE = 64 # frames a viewer can fall behind by before it's dropped to a keyframe
+
+class Frame():
+	"""one board state. the diff is drawn once, and the keyframe only if a viewer needs one"""
+	def __init__(self, displayer: main.BoardDisplayer, number: int, cells: list, previous: list = None):
+		self.displayer = displayer
+		self.number = number
+		self.cells = cells
+		self.full = previous == None # the diff from nothing is already a keyframe
+		self.diff = displayer.drawCells(cells, previous)
+		self._lines = {} # key -> encoded message
+
+	def line(self, key: bool = False) -> bytes:
+		"""the frame as a json line for a viewer, the keyframe if `key`, encoded the first time it's asked for"""
+		key = key or self.full
+		if key not in self._lines:
+			data = self.displayer.drawCells(self.cells) if key else self.diff
+			message = {"type": "frame", "number": self.number, "key": key, "data": data}
+			self._lines[key] = json.dumps(message).encode() + b"\n"
+		return self._lines[key]
+
+class Viewer():
+	"""one viewer's frames waiting to be sent. None is queued once it's closed"""
+	def __init__(self, limit: int = VIEWER_QUEUE):
+		self.queue = asyncio.Queue(limit)
+		self.needs_key = True # a new viewer can't use a diff
+		self.dropped = 0 # times it fell behind
+		self.closed = False
+
+	def push(self, frame: Frame) -> None:
+		if self.closed: return
+		try: self.queue.put_nowait(frame.line(self.needs_key))
+		except asyncio.QueueFull:
+			self.clear()
+			self.queue.put_nowait(frame.line(True))
+			self.dropped += 1
+		self.needs_key = False
+
+	def clear(self) -> None:
+		while not self.queue.empty(): self.queue.get_nowait()
+
+	async def get(self) -> bytes:
+		return await self.queue.get()
+
+	def close(self) -> None:
+		if self.closed: return
+		self.closed = True
+		self.clear()
+		self.queue.put_nowait(None)
+
+class Broadcaster():
+	"""
+	renders the board for a game's viewers. publish() after the board changes renders it once and queues the frame for
+	everyone. it uses main.game, so server tables publish while their game is active
+	"""
+	def __init__(self, displayer: main.BoardDisplayer = None, queue_size: int = VIEWER_QUEUE):
+		self.displayer = displayer or main.BoardDisplayer()
+		self.queue_size = queue_size
+		self.viewers = []
+		self.cells = None # the last frame published, None if there's been nobody to publish it to
+		self.frames = 0
+		self.joined = False # whether viewers have subscribed since the last frame
+
+	def subscribe(self) -> Viewer:
+		"""a new viewer, sent a keyframe with the next frame published"""
+		viewer = Viewer(self.queue_size)
+		self.viewers.append(viewer)
+		self.joined = True
+		return viewer
+
+	def unsubscribe(self, viewer: Viewer) -> None:
+		if viewer in self.viewers: self.viewers.remove(viewer)
+		viewer.close()
+
+	def publish(self) -> Frame:
+		"""renders the board and queues it for every viewer. returns the frame, or None if nobody's watching or nothing moved"""
+		if not self.viewers:
+			self.cells = None
+			return None
+		cells = self.displayer.renderCells()
+		if cells == self.cells and not self.joined: return None
+		frame = Frame(self.displayer, self.frames, cells, self.cells)
+		self.frames += 1
+		if cells == self.cells: # only new viewers need it
+			for viewer in self.viewers:
+				if viewer.needs_key: viewer.push(frame)
+		else:
+			for viewer in self.viewers: viewer.push(frame)
+		self.cells = cells
+		self.joined = False
+		return frame
+
+	def close(self) -> None:
+		for viewer in self.viewers: viewer.close()
+		self.viewers = []
@@ -0,0 +1,175 @@
+"""
+turn by turn histories of simulated games in a fixed width file that's read back memory mapped, so analysis can scan
+files far bigger than memory. every turn writes one row per seat with the whole board's owners and buildings, and a
+small index file beside it says where each game's rows start
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+import main
+from main import BotPlayer, ColourTypes
+from simulation import POLICIES, TurnOrder, gameSeed
+from state import GameState, NO_OWNER
+
+SQUARES = 40
+HOTEL = 5 # buildings value of a hotel
+
+ROW = np.dtype([
+	("game", "<u4"),
+	("turn", "<u4"),
+	("seat", "u1"),
+	("active", "u1"),
+	("in_jail", "u1"),
+	("position", "u1"),
+	("balance", "<i4"),
+	("owners", "i1", (SQUARES,)), # seat owning each square, NO_OWNER if nobody does
+	("buildings", "u1", (SQUARES,)), # houses on each square, HOTEL for a hotel
+])
+GAME = np.dtype([("game", "<u4"), ("start", "<u8"), ("rows", "<u8")]) # one game's rows in the history file
+
+def schemaPath(path: str) -> str:
+	return path + ".json"
+
+def indexPath(path: str) -> str:
+	return path + ".index"
+
+class HistoryWriter():
+	"""
+	appends rows to a history file, `flush_every` rows at a time. a game's turns have to be recorded one after another,
+	but games can come in any order, and the index records where each one went
+	"""
+	def __init__(self, path: str, flush_every: int = 1 << 16):
+		self.path = path
+		self._buffer = np.zeros(flush_every, dtype=ROW)
+		self._rows = 0
+		self._file = open(path, "ab")
+		self._index = open(indexPath(path), "ab")
+		self._written = self._file.seek(0, os.SEEK_END) // ROW.itemsize # rows in the file before the buffered ones
+		self._games = [] # (game, start, rows) of the games finished since the last flush
+		self._game = None # the game being recorded and the row it started on
+		self._game_start = 0
+		with open(schemaPath(path), "w") as file: json.dump({"dtype": ROW.descr}, file)
+
+	def recordTurn(self, game: int, turn: int, state: GameState) -> None:
+		if game != self._game:
+			self.endGame()
+			self._game, self._game_start = game, self._written + self._rows
+		seats = len(state.positions)
+		if self._rows + seats > len(self._buffer): self.flush()
+		rows = self._buffer[self._rows:self._rows + seats]
+		rows["game"] = game
+		rows["turn"] = turn
+		rows["seat"] = np.arange(seats)
+		rows["active"] = state.active
+		rows["in_jail"] = state.in_jail
+		rows["position"] = state.positions
+		rows["balance"] = state.balances
+		rows["owners"] = np.frombuffer(state.owners, dtype=np.int8)
+		rows["buildings"] = np.where(np.frombuffer(state.hotels, dtype=np.int8), HOTEL, np.frombuffer(state.houses, dtype=np.int8))
+		self._rows += seats
+
+	def endGame(self) -> None:
+		if self._game == None: return
+		self._games.append((self._game, self._game_start, self._written + self._rows - self._game_start))
+		self._game = None
+
+	def flush(self) -> None:
+		"""writes the buffered rows, then the index entries of the games they finish"""
+		self._buffer[:self._rows].tofile(self._file)
+		self._file.flush()
+		self._written += self._rows
+		self._rows = 0
+		np.array(self._games, dtype=GAME).tofile(self._index)
+		self._index.flush()
+		self._games = []
+
+	def close(self) -> None:
+		self.endGame()
+		self.flush()
+		self._file.close()
+		self._index.close()
+
+def recordGames(path: str, policies: list, games: int, max_turns: int = 1000, seed: int = 0, start: int = 0) -> int:
+	"""plays games [start, start+games) of a seeded run, the same games as simulation.runParallel, and appends their histories to `path`"""
+	writer = HistoryWriter(path)
+	turns = 0
+	try:
+		for game in range(start, start + games):
+			main.rng.seed(gameSeed(seed, game))
+			player_list = [BotPlayer(chr(ord("a") + i), policy) for i, policy in enumerate(policies)]
+			main.setupBoard(player_list)
+			order = TurnOrder(player_list.copy(), max_turns=max_turns)
+			while not order.finished():
+				order.playTurn()
+				writer.recordTurn(game, order.turns, GameState.capture(player_list, order.active, rng=False))
+			turns += order.turns
+	finally: writer.close()
+	return turns
+
+class HistoryReader():
+	"""a history file mapped into memory. `rows` and every view made from it read straight from the file"""
+	def __init__(self, path: str):
+		with open(schemaPath(path)) as file: descr = json.load(file)["dtype"]
+		dtype = np.dtype([tuple(field[:2]) + ((tuple(field[2]),) if len(field) > 2 else ()) for field in descr])
+		self.rows = np.memmap(path, dtype=dtype, mode="r")
+		self.games = {int(game): (int(start), int(rows)) for game, start, rows in np.fromfile(indexPath(path), dtype=GAME)}
+
+	def __len__(self) -> int:
+		return len(self.rows)
+
+	def chunks(self, size: int = 1 << 20):
+		"""yields (first row, view of the rows) over the file a chunk at a time"""
+		for start in range(0, len(self.rows), size): yield start, self.rows[start:start + size]
+
+	def game(self, game: int) -> np.ndarray:
+		"""the rows of one game, from the index. empty if it isn't in the file"""
+		start, rows = self.games.get(game, (0, 0))
+		return self.rows[start:start + rows]
+
+	def firstToComplete(self, squares: list, chunk_size: int = 1 << 20) -> dict:
+		"""{game: (turn, seat)} for the first player in each game to own every one of `squares`"""
+		first = {}
+		for _, rows in self.chunks(chunk_size):
+			owners = rows["owners"][:, squares]
+			complete = (owners[:, 0] != NO_OWNER) & (owners == owners[:, :1]).all(axis=1)
+			for index in np.flatnonzero(complete):
+				game = int(rows["game"][index])
+				if game not in first: first[game] = (int(rows["turn"][index]), int(owners[index, 0]))
+		return first
+
+	def balanceCurve(self, game: int, seat: int) -> np.ndarray:
+		rows = self.game(game)
+		return rows["balance"][rows["seat"] == seat]
+
+def groupSquares(group: ColourTypes) -> list:
+	return [place.position for place in main.game.board if getattr(place, "group", None) == group]
+
+def run(argv: list = None) -> None:
+	parser = argparse.ArgumentParser(description="record or analyse turn by turn game histories")
+	parser.add_argument("path")
+	parser.add_argument("-n", "--games", type=int, default=0, help="simulate this many games and append them to the file")
+	parser.add_argument("-p", "--players", type=int, default=4)
+	parser.add_argument("--policy", default="buy-all", choices=POLICIES)
+	parser.add_argument("--max-turns", type=int, default=1000)
+	parser.add_argument("-s", "--seed", type=int, default=0)
+	parser.add_argument("--group", default="DARKBLUE", choices=[colour.name for colour in ColourTypes],
+											help="report the balances of whoever completes this colour group first")
+	args = parser.parse_args(argv)
+
+	if args.games:
+		policies = [POLICIES[args.policy]() for _ in range(args.players)]
+		turns = recordGames(args.path, policies, args.games, args.max_turns, args.seed)
+		print(f"recorded {args.games} games, {turns} turns")
+
+	reader = HistoryReader(args.path)
+	first = reader.firstToComplete(groupSquares(ColourTypes[args.group]))
+	print(f"{len(reader)} rows. {args.group} was completed in {len(first)} games")
+	for game, (turn, seat) in list(first.items())[:10]:
+		curve = reader.balanceCurve(game, seat)
+		print(f"  game {game}: seat {seat} on turn {turn}, balance {curve[0]} -> {curve[min(turn, len(curve)) - 1]} -> {curve[-1]}")
+
+if __name__ == "__main__":
+	run()
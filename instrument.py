@@ -0,0 +1,221 @@
+"""
+opt-in timing and counters for the turn loop. enabling swaps the measured methods for wrapped copies and disabling
+puts the originals back, so nothing is measured, and nothing is slower, unless it's switched on
+"""
+import argparse
+import json
+import marshal
+import time
+
+import main
+
+TIMED = [
+	(main.Player, "turn"),
+	(main.Player, "startTurn"),
+	(main.Player, "rollTurn"),
+	(main.Player, "diceRoll"),
+	(main.Player, "move"),
+	(main.Player, "standingAction"),
+	(main.BoardDisplayer, "printBoard"),
+	(main.Card, "play"),
+]
+COUNTERS = ("squares_moved", "rent_paid", "cards_played", "redraws", "full_redraws")
+
+class FunctionStats():
+	"""call counts and times for one method, split the way cProfile splits them"""
+	def __init__(self):
+		self.calls = 0
+		self.primitive_calls = 0 # calls that weren't made from inside another call of the same method
+		self.total_time = 0.0 # time spent in the method itself, not in other measured methods it called
+		self.cumulative_time = 0.0
+		self.callers = {} # caller's key -> [calls, primitive calls, total time, cumulative time], as pstats has them
+
+	def add(self, caller: tuple, elapsed: float, own: float, primitive: bool) -> None:
+		self.calls += 1
+		self.total_time += own
+		if primitive:
+			self.primitive_calls += 1
+			self.cumulative_time += elapsed
+		if caller == None: return
+		totals = self.callers.setdefault(caller, [0, 0, 0.0, 0.0])
+		totals[0] += 1
+		totals[1] += primitive
+		totals[2] += own
+		totals[3] += elapsed if primitive else 0.0
+
+class Instrumentation():
+	"""
+	records calls to the TIMED methods (and any overrides of them in subclasses) and per turn COUNTERS while
+	enabled. usable as a context manager
+	"""
+	def __init__(self):
+		self.functions = {} # (file, line, qualified name) -> FunctionStats
+		self.per_turn = {name: [] for name in COUNTERS} # one total per turn started
+		self._originals = [] # (class, name, original attribute) to put back
+		self._stack = [] # [key, time spent in measured calls it made] for each measured call in progress
+		self._depth = {}
+
+	def enable(self) -> None:
+		if self._originals: return
+		for cls, name in TIMED:
+			for owner in [cls] + allSubclasses(cls):
+				if name in owner.__dict__: self.patch(owner, name, self.timed)
+
+		self.patch(main.Player, "startTurn", self.countTurn)
+		for owner in [main.Player] + allSubclasses(main.Player):
+			if "move" in owner.__dict__: self.patch(owner, "move", self.countMove)
+			if "payRent" in owner.__dict__: self.patch(owner, "payRent", self.countRent)
+		self.patch(main.Card, "play", self.countCard)
+		self.patch(main.BoardDisplayer, "printBoard", self.countRedraw)
+
+	def disable(self) -> None:
+		for cls, name, original in reversed(self._originals): setattr(cls, name, original)
+		self._originals = []
+
+	def __enter__(self) -> "Instrumentation":
+		self.enable()
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		self.disable()
+
+	def patch(self, cls: type, name: str, wrapper: object) -> None:
+		original = cls.__dict__[name]
+		self._originals.append((cls, name, original))
+		setattr(cls, name, wrapper(original, cls))
+
+	def timed(self, func: object, cls: type) -> object:
+		code = getattr(func, "__wrapped__", func).__code__
+		key = (code.co_filename, code.co_firstlineno, f"{cls.__name__}.{func.__name__}")
+		stats = self.functions.setdefault(key, FunctionStats())
+		stack = self._stack
+		depth = self._depth
+		depth[key] = 0
+
+		def measured(*args, **kwargs):
+			caller = stack[-1][0] if stack else None
+			frame = [key, 0.0]
+			stack.append(frame)
+			depth[key] += 1
+			start = time.perf_counter()
+			try: return func(*args, **kwargs)
+			finally:
+				elapsed = time.perf_counter() - start
+				stack.pop()
+				depth[key] -= 1
+				stats.add(caller, elapsed, elapsed - frame[1], depth[key] == 0)
+				if stack: stack[-1][1] += elapsed
+		measured.__wrapped__ = func
+		return measured
+
+	def count(self, name: str, amount: int = 1) -> None:
+		counts = self.per_turn[name]
+		if not counts: self.newTurn() # counted before the first turn started
+		counts[-1] += amount
+
+	def newTurn(self) -> None:
+		for counts in self.per_turn.values(): counts.append(0)
+
+	def countTurn(self, func: object, cls: type) -> object:
+		def startTurn(player, *args, **kwargs):
+			self.newTurn()
+			return func(player, *args, **kwargs)
+		startTurn.__wrapped__ = func
+		return startTurn
+
+	def countMove(self, func: object, cls: type) -> object:
+		def move(player, *args, **kwargs):
+			self.count("squares_moved", player.dice_total)
+			return func(player, *args, **kwargs)
+		move.__wrapped__ = func
+		return move
+
+	def countRent(self, func: object, cls: type) -> object:
+		"""counts what the owner got, since a player short of money mortgages and sells to pay and only loses the difference"""
+		def payRent(player, *args, **kwargs):
+			owner = main.game.board[player.position].owner
+			money = owner.getTotalMoney()
+			try: return func(player, *args, **kwargs)
+			finally: self.count("rent_paid", owner.getTotalMoney() - money)
+		payRent.__wrapped__ = func
+		return payRent
+
+	def countCard(self, func: object, cls: type) -> object:
+		def play(card, *args, **kwargs):
+			self.count("cards_played")
+			return func(card, *args, **kwargs)
+		play.__wrapped__ = func
+		return play
+
+	def countRedraw(self, func: object, cls: type) -> object:
+		def printBoard(displayer, *args, **kwargs):
+			self.count("redraws")
+			if displayer._cells == None: self.count("full_redraws")
+			return func(displayer, *args, **kwargs)
+		printBoard.__wrapped__ = func
+		return printBoard
+
+	def toDict(self) -> dict:
+		turns = len(self.per_turn[COUNTERS[0]])
+		return {
+			"functions": {
+				key[2]: {
+					"calls": stats.calls, "primitive_calls": stats.primitive_calls,
+					"total_time": stats.total_time, "cumulative_time": stats.cumulative_time,
+				}
+				for key, stats in self.functions.items() if stats.calls
+			},
+			"turns": turns,
+			"counters": {
+				name: {"total": sum(counts), "mean": sum(counts)/turns if turns else 0.0, "max": max(counts, default=0)}
+				for name, counts in self.per_turn.items()
+			},
+			"per_turn": self.per_turn,
+		}
+
+	def writeJson(self, path: str) -> None:
+		with open(path, "w") as file: json.dump(self.toDict(), file, indent=1)
+
+	def dumpStats(self, path: str) -> None:
+		"""writes the timings in the format cProfile saves, for pstats.Stats(path) or snakeviz"""
+		stats = {
+			key: (stats.primitive_calls, stats.calls, stats.total_time, stats.cumulative_time,
+						{caller: tuple(totals) for caller, totals in stats.callers.items()})
+			for key, stats in self.functions.items() if stats.calls
+		}
+		with open(path, "wb") as file: marshal.dump(stats, file)
+
+def allSubclasses(cls: type) -> list:
+	subclasses = []
+	for subclass in cls.__subclasses__(): subclasses += [subclass] + allSubclasses(subclass)
+	return subclasses
+
+def printSummary(instruments: Instrumentation) -> None:
+	summary = instruments.toDict()
+	print(f"{'method':<32}{'calls':>10}{'own s':>10}{'total s':>10}")
+	for name, stats in sorted(summary["functions"].items(), key=lambda item: -item[1]["cumulative_time"]):
+		print(f"{name:<32}{stats['calls']:>10}{stats['total_time']:>10.3f}{stats['cumulative_time']:>10.3f}")
+	print(f"\nper turn, over {summary['turns']} turns:")
+	for name, counter in summary["counters"].items():
+		print(f"  {name:<16} mean {counter['mean']:>8.2f}  max {counter['max']:>6}  total {counter['total']}")
+
+def run(argv: list = None) -> None:
+	from simulation import POLICIES, playChunk
+	parser = argparse.ArgumentParser(description="time the turn loop over simulated games")
+	parser.add_argument("-n", "--games", type=int, default=20)
+	parser.add_argument("-p", "--players", type=int, default=4)
+	parser.add_argument("--policy", default="buy-all", choices=POLICIES)
+	parser.add_argument("--max-turns", type=int, default=1000)
+	parser.add_argument("-s", "--seed", type=int, default=0)
+	parser.add_argument("--json", metavar="PATH", help="write the results as json")
+	parser.add_argument("--pstats", metavar="PATH", help="write the timings as a cProfile stats file")
+	args = parser.parse_args(argv)
+
+	with Instrumentation() as instruments:
+		playChunk((0, args.games, [args.policy]*args.players, args.max_turns, args.seed, None))
+	printSummary(instruments)
+	if args.json: instruments.writeJson(args.json)
+	if args.pstats: instruments.dumpStats(args.pstats)
+
+if __name__ == "__main__":
+	run()
@@ -0,0 +1,130 @@
+"""works out how often each square is landed on by moving a large array of tokens at once with numpy"""
+import argparse
+import time
+
+import numpy as np
+
+import main
+
+GO_TO_JAIL = -1 # destination meaning the token is sent to jail
+
+def cardDestination(card: main.Card, go_position: int):
+	"""where a card sends the player, GO_TO_JAIL, or None if it doesn't move them"""
+	if isinstance(card, main.jailCard): return GO_TO_JAIL
+	if isinstance(card, main.goCard): return go_position
+	if isinstance(card, main.AdvanceCard): return card.jump_position
+	return None
+
+def squareName(place: object) -> str:
+	return getattr(place, "name", type(place).__name__)
+
+class BoardTables():
+	"""the parts of the board from main.setupBoard that decide where a token ends up after moving"""
+	def __init__(self):
+		self.board = list(main.Game(main.game.ruleset).board) # a board of its own, so the game being played isn't touched
+		self.size = len(self.board)
+		self.go_position = next(place.position for place in self.board if isinstance(place, main.Go))
+		self.jail_position = next(place.position for place in self.board if isinstance(place, main.Jail))
+
+		# every square gets a list of equally likely destinations: itself, jail, or one per card in its deck
+		self.destinations = []
+		for place in self.board:
+			if isinstance(place, main.GoToJail): outcomes = [GO_TO_JAIL]
+			elif isinstance(place, main.ChanceCardManager): outcomes = [self.cardOutcome(card, place.position) for card in place.chance_cards]
+			elif isinstance(place, main.CommunityChestManager): outcomes = [self.cardOutcome(card, place.position) for card in place.community_chests]
+			else: outcomes = [place.position]
+			self.destinations.append(outcomes)
+
+	def cardOutcome(self, card: main.Card, position: int) -> int:
+		destination = cardDestination(card, self.go_position)
+		return position if destination == None else destination
+
+	def names(self) -> list:
+		return [squareName(place) for place in self.board]
+
+class LandingEngine():
+	"""moves `tokens` independent tokens one roll at a time, following the dice, jail and card rules of Player.turn"""
+	def __init__(self, tokens: int = 10**6, seed: int = None, tables: BoardTables = None):
+		self.tables = tables or BoardTables()
+		self.rng = np.random.default_rng(seed)
+		self.tokens = tokens
+
+		self.position = np.zeros(tokens, dtype=np.int8)
+		self.doubles = np.zeros(tokens, dtype=np.int8)
+		self.in_jail = np.zeros(tokens, dtype=bool)
+		self.jail_turns = np.zeros(tokens, dtype=np.int8)
+
+		# one row per square of equally likely destinations, padded by repeating them so any column is valid
+		widths = [len(outcomes) for outcomes in self.tables.destinations]
+		self.deck_sizes = np.array(widths, dtype=np.float32)
+		self.width = max(widths)
+		self.redirect = np.array([[outcomes[i % len(outcomes)] for i in range(self.width)] for outcomes in self.tables.destinations], dtype=np.int8).ravel()
+
+		# the 36 equally likely rolls of two dice, so a roll is one random number per token
+		first, second = np.divmod(np.arange(36), 6)
+		self.roll_totals = (first + second + 2).astype(np.int8)
+		self.roll_doubles = first == second
+
+	def rollDice(self, count: int):
+		roll = self.rng.integers(0, 36, size=count, dtype=np.int8)
+		return self.roll_totals[roll], self.roll_doubles[roll]
+
+	def step(self) -> np.ndarray:
+		"""every token does one roll. returns the hit count for each square"""
+		# a token that has used up its jail turns walks out and rolls normally
+		self.in_jail &= self.jail_turns != 0
+
+		total, double = self.rollDice(self.tokens)
+		self.jail_turns -= self.in_jail
+		stay = self.in_jail & ~double
+
+		# escaping tokens roll again to move, but can't chain doubles
+		escaping = np.flatnonzero(self.in_jail & double)
+		total[escaping], _ = self.rollDice(len(escaping))
+		double[escaping] = False
+
+		doubles = np.where(double, self.doubles + 1, 0).astype(np.int8)
+		speeding = doubles == 3
+
+		landed = ((self.position + total) % self.tables.size).astype(np.intp)
+		card = (self.rng.random(self.tokens, dtype=np.float32) * self.deck_sizes[landed]).astype(np.int8)
+		destination = self.redirect.take(landed * self.width + card)
+
+		jailed = ~stay & (speeding | (destination == GO_TO_JAIL))
+		self.position = np.where(stay, self.position, np.where(jailed, self.tables.jail_position, destination)).astype(np.int8)
+		self.in_jail = stay | jailed
+		self.jail_turns[jailed] = 3
+		self.doubles = np.where(jailed, 0, doubles).astype(np.int8)
+
+		return np.bincount(self.position, minlength=self.tables.size)
+
+	def run(self, rolls: int, burn_in: int = 20) -> np.ndarray:
+		"""does at least `rolls` rolls in total (after burn_in warm up steps) and returns the hits per square"""
+		for _ in range(burn_in): self.step()
+		hits = np.zeros(self.tables.size, dtype=np.int64)
+		for _ in range(-(-rolls // self.tokens)): hits += self.step()
+		return hits
+
+def landingFrequencies(rolls: int = 10**8, tokens: int = 10**6, seed: int = None) -> np.ndarray:
+	hits = LandingEngine(tokens, seed).run(rolls)
+	return hits / hits.sum()
+
+def run(argv: list = None) -> None:
+	parser = argparse.ArgumentParser(description="estimate how often each square is landed on")
+	parser.add_argument("-r", "--rolls", type=float, default=1e8)
+	parser.add_argument("-t", "--tokens", type=int, default=10**6)
+	parser.add_argument("-s", "--seed", type=int, default=None)
+	args = parser.parse_args(argv)
+
+	engine = LandingEngine(args.tokens, args.seed)
+	start = time.perf_counter()
+	hits = engine.run(int(args.rolls))
+	seconds = time.perf_counter() - start
+
+	frequencies = hits / hits.sum()
+	for position, name in enumerate(engine.tables.names()):
+		print(f"{position:>2} {name:<25} {frequencies[position]:.4%}")
+	print(f"\n{hits.sum()} rolls in {seconds:.2f}s")
+
+if __name__ == "__main__":
+	run()
@@ -1,107 +1,248 @@
-from connorama import Text, Back, Style
 from enum import Enum, auto
+from functools import cached_property
 import random
 import time
-import os
+import sys
+
+rng = random.Random() # all dice rolls and card draws come from here, so simulations can seed it
+game_log = None # a replay.GameLog recording the dice, cards and decisions of this process's game, if any
+events = None # a list the game appends (kind, player, square, amount) tuples to while it's streamed, see stream.py
+ROLL_EVENT, MOVE_EVENT, LAND_EVENT, BUY_EVENT, RENT_EVENT, CARD_EVENT, JAIL_EVENT, BANKRUPT_EVENT = range(8)
+
+class Plain():
+	"""stands in for connorama's Text, Back and Style with no colours, so bots and workers never import it"""
+	def __getattr__(self, name: str) -> str:
+		setattr(self, name, "") # so the next look up is an ordinary attribute
+		return ""
+
+Text = Back = Style = Plain()
+colour_backs = {} # ColourTypes -> Back colour, filled in by enableColour
+
+def enableColour() -> bool:
+	"""
+	swaps connorama's colours in for the terminal game. call it before setupBoard, since cards keep the colours of
+	their text from when they're made. returns False, leaving everything plain, if connorama isn't installed
+	"""
+	global Text, Back, Style
+	try: from connorama import Text, Back, Style
+	except ImportError: return False
+	colour_backs.update({ColourTypes.BROWN: Back.yellow, 
+											 ColourTypes.LIGHTBLUE: Back.light_blue, 
+											 ColourTypes.PINK: Back.light_red, 
+											 ColourTypes.ORANGE: Back.light_magenta, 
+											 ColourTypes.RED: Back.red, 
+											 ColourTypes.YELLOW: Back.light_yellow, 
+											 ColourTypes.GREEN: Back.green, 
+											 ColourTypes.DARKBLUE: Back.blue})
+	return True
 
 class Player():
 	def __init__(self, letter: str):
 		self.letter = letter
-		self.position = 0
+		self._position = 0
+		self._position_index = None
 		
 		self._total_money = 1500
 
 		self.dice_total = 0
 		self.in_jail = False
 		self.jail_turns = 3
+		self.bankrupt = False
+		self._double_count = 0 # doubles rolled this turn
+		self._escaped = False # got out of jail this turn
+		self.jail_free_cards = [] # get out of jail free cards held, in the order they were drawn
+		self.group_counts = {} # OwnablePlace.group -> how many places of that group this player owns
+		self.nearly_complete = set() # groups this player owns all but one place of, for trading
+		self.complete_groups = set() # groups this player owns every place of, which they can build on
+		self.places = [] # the OwnablePlaces this player owns in board order, kept up to date by OwnablePlace.owner
+		self.creditor = None # the player owed the debt that last left the balance negative, None for the bank
+
+		self._player_list = []
 	
 	def setBoardDisplayer(self, board_displayer) -> None:
 		self._board_displayer = board_displayer
+
+	def setPlayerList(self, player_list: list) -> None:
+		"""the players in the game, in turn order"""
+		self._player_list = player_list
+
+	def getPlayerList(self) -> list:
+		return self._player_list
+
+	def setPositionIndex(self, position_index) -> None:
+		self._position_index = position_index
+		position_index.add(self)
+
+	@property
+	def position(self) -> int:
+		return self._position
+
+	@position.setter
+	def position(self, position: int) -> None:
+		if self._position_index != None: self._position_index.move(self, self._position, position)
+		self._position = position
 	
 	def getTotalMoney(self) -> int:
 		return self._total_money
+
+	def netWorth(self) -> int:
+		"""money plus what the player's places and buildings cost, with mortgaged places at what they were mortgaged for"""
+		worth = self._total_money
+		for place in self.places:
+			worth += place.mortgage_value if place.mortgaged else place.cost
+			if isinstance(place, Property): worth += place.buildings * place.house_cost
+		return worth
+
+	def countGroup(self, place: object, change: int) -> None:
+		"""updates the player's group counts for gaining (change 1) or losing (-1) a place"""
+		count = self.group_counts.get(place.group, 0) + change
+		self.group_counts[place.group] = count
+		if count == len(place.group_places) - 1 and count > 0: self.nearly_complete.add(place.group)
+		else: self.nearly_complete.discard(place.group)
+		if count == len(place.group_places): self.complete_groups.add(place.group)
+		else: self.complete_groups.discard(place.group)
 	
-	def payMoney(self, amount: int, show_text: bool = True):
+	def payMoney(self, amount: int, show_text: bool = True, creditor: "Player" = None) -> int:
+		"""
+		takes money, selling buildings and mortgaging places to cover it if the balance goes negative. returns how much
+		of it was covered, which is less than `amount` if the player couldn't raise enough and will go bankrupt
+		"""
+		debt = max(-self._total_money, 0)
 		self._total_money -= amount
-		if show_text: print(f"You have spent {Text.red}£{amount}{Text.RESET}\nNew balance: {Text.light_yellow}£{self._total_money}{Text.RESET}")
+		if show_text: self.showText(f"You have spent {Text.red}£{amount}{Text.RESET}\nNew balance: {Text.light_yellow}£{self._total_money}{Text.RESET}")
+		if self._total_money >= 0: return amount
+		self.creditor = creditor
+		self.raiseMoney()
+		return min(max(amount - max(-self._total_money, 0) + debt, 0), amount)
 	
 	def giveMoney(self, amount: int, show_text: bool = False):
 		self._total_money += amount
-		if show_text: print(f"\nNew balance: {Text.light_yellow}£{self._total_money}{Text.RESET}")
+		if show_text: self.showText(f"\nNew balance: {Text.light_yellow}£{self._total_money}{Text.RESET}")
+
+	def raiseMoney(self) -> None:
+		"""
+		mortgages and sells buildings until the balance isn't negative or there's nothing left. places are mortgaged
+		before buildings are sold, starting with the ones furthest from a whole group
+		"""
+		while self._total_money < 0:
+			place = min((place for place in self.places if place.canMortgage()), key=lambda place: (place.ownedInGroup(), place.cost), default=None)
+			if place != None:
+				place.mortgage()
+				self.showText(f"You mortgaged {place.name} for {Text.green}£{place.mortgage_value}{Text.RESET}")
+				continue
+			place = max((place for place in self.places if place.hasBuildings()), key=lambda place: (place._hotels, place._houses), default=None)
+			if place == None: return
+			self.showText(f"You sold a building on {place.name} for {Text.green}£{place.sellBuilding()}{Text.RESET}")
+
+	def goBankrupt(self) -> None:
+		"""
+		takes a player who couldn't pay their debts out of the game. whoever they owed gets their places and held cards,
+		or the bank takes them back if it was the bank
+		"""
+		self.bankrupt = True
+		if events != None: events.append((BANKRUPT_EVENT, self, self.position, self.getTotalMoney()))
+		if self._position_index != None: # off the board, so it's never drawn or moved again
+			self._position_index.remove(self)
+			self._position_index = None
+		creditor = self.creditor if self.creditor != None and not self.creditor.bankrupt else None
+		self.showText(f"{Text.red}'{self.letter}' is bankrupt!{Text.RESET}")
+
+		for place in self.places.copy():
+			if creditor != None: place.owner = creditor
+			else: place.returnToBank()
+		for card in self.jail_free_cards:
+			if creditor != None: card.deck.hold(card, creditor)
+			else: card.deck.putBack(card)
+		self.jail_free_cards = []
 
 	def turn(self) -> None:
-		double = True
-		double_count = 0
-		escaped = False
+		if not self.startTurn(): return
+		while self.rollTurn(): pass
+
+	def startTurn(self) -> bool:
+		"""deals with jail at the start of a turn. returns whether the player gets to roll and move"""
+		if game_log != None: game_log.turn()
+		self._double_count = 0
+		self._escaped = False
+		self.manageAssets()
 
 		if self.jail_turns == 0 and self.in_jail: 
 			self.printHeading()
 			self.getOutJail()
+		if self.in_jail and self.jail_free_cards and self.wantsToUseJailCard(): self.useJailFreeCard()
 		if self.in_jail:
-			escaped = self.jail()
-			if not escaped: return
+			self._escaped = self.jail()
+			if not self._escaped: return False
+		return True
 
-		while double:
-			self.printHeading()
-			self.enterPrompt("roll the die")
-			double = self.diceRoll()
-			if escaped: double = False # can't do a double roll if you've escaped jail this turn
-			#self.dice_total = 6
-			#double = True
-			double_count += 1 if double else 0
-
-			if double_count == 3:
-				print(f"{Text.red+Back.black}Oh no! You got 3 doubles in a row! You were going so fast that the police think you're botting, so sent you to jail.{Style.RESET_ALL}")
-				self.goToJail()
-				self.enterPrompt("go to jail")
-				return
-
-			self.enterPrompt("move")
-			self.move()
-			
-			self.standingInfo()
-			self.standingAction()
-			if self.in_jail: return # in case you land on go to jail when you rolled a double
+	def rollTurn(self) -> bool:
+		"""one roll and move of a turn, ending with whatever the square asks of the player. returns whether they roll again"""
+		self.printHeading()
+		self.enterPrompt("roll the die")
+		double = self.diceRoll()
+		if self._escaped: double = False # can't do a double roll if you've escaped jail this turn
+		self._double_count += 1 if double else 0
+
+		if self._double_count == 3:
+			self.showText(f"{Text.red+Back.black}Oh no! You got 3 doubles in a row! You were going so fast that the police think you're botting, so sent you to jail.{Style.RESET_ALL}")
+			self.goToJail()
+			self.enterPrompt("go to jail")
+			return False
+
+		self.enterPrompt("move")
+		self.move()
+		if events != None: events.append((MOVE_EVENT, self, self.position, self.dice_total))
+		
+		self.standingInfo()
+		self.standingAction()
+		return double and not self.in_jail and self._total_money >= 0 # no rolling again from jail or in debt
 	
 	def printHeading(self) -> None:
 		self._board_displayer.printBoard()
-		print(f"\n{Back.white+Style.bold+Text.black} PLAYER '{self.letter}' {Style.RESET_ALL} {Style.bold}Balance: {Text.light_yellow}£{self.getTotalMoney()}{Style.RESET_ALL}\n")
+		self.showText(f"\n{Back.white+Style.bold+Text.black} PLAYER '{self.letter}' {Style.RESET_ALL} {Style.bold}Balance: {Text.light_yellow}£{self.getTotalMoney()}{Style.RESET_ALL}\n")
 	
 	def enterPrompt(self, action: str) -> None:
 		input(f"press {Style.bold + Text.yellow}[ENTER]{Style.RESET_ALL} to {action}: ")
 
+	def showText(self, text: str) -> None:
+		"""displays text to the player"""
+		print(text)
+
 	def diceRoll(self) -> bool:
 		"""makes+stores the dice total and returns if double"""
-		roll1, roll2 = random.randint(1,6), random.randint(1,6)
+		roll1, roll2 = rng.randint(1,6), rng.randint(1,6)
+		if game_log != None: game_log.dice(roll1, roll2)
+		if events != None: events.append((ROLL_EVENT, self, self.position, roll1 + roll2))
 		double = True if roll1 == roll2 else False
 		self.printHeading()
-		print(f"[{roll1}] [{roll2}]" if not double else f"[{roll1}] [{roll2}] {Text.blue}DOUBLE!{Text.RESET}")
+		self.showText(f"[{roll1}] [{roll2}]" if not double else f"[{roll1}] [{roll2}] {Text.blue}DOUBLE!{Text.RESET}")
 
 		total_roll = roll1 + roll2
-		print(f"you rolled for {Style.bold + Text.green}{total_roll}{Style.RESET_ALL}!\n")
+		self.showText(f"you rolled for {Style.bold + Text.green}{total_roll}{Style.RESET_ALL}!\n")
 
 		self.dice_total = total_roll
 		return double
 	
 	def move(self) -> None:
 		for _ in range(1, self.dice_total+1):
-			self.position += 1
-			if self.position == len(board): 
+			if self.position + 1 == len(game.board): 
 				self.passGo()
+			else: self.position += 1
 			self.printHeading()
 			time.sleep(0.25)
 	
 	def passGo(self) -> None:
-		self.position = board[0].position
+		self.position = game.board[0].position
 		self.printHeading()
-		print(f"You passed go! Collecting {Text.green}£200{Text.RESET}!\n")
-		self.giveMoney(200)
+		self.showText(f"You passed go! Collecting {Text.green}£{game.board[0].salary}{Text.RESET}!\n")
+		self.giveMoney(game.board[0].salary)
 		self.enterPrompt("continue moving")
 	
 	def goToJail(self) -> None:
 		self.in_jail = True
 		self.position = 10
 		self.jail_turns = 3
+		if events != None: events.append((JAIL_EVENT, self, self.position, 0))
 	
 	def jail(self) -> bool:
 		"""return whether or not you escape"""
@@ -116,32 +257,82 @@ class Player():
 	
 	def getOutJail(self) -> None:
 		self.in_jail = False
-		print("You're free!")
+		if self._position_index != None: self._position_index.touch(self.position) # the letter isn't red any more
+		self.showText("You're free!")
 		self.enterPrompt("escape")
 
+	def wantsToUseJailCard(self) -> bool:
+		self.printHeading()
+		while True:
+			use = input("Do you want to use your get out of jail free card? [Y/N]: ").lower()
+			if use == "y" or use == "n": break
+		if game_log != None: game_log.decision(use == "y")
+		return use == "y"
+
+	def useJailFreeCard(self) -> None:
+		"""plays the oldest held get out of jail free card, putting it back under its deck"""
+		card = self.jail_free_cards.pop(0)
+		card.deck.putBack(card)
+		self.getOutJail()
+
 	def standingInfo(self) -> None:
 		"""displays the info for the place it's standing on"""
 		self.printHeading()
-		try: board[self.position].standingInfo()
+		try: game.board[self.position].standingInfo()
 		except AttributeError: print("this hasn't been coded yet so it's empty. but coming very soon")
 	
 	def buyPlace(self, prompt_name: str) -> None:
+		print(advice(self, game.board[self.position]), end="")
 		while True:
 			buy = input(f"Do you want to buy this {prompt_name}? [Y/N]: ").lower()
 			if buy == "y" or buy == "n": break
+		if game_log != None: game_log.decision(buy == "y")
 		if buy == "y": 
-			self.payMoney(board[self.position].cost)
-			board[self.position].owner = self
+			self.purchase(game.board[self.position])
+		else: auction(game.board[self.position], self)
+
+	def auctionBid(self, place: object) -> int:
+		"""the most the player will pay for a place being auctioned, 0 to stay out"""
+		self.printHeading()
+		while True:
+			bid = input(f"'{self.letter}', how much will you bid for {place.name}? (0 to pass) £").strip()
+			if bid.isnumeric() and int(bid) <= self.getTotalMoney(): break
+		if game_log != None: game_log.bid(int(bid))
+		return int(bid)
+
+	def acceptsTrade(self, trade: "Trade") -> bool:
+		self.printHeading()
+		while True:
+			accept = input(f"'{self.letter}', {trade.describe()}. Do you accept? [Y/N]: ").lower()
+			if accept == "y" or accept == "n": break
+		if game_log != None: game_log.decision(accept == "y")
+		return accept == "y"
+
+	def manageAssets(self) -> None:
+		"""offers to pay off the player's mortgages at the start of their turn"""
+		if game_log != None: game_log.trade(None) # people aren't asked to offer trades, but every turn logs one or none
+		for place in self.places:
+			if not place.mortgaged or self.getTotalMoney() < place.unmortgageCost(): continue
+			self.printHeading()
+			while True:
+				pay = input(f"Pay off the mortgage on {place.name} for £{place.unmortgageCost()}? [Y/N]: ").lower()
+				if pay == "y" or pay == "n": break
+			if game_log != None: game_log.decision(pay == "y")
+			if pay == "y": place.unmortgage()
 	
-	def payRent(self) -> None:
-		print(f"Giving {Back.black}'{board[self.position].owner.letter}'{Back.RESET} their rent.")
-		self.payMoney(board[self.position].rent)
-		board[self.position].owner.giveMoney(board[self.position].rent)
+	def purchase(self, place: object) -> None:
+		"""pays for a place and takes ownership of it"""
+		self.payMoney(place.cost)
+		place.owner = self
+		if events != None: events.append((BUY_EVENT, self, place.position, place.cost))
 	
-	def payUtilityRent(self) -> None:
-		print(f"Giving {Back.black}'{board[self.position].owner.letter}'{Back.RESET} their rent.")
-		self.payMoney(self.dice_total * board[self.position].dice_multiplier)
-		board[self.position].owner.giveMoney(self.dice_total * board[self.position].dice_multiplier)
+	def payRent(self) -> None:
+		place = game.board[self.position]
+		rent = place.getRent(self.dice_total)
+		self.showText(f"Giving {Back.black}'{place.owner.letter}'{Back.RESET} their rent.")
+		paid = self.payMoney(rent, creditor=place.owner)
+		place.owner.giveMoney(paid)
+		if events != None: events.append((RENT_EVENT, self, place.position, paid))
 	
 	def place_CanBuy(self, place: object) -> bool:
 		"""returns whether you're able to buy a place"""
@@ -156,47 +347,283 @@ class Player():
 
 	def standingAction(self) -> None:
 		"""logic for when you land on a place (pay rent, buy it, nothing)"""
-		place = board[self.position]
-		if isinstance(place, Property):
-			if self.place_CanBuy(place):
-				self.buyPlace("Property")
-			elif self.place_OtherOwned(place):
-				self.payRent()
-			elif self.place_Owned(place):
-				self.ownedAction(place)
-
-		elif isinstance(place, Station):
-			if self.place_CanBuy(place):
-				self.buyPlace("Station")
-			elif self.place_OtherOwned(place):
-				self.payRent()
-
-		elif isinstance(place, Utility):
-			if self.place_CanBuy(place):
-				self.buyPlace("Utility")
-			elif self.place_OtherOwned(place):
-				self.payUtilityRent()
-
-		elif isinstance(place, GoToJail):
-			self.goToJail()
-
-		elif isinstance(place, TaxPlace):
-			self.payMoney(place.to_pay)
-
-		elif isinstance(place, CommunityChestManager):
-			place.getChest(self)
+		if events != None: events.append((LAND_EVENT, self, self.position, 0))
+		game.board[self.position].landAction(self)
 
-		elif isinstance(place, ChanceCardManager):
-			place.getCard(self)
-
-		print("")
+		self.showText("")
 		self.enterPrompt("finish turn")
 
 	def ownedAction(self, place: object) -> None:
 		"""gets player action when they land on a place they own"""
+		could_build = place.canBuild()
+		buildings = place.buildings
 		place.ownedAction()
+		if game_log != None and could_build: game_log.decision(place.buildings > buildings)
+
+class BotPlayer(Player):
+	"""a player that makes its decisions with a policy instead of prompts, and never prints or sleeps"""
+	def __init__(self, letter: str, policy: object):
+		super().__init__(letter)
+		self.policy = policy
+		self.landings = [0]*40
+
+	def printHeading(self) -> None:
+		pass
+
+	def enterPrompt(self, action: str) -> None:
+		pass
+
+	def showText(self, text: str) -> None:
+		pass
+
+	def standingInfo(self) -> None:
+		pass
+
+	def rollTurn(self) -> bool:
+		double = self.diceRoll() and not self._escaped
+		self._double_count += 1 if double else 0
+		if self._double_count == 3:
+			self.goToJail()
+			return False
+
+		self.move()
+		if events != None: events.append((MOVE_EVENT, self, self.position, self.dice_total))
+		self.standingAction()
+		return double and not self.in_jail and self._total_money >= 0
+
+	def diceRoll(self) -> bool:
+		roll1, roll2 = rng.randint(1,6), rng.randint(1,6)
+		if game_log != None: game_log.dice(roll1, roll2)
+		if events != None: events.append((ROLL_EVENT, self, self.position, roll1 + roll2))
+		self.dice_total = roll1 + roll2
+		return roll1 == roll2
 
-board = [None]*40
+	def move(self) -> None:
+		board = game.board
+		position = self.position + self.dice_total
+		if position >= len(board):
+			position -= len(board)
+			self.giveMoney(board[0].salary)
+		self.position = position
+
+	def standingAction(self) -> None:
+		self.landings[self.position] += 1
+		if events != None: events.append((LAND_EVENT, self, self.position, 0))
+		game.board[self.position].landAction(self)
+
+	def payRent(self) -> None:
+		place = game.board[self.position]
+		paid = self.payMoney(place.getRent(self.dice_total), False, place.owner)
+		place.owner.giveMoney(paid)
+		if events != None: events.append((RENT_EVENT, self, place.position, paid))
+
+	def buyPlace(self, prompt_name: str) -> None:
+		place = game.board[self.position]
+		buy = self.policy.wantsToBuy(self, place)
+		if game_log != None: game_log.decision(buy)
+		if buy: self.purchase(place)
+		else: auction(place, self)
+
+	def auctionBid(self, place: object) -> int:
+		bid = max(min(self.policy.auctionBid(self, place), self.getTotalMoney()), 0)
+		if game_log != None: game_log.bid(bid)
+		return bid
+
+	def acceptsTrade(self, trade: "Trade") -> bool:
+		accept = self.policy.acceptsTrade(self, trade)
+		if game_log != None: game_log.decision(accept)
+		return accept
+
+	def manageAssets(self) -> None:
+		"""offers the policy a trade and paying off mortgages at the start of a turn"""
+		trade = self.policy.proposeTrade(self)
+		if trade != None and not trade.valid(): trade = None
+		if game_log != None: game_log.trade(trade)
+		if trade != None and trade.receiver.acceptsTrade(trade): trade.execute()
+
+		for place in self.places:
+			if not place.mortgaged or self.getTotalMoney() < place.unmortgageCost(): continue
+			pay = self.policy.wantsToUnmortgage(self, place)
+			if game_log != None: game_log.decision(pay)
+			if pay: place.unmortgage()
+
+	def ownedAction(self, place: object) -> None:
+		if not place.canBuild(): return
+		build = self.policy.wantsToBuild(self, place)
+		if game_log != None: game_log.decision(build)
+		if build: place.build()
+
+	def wantsToUseJailCard(self) -> bool:
+		use = self.policy.wantsToUseJailCard(self)
+		if game_log != None: game_log.decision(use)
+		return use
+
+TRADE_PREMIUM = 2 # times its price a bot pays for a place that completes its group, and asks for one it gives up
+
+class Policy():
+	"""decides what a BotPlayer does when it would be prompted. subclasses override the decisions"""
+	def wantsToBuy(self, player: Player, place: object) -> bool:
+		return True
+
+	def wantsToBuild(self, player: Player, place: object) -> bool:
+		return True
+
+	def wantsToUseJailCard(self, player: Player) -> bool:
+		return True
+
+	def wantsToUnmortgage(self, player: Player, place: object) -> bool:
+		return True
+
+	def auctionBid(self, player: Player, place: object) -> int:
+		"""the most to pay for a place at auction, anything over the player's money is cut down to it"""
+		return place.cost
+
+	def proposeTrade(self, player: Player) -> "Trade":
+		"""a trade to offer at the start of a turn, or None. offers cash for the last place of an otherwise owned group"""
+		if not player.nearly_complete: return None
+		for place in player.places:
+			if place.group not in player.nearly_complete: continue
+			missing = next(other for other in place.group_places if other.owner is not player)
+			if missing.owner == None or missing.hasBuildings(): continue
+			cash = missing.cost * TRADE_PREMIUM
+			if player.getTotalMoney() >= cash: return Trade(player, missing.owner, [], [missing], cash)
+		return None
+
+	def acceptsTrade(self, player: Player, trade: "Trade") -> bool:
+		"""takes trades that pay at least TRADE_PREMIUM times the price of each place given up for the places got"""
+		given = sum(place.cost for place in trade.take)
+		got = sum(place.cost for place in trade.give)
+		return trade.cash + got*TRADE_PREMIUM >= given*TRADE_PREMIUM
+
+class ReservePolicy(Policy):
+	"""buys and builds whenever it can while keeping a cash reserve"""
+	def __init__(self, reserve: int):
+		self.reserve = reserve
+
+	def wantsToBuy(self, player: Player, place: object) -> bool:
+		return player.getTotalMoney() - place.cost >= self.reserve
+
+	def wantsToBuild(self, player: Player, place: object) -> bool:
+		return player.getTotalMoney() - place.house_cost >= self.reserve
+
+	def wantsToUnmortgage(self, player: Player, place: object) -> bool:
+		return player.getTotalMoney() - place.unmortgageCost() >= self.reserve
+
+	def auctionBid(self, player: Player, place: object) -> int:
+		return min(place.cost, player.getTotalMoney() - self.reserve)
+
+	def proposeTrade(self, player: Player) -> "Trade":
+		trade = super().proposeTrade(player)
+		if trade != None and player.getTotalMoney() - trade.cash < self.reserve: return None
+		return trade
+
+class NeverBuyPolicy(Policy):
+	def wantsToBuy(self, player: Player, place: object) -> bool:
+		return False
+
+	def wantsToBuild(self, player: Player, place: object) -> bool:
+		return False
+
+	def wantsToUnmortgage(self, player: Player, place: object) -> bool:
+		return False
+
+	def auctionBid(self, player: Player, place: object) -> int:
+		return 0
+
+	def proposeTrade(self, player: Player) -> "Trade":
+		return None
+
+def advice(player: Player, place: object, build: bool = False) -> str:
+	"""the advisor's line for a buy or build prompt, or nothing if it can't be loaded (it needs numpy)"""
+	try: import advisor
+	except ImportError: return ""
+	found = advisor.adviseBuild(place) if build else advisor.adviseBuy(player, place)
+	return f"{Style.dim}Advice: {found.describe()}{Style.RESET_ALL}\n" if found != None else ""
+
+def auction(place: object, player: Player) -> Player:
+	"""
+	sells a place `player` didn't buy to the highest bidder, asking everyone still in the game from `player` round in
+	turn order. each names the most they'd pay and the place goes for £1 over the second highest bid (what an open
+	auction would come to), so it takes one question per player. ties go to the first asked. returns the winner
+	"""
+	player_list = player.getPlayerList() or [player]
+	start = player_list.index(player) if player in player_list else 0
+	best = second = 0
+	winner = None
+	for bidder in player_list[start:] + player_list[:start]:
+		if bidder.bankrupt or bidder.getTotalMoney() <= 0: continue
+		bid = bidder.auctionBid(place)
+		if bid > best: best, second, winner = bid, best, bidder
+		elif bid > second: second = bid
+	if winner == None: return None
+
+	price = min(second + 1, best)
+	winner.payMoney(price, False)
+	place.owner = winner
+	player.showText(f"'{winner.letter}' won the auction for {place.name} with {Text.red}£{price}{Text.RESET}")
+	if events != None: events.append((BUY_EVENT, winner, place.position, price))
+	return winner
+
+class Trade():
+	"""`proposer` gives `give` and `cash` to `receiver` for `take`"""
+	def __init__(self, proposer: Player, receiver: Player, give: list, take: list, cash: int):
+		self.proposer = proposer
+		self.receiver = receiver
+		self.give = give
+		self.take = take
+		self.cash = cash
+
+	def valid(self) -> bool:
+		"""both players own what they'd give up, neither has buildings on it and the proposer has the cash"""
+		if self.receiver is self.proposer or self.receiver.bankrupt or self.cash < 0: return False
+		if self.proposer.getTotalMoney() < self.cash: return False
+		if any(place.owner is not self.proposer for place in self.give): return False
+		if any(place.owner is not self.receiver for place in self.take): return False
+		return not any(other.hasBuildings() for place in self.give + self.take for other in place.group_places)
+
+	def describe(self) -> str:
+		give = [place.name for place in self.give] + ([f"£{self.cash}"] if self.cash else [])
+		return f"'{self.proposer.letter}' offers {', '.join(give) or 'nothing'} for {', '.join(place.name for place in self.take)}"
+
+	def execute(self) -> None:
+		for place in self.give: place.owner = self.receiver
+		for place in self.take: place.owner = self.proposer
+		self.proposer.payMoney(self.cash, False)
+		self.receiver.giveMoney(self.cash)
+
+class PositionIndex():
+	"""
+	the players on each square, kept up to date whenever a player's position changes. it also keeps which squares have
+	changed since the board was last drawn, from moves, jail, owners and buildings, so BoardDisplayer only draws those
+	"""
+	def __init__(self, size: int = 40):
+		self._squares = [[] for _ in range(size)]
+		self.changed = set(range(size))
+
+	def add(self, player: Player) -> None:
+		self._squares[player.position].append(player)
+		self.changed.add(player.position)
+
+	def move(self, player: Player, old_position: int, new_position: int) -> None:
+		self._squares[old_position].remove(player)
+		self._squares[new_position].append(player)
+		self.changed.add(old_position)
+		self.changed.add(new_position)
+
+	def remove(self, player: Player) -> None:
+		self._squares[player.position].remove(player)
+		self.changed.add(player.position)
+
+	def clear(self) -> None:
+		for square in self._squares: square.clear()
+		self.changed.update(range(len(self._squares)))
+
+	def touch(self, position: int) -> None:
+		"""marks a square to be drawn again when something on it other than its players changes"""
+		self.changed.add(position)
+
+	def playersAt(self, position: int) -> list:
+		return self._squares[position]
 
 class ColourTypes(Enum):
 	BROWN = auto()
@@ -209,32 +636,211 @@ class ColourTypes(Enum):
 	DARKBLUE = auto()
 
 def colourTypeToBack(colour: ColourTypes) -> str:
-	"""returns the back colour as a string"""
-	colour_backs = {ColourTypes.BROWN: Back.yellow, 
-									ColourTypes.LIGHTBLUE: Back.light_blue, 
-									ColourTypes.PINK: Back.light_red, 
-									ColourTypes.ORANGE: Back.light_magenta, 
-									ColourTypes.RED: Back.red, 
-									ColourTypes.YELLOW: Back.light_yellow, 
-									ColourTypes.GREEN: Back.green, 
-									ColourTypes.DARKBLUE: Back.blue}
-	return colour_backs[colour]
-
-class Property():
-	def __init__(self, name: str, position: int, colour: ColourTypes, 
-							 cost: int, house_cost: int, rent: int):
+	"""returns the back colour as a string, or nothing before enableColour"""
+	return colour_backs.get(colour, "")
+
+class Place():
+	"""a square on the board. subclasses override landAction for what happens when a player lands on them"""
+	def landAction(self, player: Player) -> None:
+		pass
+
+	def reset(self) -> None:
+		"""puts the square back how it was built, for a new game. see Game.reset"""
+		pass
+
+class OwnablePlace(Place):
+	"""
+	a place players can buy. rent is looked up in rent_table at rent_level, which is kept up to date whenever the
+	owner, the owner's other places in the same group, or the houses change
+	"""
+	prompt_name = "Place"
+
+	def __init__(self, name: str, position: int, cost: int, group: object, rent_table: tuple):
 		self.name = name
 		self.position = position
-		self.colour = colour
 		self.cost = cost
+		self.group = group
+		self.rent_table = rent_table
+		self.rent_level = 0
+
+		self.group_places = [self] # every place in the same group, set by setupBoard
+		self._owner = None
+		self.mortgaged = False
+
+	@property
+	def owner(self) -> Player:
+		return self._owner
+
+	@owner.setter
+	def owner(self, owner: Player) -> None:
+		if owner is self._owner: return
+		old_owner = self._owner
+		self._owner = owner
+		if old_owner != None:
+			old_owner.countGroup(self, -1)
+			old_owner.places.remove(self)
+		if owner != None:
+			owner.countGroup(self, 1)
+			index = next((i for i, place in enumerate(owner.places) if place.position > self.position), len(owner.places))
+			owner.places.insert(index, self)
+		for place in self.group_places: place.updateRentLevel()
+		if game.position_index != None: game.position_index.touch(self.position)
+
+	def ownedInGroup(self) -> int:
+		"""how many places in this group the owner has"""
+		return self._owner.group_counts[self.group] if self._owner != None else 0
+
+	def updateRentLevel(self) -> None:
+		self.rent_level = max(self.ownedInGroup() - 1, 0)
+
+	def getRent(self, dice_total: int) -> int:
+		return self.rent_table[self.rent_level]
+
+	def landAction(self, player: Player) -> None:
+		if player.place_CanBuy(self):
+			player.buyPlace(self.prompt_name)
+		elif self.owner == None:
+			auction(self, player)
+		elif player.place_OtherOwned(self):
+			if not self.mortgaged: player.payRent()
+		elif player.place_Owned(self):
+			self.ownerLanded(player)
+
+	def ownerLanded(self, player: Player) -> None:
+		pass
+
+	@property
+	def mortgage_value(self) -> int:
+		return self.cost // 2
+
+	def unmortgageCost(self) -> int:
+		"""the mortgage plus 10% interest"""
+		return self.mortgage_value + self.mortgage_value // 10
+
+	def hasBuildings(self) -> bool:
+		return False
+
+	def canMortgage(self) -> bool:
+		"""places can only be mortgaged once every building in their group has been sold"""
+		return not self.mortgaged and not any(place.hasBuildings() for place in self.group_places)
+
+	def mortgage(self) -> None:
+		self.mortgaged = True
+		self.owner.giveMoney(self.mortgage_value)
+
+	def unmortgage(self) -> None:
+		self.owner.payMoney(self.unmortgageCost(), False)
+		self.mortgaged = False
+
+	def returnToBank(self) -> None:
+		self.mortgaged = False
+		self.owner = None
+
+	def reset(self) -> None:
+		self._owner = None # the players are reset too, so their counts aren't touched
+		self.mortgaged = False
+		self.rent_level = 0
+
+HOUSE_RENT = 10 # extra rent per house
+HOTEL_RENT = 50 # extra rent for a hotel on top of 4 houses
+HOTEL_LEVEL = 5 # Property.buildings of a place with a hotel
+BANK_HOUSES = 32
+BANK_HOTELS = 12
+
+class Bank():
+	"""the houses and hotels that aren't on the board. there are only so many, and building has to wait when they run out"""
+	def __init__(self, houses: int = BANK_HOUSES, hotels: int = BANK_HOTELS):
+		self.houses = houses
+		self.hotels = hotels
+
+class Property(OwnablePlace):
+	prompt_name = "Property"
+
+	def __init__(self, name: str, position: int, colour: ColourTypes, 
+						 cost: int, house_cost: int, rent: int, rent_table: tuple = None):
+		# rent with: no houses, no houses but the whole colour set, 1-4 houses, a hotel
+		if rent_table == None:
+			rent_table = (rent, rent*2) + tuple(rent + HOUSE_RENT*houses for houses in range(1, 5)) + (rent + HOUSE_RENT*4 + HOTEL_RENT,)
+		super().__init__(name, position, cost, colour, rent_table)
+		self.colour = colour
 		self.house_cost = house_cost
 		self.hotel_cost = house_cost
-		self.rent = rent
 
 		self._houses = 0
 		self._hotels = 0
-
-		self.owner = None
+		self.group_levels = [1] + [0]*HOTEL_LEVEL # how many places of the group have each number of buildings, set by setupBoard
+		self.bank = Bank() # the board's Bank, set by setupBoard
+
+	@property
+	def rent(self) -> int:
+		return self.rent_table[self.rent_level]
+
+	@property
+	def buildings(self) -> int:
+		"""0-4 houses, or HOTEL_LEVEL for a hotel"""
+		return HOTEL_LEVEL if self._hotels else self._houses
+
+	def updateRentLevel(self) -> None:
+		if self._hotels: self.rent_level = 6
+		elif self._houses: self.rent_level = 1 + self._houses
+		elif self._owner != None and self.ownedInGroup() == len(self.group_places): self.rent_level = 1
+		else: self.rent_level = 0
+
+	def ownerLanded(self, player: Player) -> None:
+		player.ownedAction(self)
+
+	def setHouses(self, houses: int, hotels: int) -> None:
+		"""puts buildings on the place, taking them from (or giving them back to) the bank. a hotel stands on 4 houses"""
+		if houses == self._houses and hotels == self._hotels: return
+		old_level = self.buildings
+		self.bank.houses += (0 if self._hotels else self._houses) - (0 if hotels else houses)
+		self.bank.hotels += self._hotels - hotels
+		self._houses = houses
+		self._hotels = hotels
+		self.group_levels[old_level] -= 1
+		self.group_levels[self.buildings] += 1
+		self.updateRentLevel()
+		if game.position_index != None: game.position_index.touch(self.position)
+
+	def returnToBank(self) -> None:
+		self.setHouses(0, 0)
+		super().returnToBank()
+
+	def reset(self) -> None:
+		super().reset()
+		self._houses = 0
+		self._hotels = 0
+		self.group_levels[:] = [len(self.group_places)] + [0]*HOTEL_LEVEL
+
+	def hasBuildings(self) -> bool:
+		return self._houses > 0 or self._hotels > 0
+
+	def sellBuilding(self) -> int:
+		"""
+		sells the hotel, or a house if there isn't one, back to the bank for half what it cost and returns the money.
+		a hotel goes back to 4 houses, or as many as the bank has left with the rest sold too
+		"""
+		if self._hotels:
+			houses = min(4, self.bank.houses)
+			money = self.hotel_cost // 2 + (4 - houses) * (self.house_cost // 2)
+			self.setHouses(houses, 0)
+		else:
+			money = self.house_cost // 2
+			self.setHouses(self._houses - 1, 0)
+		self.owner.giveMoney(money)
+		return money
+
+	def ownsGroup(self) -> bool:
+		return self._owner != None and self.group in self._owner.complete_groups
+
+	def fewestInGroup(self) -> int:
+		"""the fewest buildings on any place in the group. houses have to be built evenly, so only places with this few get the next one"""
+		levels = self.group_levels
+		return next(level for level in range(HOTEL_LEVEL + 1) if levels[level])
+
+	def canDevelop(self, cost: int) -> bool:
+		return self.ownsGroup() and self._owner.getTotalMoney() >= cost and self.buildings == self.fewestInGroup() \
+			and not any(place.mortgaged for place in self.group_places)
 	
 	def standingInfo(self) -> None:
 		"""displays the info of the property when a player stands on it"""
@@ -250,63 +856,58 @@ class Property():
 
 	def ownedAction(self) -> None:
 		"""gets player action when they land on the property and own it"""
-		if self._houses < 4: print(f"[1] Buy house {Text.red}£{self.house_cost}{Text.RESET} {self._houses}/4\n[e] exit\n")
-		elif self._houses == 4 and self.hotels == 0: print(f"[1] Buy house {Text.red}£{self.house_cost}{Text.RESET} {self._houses}/4\n[2] Buy hotel {Text.red}£{self.hotel_cost}{Text.RESET} {self._hotels}/1[e] exit\n")
-		else: print("[e] exit\n")
+		if self.canBuyHouse(): print(f"[1] Buy house {Text.red}£{self.house_cost}{Text.RESET} {self._houses}/4")
+		if self.canBuyHotel(): print(f"[2] Buy hotel {Text.red}£{self.hotel_cost}{Text.RESET} {self._hotels}/1")
+		if not self.ownsGroup(): print("You need the whole colour set to build here")
+		elif not self.canBuild() and self.buildings < HOTEL_LEVEL: print("Houses have to be built evenly, and the bank must have one left")
+		if self.canBuild(): print(advice(self.owner, self, build=True), end="")
+		print("[e] exit\n")
 
 		while True:
 			action = input(" : ")
 			
 			if action.lower().strip() == "e": 
 				break
-			if action == "1" and self._houses < 4:
-				self.owner.payMoney(self.house_cost)
-				self._houses += 1
-				self.rent += 10
+			if action == "1" and self.canBuyHouse():
+				self.buyHouse()
 				print(f"New rent: {Text.green}£{self.rent}{Text.RESET}")
 				break
-			if action == "2" and self._houses == 4 and self._hotels == 1:
-				self.owner.payMoney(self.hotel_cost)
-				self._hotels += 1
-				self.rent += 50
+			if action == "2" and self.canBuyHotel():
+				self.buyHotel()
 				print(f"New rent: {Text.green}£{self.rent}{Text.RESET}")
 				break
 
-def createProperties() -> list:
-	okr = Property("Old Kent Road", 1, ColourTypes.BROWN, 60, 50, 2)
-	wr = Property("Whitechapel Road", 3, ColourTypes.BROWN, 60, 50, 4)
-	tai = Property("The Angel, Islington", 6, ColourTypes.LIGHTBLUE, 100, 50, 6)
-	er = Property("Euston Road", 8, ColourTypes.LIGHTBLUE, 100, 50, 6)
-	pr = Property("Pentonville Road", 9, ColourTypes.LIGHTBLUE, 120, 50, 8)
-	pm = Property("Pall Mall", 11, ColourTypes.PINK, 140, 100, 10)
-	w = Property("Whiteahall", 13, ColourTypes.PINK, 140, 100, 10)
-	na = Property("Northumberland Avenue", 14, ColourTypes.PINK, 160, 100, 12)
-	bws = Property("Bow Street", 16, ColourTypes.ORANGE, 180, 100, 14)
-	ms = Property("Marlborough Street", 18, ColourTypes.ORANGE, 180, 100, 14)
-	vs = Property("Vine street", 19, ColourTypes.ORANGE, 200, 100, 16)
-	s = Property("Strand", 21, ColourTypes.RED, 220, 150, 18)
-	fs = Property("Fleet Street", 23, ColourTypes.RED, 220, 150, 18)
-	ts = Property("Trafalgar Square", 24, ColourTypes.RED, 240, 150, 20)
-	ls = Property("Leicester Square", 26, ColourTypes.YELLOW, 260, 150, 22)
-	cs = Property("Coventry Street", 27, ColourTypes.YELLOW, 260, 150, 22)
-	p = Property("Piccadilly", 29, ColourTypes.YELLOW, 180, 150, 24)
-	rs = Property("Regent Street", 31, ColourTypes.GREEN, 300, 200, 26)
-	os = Property("Oxford Street", 32, ColourTypes.GREEN, 300, 200, 26)
-	bds = Property("Bond Street", 34, ColourTypes.GREEN, 320, 200, 28)
-	pl = Property("Park Lane", 37, ColourTypes.DARKBLUE, 350, 200, 35)
-	m = Property("Mayfair", 39, ColourTypes.DARKBLUE, 400, 200, 39)
-
-	return [okr, wr, tai, er, pr, pm, w, na, bws, ms, vs, s, fs, ts, ls, cs, p, rs, os, bds, pl, m]
-
-class Station():
-	def __init__(self, name: str, position: int):
-		self.name = name
-		self.position = position
+	def canBuyHouse(self) -> bool:
+		return self._houses < 4 and not self._hotels and self.bank.houses > 0 and self.canDevelop(self.house_cost)
 
-		self.cost = 200
-		self.rent = 25
+	def canBuyHotel(self) -> bool:
+		return self._houses == 4 and not self._hotels and self.bank.hotels > 0 and self.canDevelop(self.hotel_cost)
 
-		self.owner = None
+	def canBuild(self) -> bool:
+		return self.canBuyHouse() or self.canBuyHotel()
+
+	def build(self) -> None:
+		"""buys the next building, a house or the hotel"""
+		if self._houses < 4: self.buyHouse()
+		else: self.buyHotel()
+
+	def buyHouse(self) -> None:
+		self.owner.payMoney(self.house_cost)
+		self.setHouses(self._houses + 1, self._hotels)
+
+	def buyHotel(self) -> None:
+		self.owner.payMoney(self.hotel_cost)
+		self.setHouses(self._houses, self._hotels + 1)
+
+class Station(OwnablePlace):
+	prompt_name = "Station"
+
+	def __init__(self, name: str, position: int, cost: int = 200, rent_table: tuple = (25, 50, 100, 200)):
+		super().__init__(name, position, cost, "station", tuple(rent_table)) # rent by how many stations are owned
+
+	@property
+	def rent(self) -> int:
+		return self.rent_table[self.rent_level]
 	
 	def standingInfo(self) -> None:
 		print(f"{Back.white+Style.bold+Text.black} You have arrived at: {self.name} {Style.RESET_ALL}")
@@ -317,23 +918,18 @@ class Station():
 		print(f"{Style.bold}  PRICE:       {Text.red}£{self.cost}{Style.RESET_ALL}")
 		print(f"{Style.bold}  RENT:        {Text.green}£{self.rent}{Style.RESET_ALL}\n")
 
-def createStations() -> list:
-	kc = Station("King's Cross Station", 5)
-	m = Station("Marylebone Station", 15)
-	fs = Station("Fenchurch St. Station", 25)
-	ls = Station("Liverpool St. Station", 35)
-
-	return [ls, m, fs, kc]
+class Utility(OwnablePlace):
+	prompt_name = "Utility"
 
-class Utility():
-	def __init__(self, name: str, position: int):
-		self.name = name
-		self.position = position
+	def __init__(self, name: str, position: int, cost: int = 150, rent_table: tuple = (4, 10)):
+		super().__init__(name, position, cost, "utility", tuple(rent_table)) # dice multiplier by how many utilities are owned
 
-		self.dice_multiplier = 4
+	@property
+	def dice_multiplier(self) -> int:
+		return self.rent_table[self.rent_level]
 
-		self.cost = 150
-		self.owner = None
+	def getRent(self, dice_total: int) -> int:
+		return dice_total * self.rent_table[self.rent_level]
 	
 	def standingInfo(self) -> None:
 		print(f"{Back.white+Style.bold+Text.black} You have arrived at: {self.name} {Style.RESET_ALL}")
@@ -342,37 +938,33 @@ class Utility():
 		print(f"{Back.black} owned by: '{owner}' {Style.RESET_ALL}\n")
 
 		print(f"{Style.bold}  PRICE: {Text.red}£{self.cost}{Style.RESET_ALL}")
-		print(f"{Style.bold}  RENT if 1 utility owned: {Text.blue}4x dice total{Style.RESET_ALL}")
-		print(f"{Style.bold}  RENT if both utilities owned: {Text.blue}10x dice total{Style.RESET_ALL}\n")
-
-def createUtilities() -> list:
-	ec = Utility("Electric Company", 12)
-	ww = Utility("Water Works", 28)
-
-	return [ec, ww]
+		for owned, multiplier in enumerate(self.rent_table, 1):
+			print(f"{Style.bold}  RENT if {owned} owned: {Text.blue}{multiplier}x dice total{Style.RESET_ALL}")
+		print()
 
-class Go():
-	def __init__(self):
+class Go(Place):
+	def __init__(self, salary: int = 200):
 		self.position = 0
+		self.salary = salary # paid for passing go
 	
 	def standingInfo(self):
 		print("You landed on go. Nothing happens")
 
-class Jail():
-	def __init__(self):
-		self.position = 10
+class Jail(Place):
+	def __init__(self, position: int = 10):
+		self.position = position
 	
 	def standingInfo(self):
 		print("Just vising Jail")
 
-class FreeParking():
-	def __init__(self):
-		self.position = 20
+class FreeParking(Place):
+	def __init__(self, position: int = 20):
+		self.position = position
 	
 	def standingInfo(self):
 		print("Free parking!")
 
-class TaxPlace():
+class TaxPlace(Place):
 	def __init__(self, tax_type: str, position: int, to_pay: int):
 		self.tax_type = tax_type
 		self.position = position
@@ -381,41 +973,106 @@ class TaxPlace():
 	def standingInfo(self):
 		print(f"Paying {self.tax_type} tax of {Text.red}£{self.to_pay}{Text.RESET}\n")
 
-class GoToJail():
-	def __init__(self):
-		self.position = 30
+	def landAction(self, player: Player) -> None:
+		player.payMoney(self.to_pay)
+
+class GoToJail(Place):
+	def __init__(self, position: int = 30):
+		self.position = position
 
 		self.crimes = ["committing tax fraud", "thinking python is bad", "walking slowly in front of people", "shopping for NFTs", "unironically watching ben shapiro", "не подчиняясь Родине", "caring about elon musk", "using facebook", "simping for FNAF animatronics", "watching dreamSMP", "telling people the wordle answer", "thinking 'oh no our table is broken' is funny", "vacuuming after 1pm on a Sunday", "having a stash of over-the-counter decongestant pills that could be used to make methamphetamine", "doing nothing", "watching tommyinnit", "agreeing with jordan peterson", "ne pas se rendre", "being a man with a podcast", "watching joe rogan", "not being a high-value alpha female", "alienating the worker from the means of production", "hating silco from arcane", "carrying a plank of wood down the street"]
 	
 	def standingInfo(self):
-		print(f"Uh oh! The police found you {Text.red+Back.black}{random.choice(self.crimes)}{Style.RESET_ALL}! They have decided to put you in jail!")
+		print(f"Uh oh! The police found you {Text.red+Back.black}{rng.choice(self.crimes)}{Style.RESET_ALL}! They have decided to put you in jail!")
+
+	def landAction(self, player: Player) -> None:
+		player.goToJail()
+
+class Deck():
+	"""
+	a pile of cards drawn from the top in turn. the draw order is shuffled once the pile runs out, and cards players
+	are holding stay out of the pile until they're put back underneath it
+	"""
+	def __init__(self, cards: list):
+		self.cards = cards
+		for index, card in enumerate(cards):
+			card.deck = self
+			card.deck_index = index
+		self.order = [] # card indices from the top of the pile down, drawn from self.next on
+		self.next = 0
+		self.held = {} # card index -> player holding it
+
+	def reset(self, player_list: list) -> None:
+		"""puts every card back for a new game between `player_list`. the first draw shuffles them"""
+		self.order = []
+		self.next = 0
+		self.held = {}
+		for card in self.cards: card.setPlayerList(player_list)
+
+	def shuffle(self) -> None:
+		self.order = [index for index in range(len(self.cards)) if index not in self.held]
+		rng.shuffle(self.order)
+		self.next = 0
+		if game_log != None: game_log.shuffle(self.order)
+
+	def draw(self) -> "Card":
+		if self.next >= len(self.order): self.shuffle()
+		card = self.cards[self.order[self.next]]
+		self.next += 1
+		return card
+
+	def hold(self, card: "Card", player: Player) -> None:
+		self.held[card.deck_index] = player
+		player.jail_free_cards.append(card)
+
+	def putBack(self, card: "Card") -> None:
+		"""returns a held card to the bottom of the pile"""
+		del self.held[card.deck_index]
+		self.order.append(card.deck_index)
+
+	def getState(self, seats: dict) -> tuple:
+		"""(pile order, next, ((card index, holder's seat), ...)), with `seats` mapping players to seat numbers"""
+		return tuple(self.order), self.next, tuple((index, seats[player]) for index, player in self.held.items())
+
+	def setState(self, state: tuple, player_list: list) -> None:
+		order, self.next, held = state
+		self.order = list(order)
+		self.held = {index: player_list[seat] for index, seat in held}
 
 class Card():
 	def __init__(self, description: str):
 		self.description = description
 
 		self.player = None
+		self.deck = None # set by the Deck the card is put in
+		self.deck_index = None
 	
+	def setPlayerList(self, player_list: list) -> None:
+		"""the players of a new game on the same board, for cards that involve all of them"""
+		pass
+
 	def play(self, player: object):
-		print("	" + self.description)
+		player.showText("	" + self.description)
 		self.player = player
+		if events != None: events.append((CARD_EVENT, player, player.position, self.deck_index))
 
 		self.actions() # created in subclass
 	
 class goCard(Card):
-	"""card advances you to go and gives £200"""
-	def __init__(self):
-		description = f"Advance to go (Collect {Text.green}£200{Text.RESET})"
+	"""card advances you to go and gives the go salary"""
+	def __init__(self, salary: int = 200, currency: str = "£"):
+		description = f"Advance to go (Collect {Text.green}{currency}{salary}{Text.RESET})"
 		super().__init__(description)
+		self.salary = salary
 	
 	def actions(self):
 		self.player.position = 0
-		self.player.giveMoney(200, True)
+		self.player.giveMoney(self.salary, True)
 	
 class collectCard(Card):
 	"""card gives you a specified amount of money"""
-	def __init__(self, description: str, collect_amount: int):
-		description = f"{description}. Collect {Text.green}£{collect_amount}{Text.RESET}"
+	def __init__(self, description: str, collect_amount: int, currency: str = "£"):
+		description = f"{description}. Collect {Text.green}{currency}{collect_amount}{Text.RESET}"
 		super().__init__(description)
 		self.collect_amount = collect_amount
 	
@@ -424,8 +1081,8 @@ class collectCard(Card):
 
 class payCard(Card):
 	"""card makes you pay a certain amount"""
-	def __init__(self, description: str, pay_amount: int):
-		description = f"{description}. Pay {Text.red}£{pay_amount}{Text.RESET}\n"
+	def __init__(self, description: str, pay_amount: int, currency: str = "£"):
+		description = f"{description}. Pay {Text.red}{currency}{pay_amount}{Text.RESET}\n"
 		super().__init__(description)
 		self.pay_amount = pay_amount
 	
@@ -434,111 +1091,103 @@ class payCard(Card):
 
 class jailCard(Card):
 	"""card sends you to jail"""
-	def __init__(self):
-		super().__init__(f"{Text.red} Go to jail. Go directly do jail, do not pass Go, do not collect £200{Text.RESET}")
+	def __init__(self, salary: int = 200, currency: str = "£"):
+		super().__init__(f"{Text.red} Go to jail. Go directly do jail, do not pass Go, do not collect {currency}{salary}{Text.RESET}")
 	
 	def actions(self):
 		self.player.goToJail()
 
 class collectPlayersCard(Card):
 	"""collect a certain amount of money from players"""
-	def __init__(self, player_list: list, description: str, collect_amount: int):
-		description = f"{description}. Collect {Text.green}£{collect_amount}{Text.RESET} from every player"
+	def __init__(self, player_list: list, description: str, collect_amount: int, currency: str = "£"):
+		description = f"{description}. Collect {Text.green}{currency}{collect_amount}{Text.RESET} from every player"
 		super().__init__(description)
 		self.player_list = player_list
 		self.collect_amount = collect_amount
+
+	def setPlayerList(self, player_list: list) -> None:
+		self.player_list = player_list
 	
 	def actions(self):
-		self.player_list.remove(self.player)
 		for player in self.player_list:
-			player.payMoney(self.collect_amount, False)
-			self.player.giveMoney(self.collect_amount)
-		self.player_list.append(self.player)
+			if player is self.player or player.bankrupt: continue
+			self.player.giveMoney(player.payMoney(self.collect_amount, False, self.player))
+
+class jailFreeCard(Card):
+	"""kept until the player uses it to get out of jail"""
+	def __init__(self):
+		super().__init__(f"{Text.green}Get out of jail free.{Text.RESET} This card may be kept until needed")
+	
+	def actions(self):
+		self.deck.hold(self, self.player)
 
 class AdvanceCard(Card):
 	"""advances player to specified place"""
-	def __init__(self, jump_position: int, jump_name: str, collect_go: bool = False):
+	def __init__(self, jump_position: int, jump_name: str, collect_go: bool = False, salary: int = 200, currency: str = "£"):
 		description = f"Advance to {Back.black + Style.bold+ jump_name + Style.RESET_ALL}"
 		if collect_go:
-			description += f". If you pass Go, collect {Text.green}£200{Text.RESET}"
+			description += f". If you pass Go, collect {Text.green}{currency}{salary}{Text.RESET}"
 		super().__init__(description)
 		self.jump_position = jump_position
 		self.collect_go = collect_go
+		self.salary = salary
+		self.currency = currency
 
 	def actions(self) -> None:
 		"""logic for when player gets card"""
 		if self.collect_go and self.player.position > self.jump_position:
-			print(f"\nYou passed go! Collecting {Text.green}£200{Text.RESET}")
-			self.player.giveMoney(200, True)
+			self.player.showText(f"\nYou passed go! Collecting {Text.green}{self.currency}{self.salary}{Text.RESET}")
+			self.player.giveMoney(self.salary, True)
 
 		self.player.position = self.jump_position
 		self.player.enterPrompt("arrive")
 		self.player.standingInfo()
 		self.player.standingAction()
 
-def makeCommunityChests(player_list: list):
-	player_list = player_list.copy()
-	cc1 = goCard()
-	cc2 = collectCard("Bank error in your favour", 200)
-	cc3 = payCard("Doctor's fee", 50)
-	cc4 = collectCard("Stock sale", 50)
-	cc6 = jailCard()
-	cc7 = collectCard("Holiday fund matures", 100)
-	cc8 = collectCard("Income tax refund", 20)
-	cc9 = collectPlayersCard(player_list, "It's your birthday", 10)
-	cc10 = collectCard("Life insurance matures", 100)
-	cc11 = payCard("Pay hospital fees", 100)
-	cc12 = payCard("Pay school fees", 50)
-	cc13 = collectCard("Receive consultancy fee", 25)
-	cc15 = collectCard("You have won second prize in a beauty contest", 10)
-	cc16 = collectCard("You inherit £100", 100)
-
-	return [cc1,cc2, cc3, cc4, cc6, cc7, cc8, cc9, cc10, cc11, cc12, cc13, cc15, cc16]
-
-class CommunityChestManager():
-	def __init__(self, position: int, community_chests: list):
+class CommunityChestManager(Place):
+	def __init__(self, position: int, deck: Deck):
 		self.position = position
-		self.community_chests = community_chests
+		self.deck = deck
+		self.community_chests = deck.cards
 	
 	def standingInfo(self):
 		print(f"{Back.light_blue+Text.black+Style.bold} You landed on a community chest! {Style.RESET_ALL}")
 	
 	def getChest(self, player: object):
-		chest = random.choice(self.community_chests)
-		chest.play(player)
-
-def makeChanceCards(player_list: list):
-	player_list = player_list.copy()
-	cc1 = goCard()
-	cc2 = AdvanceCard(24, "Trafalgar Square", collect_go=True)
-	cc3 = AdvanceCard(39, "Mayfair")
-	cc4 = AdvanceCard(11, "Pall Mall", collect_go=True)
-	cc8 = collectCard("Bank pays you dividend", 50)
-	cc11 = jailCard()
-	cc13 = payCard("Speeding fine", 15)
-	cc14 = AdvanceCard(5, "Kings Cross Station", collect_go=True)
-	cc16 = collectCard("Your building loan matures", 150)
-
-	return [cc1, cc2, cc3, cc4, cc8, cc11, cc13, cc14, cc16]
-
-class ChanceCardManager():
-	def __init__(self, position: int, chance_cards: list):
+		self.deck.draw().play(player)
+
+	def landAction(self, player: Player) -> None:
+		self.getChest(player)
+
+class ChanceCardManager(Place):
+	def __init__(self, position: int, deck: Deck):
 		self.position = position
-		self.chance_cards = chance_cards
+		self.deck = deck
+		self.chance_cards = deck.cards
 
 	def standingInfo(self) -> None:
 		print(f"{Back.light_blue+Text.black+Style.bold} You landed on a chance card! {Style.RESET_ALL}")
 
 	def getCard(self, player: Player):
-		card = random.choice(self.chance_cards)
-		card.play(player)
+		self.deck.draw().play(player)
+
+	def landAction(self, player: Player) -> None:
+		self.getCard(player)
+
+CLEAR_SCREEN = "\033[H\033[2J"
+BELOW_BOARD = "\033[12;1H\033[J" # cursor to the line under the board, and clear everything after it
+LOCK_BOARD = "\033[12r" # only the lines under the board scroll, so the squares stay where they were drawn
+UNLOCK_BOARD = "\0337\033[r\0338" # the whole screen scrolls again, keeping the cursor where it is
 
 class BoardDisplayer():
 	def __init__(self):
-		self._player_list = []
+		self._position_index = PositionIndex()
+		self._cell_moves = None
+		self._cells = None # what each square was last drawn as, None if the screen needs a full redraw
 	
-	def setPlayerList(self, player_list: list) -> None:
-		self._player_list = player_list
+	def setPositionIndex(self, position_index: PositionIndex) -> None:
+		self._position_index = position_index
+		self.redraw()
 
 	def getBackColour(self, place) -> str:
 		try: colour = colourTypeToBack(place.colour)
@@ -546,39 +1195,72 @@ class BoardDisplayer():
 
 		return colour
 
-	def getPlayerSymbol(self, player_list: list, board_index: int) -> str:
+	def getPlayerSymbol(self, board_index: int) -> str:
 		"""returs the symbol for the player(s) on the specific board number"""
-		players_at_pos = [player for player in player_list if player.position == board_index]
+		players_at_pos = self._position_index.playersAt(board_index)
 		if len(players_at_pos) == 0: player = " "
 		elif len(players_at_pos) == 1: 
 			player = players_at_pos[0].letter if players_at_pos[0].in_jail == False else Text.red + players_at_pos[0].letter
 		else: player = "#"
 		return Text.black + player + Text.RESET
 
-	def getSquare(self, board_index: int, player_list: list) -> str:
+	def getSquare(self, board_index: int) -> str:
 		"""returns the board square for the board number"""
-		colour = self.getBackColour(board[board_index])
-		player_symbol = self.getPlayerSymbol(player_list, board_index)
+		colour = self.getBackColour(game.board[board_index])
+		player_symbol = self.getPlayerSymbol(board_index)
 		return colour + f" {player_symbol} " + Back.RESET
 
-	def printBoard(self) -> None:
-		total_string = ""
-
-		for i in range(20, 31): # top bar
-			total_string += self.getSquare(i, self._player_list)
-		total_string += "\n"
-		
+	def cellPositions(self) -> list:
+		"""the ANSI cursor move to the top left of every square, rows and columns counted from 1"""
+		positions = [None]*40
+		for i in range(20, 31): positions[i] = (1, (i-20)*3 + 1) # top bar
 		for i in range(1, 10): # side bars
-			total_string += self.getSquare(20-i, self._player_list)
-			total_string += "   " * 9
-			total_string += self.getSquare(30+i, self._player_list)
-			total_string += "\n"
+			positions[20-i] = (1+i, 1)
+			positions[30+i] = (1+i, 10*3 + 1)
+		for i in range(10, -1, -1): positions[i] = (11, (10-i)*3 + 1) # bottom bar
+		return [f"\033[{row};{column}H" for row, column in positions]
 
-		for i in range(10, -1, -1): # bottom bar
-			total_string += self.getSquare(i, self._player_list)
-		
-		os.system('clear')
-		print(total_string)
+	def redraw(self) -> None:
+		"""makes the next printBoard clear the screen and draw every square, e.g. after something else cleared it"""
+		self._cells = None
+
+	def renderCells(self) -> list:
+		"""every square as it's drawn now"""
+		return [self.getSquare(i) for i in range(len(game.board))]
+
+	def drawCells(self, cells: list, previous: list = None) -> str:
+		"""the output that turns a screen showing `previous` into `cells`, clearing it and drawing them all if None"""
+		if self._cell_moves == None: self._cell_moves = self.cellPositions()
+		if previous == None: return CLEAR_SCREEN + "".join(move + cell for move, cell in zip(self._cell_moves, cells))
+		return "".join(self._cell_moves[i] + cell for i, cell in enumerate(cells) if cell != previous[i])
+
+	def printBoard(self) -> None:
+		"""
+		draws the squares the position index says changed since the last call, then clears the text below the board.
+		the board is locked at the top of the screen, so text scrolling underneath it can't move the squares away from
+		where they're drawn
+		"""
+		changed = self._position_index.changed
+		if self._cells == None:
+			self._cells = self.renderCells()
+			output = LOCK_BOARD + self.drawCells(self._cells)
+		else:
+			if self._cell_moves == None: self._cell_moves = self.cellPositions()
+			output = ""
+			for i in changed:
+				cell = self.getSquare(i)
+				if cell == self._cells[i]: continue
+				self._cells[i] = cell
+				output += self._cell_moves[i] + cell
+		changed.clear()
+
+		sys.stdout.write(output + BELOW_BOARD)
+		sys.stdout.flush()
+
+	def close(self) -> None:
+		"""lets the whole screen scroll again once the game's over"""
+		sys.stdout.write(UNLOCK_BOARD)
+		sys.stdout.flush()
 
 def enterPlayer(player_list, used_characters, player_num = None) -> str:
 	if player_num != None: player_num += 1 # for display, as index 0 = 1
@@ -595,6 +1277,19 @@ def enterPlayer(player_list, used_characters, player_num = None) -> str:
 		elif choice == "#":
 			print(Text.red + "unavailable character" + Text.RESET)
 
+def enterPlayerType(player_num: int) -> str:
+	"""asks whether a player is a person or the computer"""
+	while True:
+		choice = input(f"player {player_num}: [1] human [2] computer : ")
+		if choice == "1": return "human"
+		if choice == "2": return "computer"
+
+def makePlayer(letter: str, player_type: str) -> Player:
+	if player_type == "computer":
+		from mcts import MCTSPlayer
+		return MCTSPlayer(letter)
+	return Player(letter)
+
 def pickPlayer(player_list) -> int:
 	"""displays a list of players and their letters to choose from. if an invalid choice is sent return None"""
 	[print(f"[player {i+1}] '{player.letter}'") for i, player in enumerate(player_list)]
@@ -611,7 +1306,7 @@ def createPlayers() -> list:
 	menu_state = "add player"
 
 	while True: # add player menu loop
-		os.system('clear')
+		print(CLEAR_SCREEN, end="")
 		print(Back.white + Style.bold + Text.black + f" {menu_state.upper()} " + Style.RESET_ALL + "\n")
 			
 		if menu_state == "main menu":
@@ -625,7 +1320,8 @@ def createPlayers() -> list:
 
 		elif menu_state == "add player":
 			player_letter = enterPlayer(player_list, used_characters)
-			player_list.append(Player(player_letter))
+			player_type = enterPlayerType(len(player_list)+1)
+			player_list.append(makePlayer(player_letter, player_type))
 			used_characters.append(player_letter)
 
 			if len(player_list) >= 2:
@@ -652,51 +1348,134 @@ def createPlayers() -> list:
 	
 	return player_list
 
-def main():
-	global board
-
+class Game():
+	"""
+	the board, decks and bank of a game. the board is built from the ruleset the first time it's asked for and then
+	kept, so each new game on it only puts the places and decks back how they started. main.game is the game being
+	played, and code that runs several in one process (server tables, searches) swaps its own in
+	"""
+	def __init__(self, ruleset: object = None):
+		self.ruleset = ruleset # a ruleset.Ruleset, the default one if None
+		self.decks = []
+		self.bank = Bank()
+		self.position_index = None # where the players of the game set up last are
+
+	@cached_property
+	def board(self) -> list:
+		"""built when it's first used. build() keeps it on the game, so after that it's an ordinary attribute"""
+		self.build([])
+		return self.__dict__["board"]
+
+	def build(self, player_list: list) -> None:
+		if self.ruleset == None:
+			from ruleset import loadRuleset
+			self.ruleset = loadRuleset()
+		self.board = self.ruleset.buildBoard(player_list)
+
+		groups = {}
+		for place in self.board:
+			if isinstance(place, OwnablePlace): groups.setdefault(place.group, []).append(place)
+		for group_places in groups.values():
+			group_levels = [len(group_places)] + [0]*HOTEL_LEVEL
+			for place in group_places:
+				place.group_places = group_places
+				place.group_levels = group_levels
+
+		self.bank = Bank()
+		self.decks = []
+		for place in self.board:
+			if isinstance(place, Property): place.bank = self.bank
+			deck = getattr(place, "deck", None)
+			if deck != None and deck not in self.decks: self.decks.append(deck)
+
+	def reset(self, player_list: list) -> None:
+		"""puts the board back how it was built, for a new game between `player_list`"""
+		for place in self.board: place.reset()
+		for deck in self.decks: deck.reset(player_list)
+		self.bank.houses = BANK_HOUSES
+		self.bank.hotels = BANK_HOTELS
+
+	def setup(self, player_list: list, ruleset: object = None) -> PositionIndex:
+		"""readies the board for a new game, gives the players the starting money and returns where they are"""
+		if ruleset != None and ruleset is not self.ruleset:
+			self.ruleset = ruleset
+			self.__dict__.pop("board", None)
+		if "board" in self.__dict__: self.reset(player_list)
+		else: self.build(player_list)
+
+		position_index = PositionIndex(len(self.board))
+		for player in player_list: 
+			player._total_money = self.ruleset.starting_money
+			player.jail_free_cards = []
+			player.places = []
+			player.group_counts = {}
+			player.nearly_complete = set()
+			player.complete_groups = set()
+			player.setPositionIndex(position_index)
+			player.setPlayerList(player_list)
+		self.position_index = position_index
+		return position_index
+
+game = Game()
+
+def boardDecks() -> list:
+	"""every Deck on the board, in board order"""
+	return game.decks
+
+def setupBoard(player_list: list, ruleset: object = None) -> PositionIndex:
+	"""
+	readies main.game for a new game between `player_list` on a ruleset.Ruleset (the one the game was last set up
+	with, or the default one, if not given). returns where the players are
+	"""
+	return game.setup(player_list, ruleset)
+
+def main(record_path: str = None, ruleset_name: str = None):
+	global game_log
+	enableColour()
 	board_displayer = BoardDisplayer()
 
-	# SETUP BOARD
-	properties = createProperties()
-	for p in properties: board[p.position] = p
-
-	stations = createStations()
-	for s in stations: board[s.position] = s
-
-	utilities = createUtilities()
-	for u in utilities: board[u.position] = u
-
-	go = Go()
-	jail = Jail()
-	free_parking = FreeParking()
-	go_to_jail = GoToJail()
-	income_tax = TaxPlace("income", 4, 200)
-	super_tax = TaxPlace("super", 38, 100)
-	for place in [go, jail, free_parking, go_to_jail, income_tax, super_tax]: board[place.position] = place
-
 	player_list = createPlayers()
 	#player_list = [Player("a"), Player("b")]
+	ruleset = None
+	if ruleset_name != None:
+		from ruleset import loadRuleset
+		ruleset = loadRuleset(ruleset_name)
+	position_index = setupBoard(player_list, ruleset)
+
+	if record_path != None:
+		from replay import GameLog
+		game_log = GameLog(record_path, flush_every=1)
+		game_log.startGame([player.letter for player in player_list])
 	
-	board_displayer.setPlayerList(player_list)
+	board_displayer.setPositionIndex(position_index)
 	[player.setBoardDisplayer(board_displayer) for player in player_list]
-
-	community_chests = makeCommunityChests(player_list)
-	ccm1 = CommunityChestManager(2, community_chests)
-	ccm2 = CommunityChestManager(17, community_chests)
-	ccm3 = CommunityChestManager(33, community_chests)
-	for ccm in [ccm1, ccm2, ccm3]: board[ccm.position] = ccm
-
-	chance_cards = makeChanceCards(player_list)
-	ccm1 = ChanceCardManager(7, chance_cards)
-	ccm2 = ChanceCardManager(22, chance_cards)
-	ccm3 = ChanceCardManager(36, chance_cards)
-	for ccm in [ccm1, ccm2, ccm3]: board[ccm.position] = ccm
 	
 	# MAIN GAME LOOP
-	while True:
-		[player.turn() for player in player_list]
-	board_displayer.printBoard()
+	from simulation import MAX_TURNS, TurnOrder
+	order = TurnOrder(player_list.copy(), max_turns=MAX_TURNS)
+	try:
+		while not order.finished(): order.playTurn()
+		board_displayer.printBoard()
+	finally: board_displayer.close()
+	if len(order.active) > 1: print(f"\nThat's {MAX_TURNS} turns! The richest player wins.")
+	print(f"\n{Back.white+Style.bold+Text.black} PLAYER '{order.winner().letter}' WINS! {Style.RESET_ALL}")
 
 if __name__ == "__main__":
-	main()
\ No newline at end of file
+	sys.modules["main"] = sys.modules["__main__"] # so modules that import main share this board
+	import argparse
+	parser = argparse.ArgumentParser(description="play monopoly in the terminal")
+	parser.add_argument("--record", metavar="PATH", help="append a replay log of the game to PATH")
+	parser.add_argument("--ruleset", help="a board from rulesets/, or the path of a ruleset json file (default uk)")
+	parser.add_argument("--instrument", metavar="PATH", help="time the turn loop, writing json to PATH and pstats to PATH.prof on exit")
+	args = parser.parse_args()
+
+	instruments = None
+	if args.instrument != None:
+		from instrument import Instrumentation
+		instruments = Instrumentation()
+		instruments.enable()
+	try: main(args.record, args.ruleset)
+	finally:
+		if instruments != None:
+			instruments.writeJson(args.instrument)
+			instruments.dumpStats(args.instrument + ".prof")
\ No newline at end of file
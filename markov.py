@@ -0,0 +1,140 @@
+"""solves the board as a markov chain for exact long run occupancy and expected rent, instead of sampling it"""
+import argparse
+import hashlib
+import os
+
+import numpy as np
+
+import main
+from landing import BoardTables, GO_TO_JAIL
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+JAIL_TURNS = 3
+
+class MarkovBoard():
+	"""
+	one state per (square, doubles rolled this turn) plus one per jail turn left. every transition is one roll,
+	matching a step of landing.LandingEngine
+	"""
+	def __init__(self, tables: BoardTables = None, cache_dir: str = CACHE_DIR):
+		self.tables = tables or BoardTables()
+		self.size = self.tables.size
+		self.states = self.size*3 + JAIL_TURNS + 1
+
+		path = os.path.join(cache_dir, f"markov-{self.key()}.npz") if cache_dir else None
+		if path and os.path.exists(path):
+			with np.load(path) as cached:
+				self.transitions = cached["transitions"]
+				self.stationary = cached["stationary"]
+				self.landings = cached["landings"]
+				self.dice_landings = cached["dice_landings"]
+			return
+
+		self.transitions, arrivals, dice_arrivals = self.buildTransitions()
+		self.stationary = self.solve(self.transitions)
+		self.landings = self.stationary @ arrivals
+		self.dice_landings = self.stationary @ dice_arrivals
+
+		if path:
+			os.makedirs(cache_dir, exist_ok=True)
+			temp_path = f"{path}.{os.getpid()}.tmp.npz"
+			np.savez(temp_path, transitions=self.transitions, stationary=self.stationary,
+							 landings=self.landings, dice_landings=self.dice_landings)
+			os.replace(temp_path, path)
+
+	def key(self) -> str:
+		"""identifies the board rules the matrix was built from, so a changed board isn't served a stale cache"""
+		rules = repr((self.size, self.tables.jail_position, self.tables.destinations, JAIL_TURNS))
+		return hashlib.sha1(rules.encode()).hexdigest()[:16]
+
+	def normalState(self, position: int, doubles: int) -> int:
+		return doubles*self.size + position
+
+	def jailState(self, turns_left: int) -> int:
+		return self.size*3 + turns_left
+
+	def buildTransitions(self):
+		"""
+		returns the transition matrix, and for each state the chance per roll of landing on each square
+		(and the same weighted by the dice total, for utility rent)
+		"""
+		transitions = np.zeros((self.states, self.states))
+		arrivals = np.zeros((self.states, self.size))
+		dice_arrivals = np.zeros((self.states, self.size))
+		rolls = [(first + second, first == second) for first in range(1, 7) for second in range(1, 7)]
+
+		def land(state: int, start: int, total: int, doubles: int, chance: float) -> None:
+			landed = (start + total) % self.size
+			outcomes = self.tables.destinations[landed]
+			for destination in outcomes:
+				share = chance / len(outcomes)
+				if destination == GO_TO_JAIL:
+					transitions[state, self.jailState(JAIL_TURNS)] += share
+				else:
+					transitions[state, self.normalState(destination, doubles)] += share
+					arrivals[state, destination] += share
+					dice_arrivals[state, destination] += share * total
+
+		def rollFrom(state: int, position: int, doubles: int) -> None:
+			for total, double in rolls:
+				if double and doubles == 2:
+					transitions[state, self.jailState(JAIL_TURNS)] += 1/36
+				else: land(state, position, total, doubles + 1 if double else 0, 1/36)
+
+		for doubles in range(3):
+			for position in range(self.size):
+				rollFrom(self.normalState(position, doubles), position, doubles)
+
+		# with no jail turns left you walk out and roll normally
+		rollFrom(self.jailState(0), self.tables.jail_position, 0)
+		for turns_left in range(1, JAIL_TURNS + 1):
+			state = self.jailState(turns_left)
+			transitions[state, self.jailState(turns_left - 1)] += 30/36
+			# a double gets you out, then you roll again to move and can't chain doubles
+			for total, _ in rolls:
+				land(state, self.tables.jail_position, total, 0, 6/36 * 1/36)
+
+		return transitions, arrivals, dice_arrivals
+
+	def solve(self, transitions: np.ndarray) -> np.ndarray:
+		"""the stationary distribution: pi @ transitions == pi and sum(pi) == 1"""
+		equations = transitions.T - np.eye(self.states)
+		equations[-1] = 1
+		target = np.zeros(self.states)
+		target[-1] = 1
+		return np.linalg.solve(equations, target)
+
+	def occupancy(self) -> np.ndarray:
+		"""the long run chance of a token being on each square at the end of a roll"""
+		squares = self.stationary[:self.size*3].reshape(3, self.size).sum(axis=0)
+		squares[self.tables.jail_position] += self.stationary[self.size*3:].sum()
+		return squares
+
+	def defaultRents(self) -> tuple:
+		"""the rent tables of the board, as {position: rent} and {position: dice multiplier}"""
+		rents = {place.position: place.rent for place in self.tables.board if isinstance(place, (main.Property, main.Station))}
+		multipliers = {place.position: place.dice_multiplier for place in self.tables.board if isinstance(place, main.Utility)}
+		return rents, multipliers
+
+	def expectedRent(self, rents: dict = None, multipliers: dict = None) -> dict:
+		"""expected rent paid per roll of one opponent, for each square in the rent tables"""
+		if rents == None and multipliers == None: rents, multipliers = self.defaultRents()
+		expected = {position: float(self.landings[position] * rent) for position, rent in (rents or {}).items()}
+		for position, multiplier in (multipliers or {}).items():
+			expected[position] = float(self.dice_landings[position] * multiplier)
+		return expected
+
+def run(argv: list = None) -> None:
+	parser = argparse.ArgumentParser(description="exact long run occupancy and expected rent for the board")
+	parser.add_argument("--no-cache", action="store_true")
+	args = parser.parse_args(argv)
+
+	chain = MarkovBoard(cache_dir=None if args.no_cache else CACHE_DIR)
+	occupancy = chain.occupancy()
+	rent = chain.expectedRent()
+	for position, name in enumerate(chain.tables.names()):
+		rent_text = f"£{rent[position]:.3f}" if position in rent else ""
+		print(f"{position:>2} {name:<25} {occupancy[position]:.4%}  {rent_text}")
+
+if __name__ == "__main__":
+	run()
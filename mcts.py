@@ -0,0 +1,139 @@
+"""a computer player that decides buys and builds by playing the game out many times from the current state"""
+import atexit
+import math
+import multiprocessing
+import multiprocessing.pool
+import random
+import time
+
+import main
+from main import BotPlayer, Policy
+from simulation import playTurns
+from state import GameState
+
+BUY = "buy"
+BUILD = "build"
+PASS = "pass"
+
+ROLLOUT_POLICY = Policy() # how every player plays during a rollout
+EXPLORATION = math.sqrt(2)
+WORKER_BUDGET = 0.8 # share of the time budget workers spend on rollouts, the rest covers sending the results back
+
+_rollout_games = {} # (ruleset key, player count) -> (bots, main.Game) this process plays rollouts with
+_pools = {}
+
+def rolloutGame(ruleset: object, players: int) -> tuple:
+	"""the bots and game this process plays rollouts with, made once for each ruleset and player count"""
+	key = (ruleset.key, players)
+	if key not in _rollout_games:
+		bots = [BotPlayer(str(seat), ROLLOUT_POLICY) for seat in range(players)]
+		game = main.Game(ruleset)
+		game.setup(bots)
+		_rollout_games[key] = (bots, game)
+	return _rollout_games[key]
+
+def netWorth(player: BotPlayer) -> int:
+	worth = player.getTotalMoney()
+	for place in player.places: worth += place.cost + getattr(place, "_houses", 0) * getattr(place, "house_cost", 0)
+	return worth
+
+def rollout(state: GameState, seat: int, action: str, bots: list, seed: int, rollout_turns: int) -> float:
+	"""plays on from the state after `seat` takes `action`. returns a reward between 0 (bankrupt) and 1 (won)"""
+	state.restore(bots)
+	main.rng.seed(seed)
+	player = bots[seat]
+	place = main.game.board[player.position]
+	if action == BUY: player.purchase(place)
+	elif action == BUILD: place.build()
+
+	active = state.activePlayers(bots)
+	if player.getTotalMoney() < 0: return 0.0
+	playTurns(active, rollout_turns, (active.index(player) + 1) % len(active))
+
+	if player.bankrupt: return 0.0
+	if len(active) == 1: return 1.0
+	worths = [max(netWorth(bot), 0) for bot in active]
+	return netWorth(player) / sum(worths) if sum(worths) else 0.0
+
+def search(task: tuple) -> list:
+	"""runs UCB1-picked rollouts of each action until the time budget is spent. returns [visits, total reward] per action"""
+	state, seat, actions, budget, seed, rollout_turns, ruleset = task
+	deadline = time.perf_counter() + budget
+	bots, rollout_game = rolloutGame(ruleset, len(state.positions))
+	seeds = random.Random(seed)
+	results = [[0, 0.0] for _ in actions]
+
+	live_game, live_log, live_events = main.game, main.game_log, main.events
+	live_rng = main.rng.getstate()
+	main.game = rollout_game
+	main.game_log = main.events = None # rollouts aren't part of the game being recorded or streamed
+	try:
+		visits = 0
+		while visits < len(actions) or time.perf_counter() < deadline:
+			if visits < len(actions): choice = visits
+			else: choice = max(range(len(actions)), key=lambda i: results[i][1]/results[i][0] + EXPLORATION*math.sqrt(math.log(visits)/results[i][0]))
+			results[choice][0] += 1
+			results[choice][1] += rollout(state, seat, actions[choice], bots, seeds.getrandbits(32), rollout_turns)
+			visits += 1
+	finally:
+		main.game, main.game_log, main.events = live_game, live_log, live_events
+		main.rng.setstate(live_rng)
+	return results
+
+def getPool(workers: int) -> multiprocessing.pool.Pool:
+	if workers not in _pools: _pools[workers] = multiprocessing.Pool(workers)
+	return _pools[workers]
+
+@atexit.register
+def closePools() -> None:
+	"""stops the worker pools searches have started. they're made again if another search needs them"""
+	for pool in _pools.values():
+		pool.terminate()
+		pool.join()
+	_pools.clear()
+
+class MCTSPolicy(Policy):
+	"""
+	root parallel monte carlo tree search over the buy/build choice: every worker runs its own UCB1 search for the
+	time budget and the visit totals are added up. workers=0 searches in this process, None uses every core.
+
+	time_budget is the seconds spent on each decision, and the only knob on how well it plays. a game has 20-35 buy
+	and build decisions, so the default of 25ms keeps a game against it under a second while still playing each
+	action out some 60 times a worker. rollouts look rollout_turns turns ahead; longer ones see more of the game but
+	fewer of them fit in the budget
+	"""
+	def __init__(self, time_budget: float = 0.025, workers: int = None, rollout_turns: int = 20, seed: int = None):
+		self.time_budget = time_budget
+		self.workers = workers if workers != None else multiprocessing.cpu_count()
+		self.rollout_turns = rollout_turns
+		self._seeds = random.Random(seed)
+
+	def decide(self, player: BotPlayer, actions: tuple) -> str:
+		player_list = player.getPlayerList()
+		active = [other for other in player_list if not other.bankrupt]
+		state = GameState.capture(player_list, active, player_list.index(player))
+		state.rng_state = None # every rollout is reseeded
+
+		seat = player_list.index(player)
+		ruleset = main.game.ruleset
+		if self.workers == 0:
+			results = [search((state, seat, actions, self.time_budget, self._seeds.getrandbits(32), self.rollout_turns, ruleset))]
+		else:
+			budget = self.time_budget * WORKER_BUDGET
+			tasks = [(state, seat, actions, budget, self._seeds.getrandbits(32), self.rollout_turns, ruleset) for _ in range(self.workers)]
+			results = getPool(self.workers).map(search, tasks)
+
+		visits = [sum(result[i][0] for result in results) for i in range(len(actions))]
+		rewards = [sum(result[i][1] for result in results) for i in range(len(actions))]
+		return max(zip(actions, visits, rewards), key=lambda choice: choice[2]/choice[1])[0]
+
+	def wantsToBuy(self, player: BotPlayer, place: object) -> bool:
+		return self.decide(player, (BUY, PASS)) == BUY
+
+	def wantsToBuild(self, player: BotPlayer, place: object) -> bool:
+		return self.decide(player, (BUILD, PASS)) == BUILD
+
+class MCTSPlayer(BotPlayer):
+	"""a computer player that uses MCTSPolicy"""
+	def __init__(self, letter: str, time_budget: float = 0.025, workers: int = None):
+		super().__init__(letter, MCTSPolicy(time_budget, workers))
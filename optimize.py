@@ -0,0 +1,209 @@
+"""
+tunes bot strategies with a genetic algorithm. each strategy is a list of numbers (cash reserves, how much to bid at
+auctions and which groups to buy), scored by playing seeded games against fixed opponents in a process pool. scores
+are cached by strategy so survivors aren't played again, and the search is checkpointed after every generation so a
+long run can be stopped and resumed
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+
+from main import ColourTypes, Policy
+from ruleset import DEFAULT_RULESET, loadRuleset
+from simulation import POLICIES, gameSeed, playGame
+
+GROUPS = [colour.name for colour in ColourTypes] + ["station", "utility"]
+GENES = [ # (name, lowest, highest)
+	("buy_reserve", 0, 600), # money kept back when buying or bidding
+	("build_reserve", 0, 600), # money kept back when building or paying off a mortgage
+	("bid_share", 0.0, 2.0), # most to bid at auction as a share of the price
+] + [(f"buy_{group}", 0.0, 1.0) for group in GROUPS] # buys the group's places when over 0.5, and bids more the higher
+DECIMALS = 2 # genes are rounded to this, so the fitness cache sees near identical strategies as the same
+
+class StrategyPolicy(Policy):
+	"""plays by a strategy's genes"""
+	def __init__(self, genes: list):
+		values = dict(zip((name for name, _, _ in GENES), genes))
+		self.buy_reserve = values["buy_reserve"]
+		self.build_reserve = values["build_reserve"]
+		self.bid_share = values["bid_share"]
+		self.preferences = {}
+		for group in GROUPS:
+			key = ColourTypes[group] if group in ColourTypes.__members__ else group
+			self.preferences[key] = values[f"buy_{group}"]
+
+	def wantsToBuy(self, player: object, place: object) -> bool:
+		return self.preferences[place.group] > 0.5 and player.getTotalMoney() - place.cost >= self.buy_reserve
+
+	def wantsToBuild(self, player: object, place: object) -> bool:
+		return player.getTotalMoney() - place.house_cost >= self.build_reserve
+
+	def wantsToUnmortgage(self, player: object, place: object) -> bool:
+		return player.getTotalMoney() - place.unmortgageCost() >= self.build_reserve
+
+	def auctionBid(self, player: object, place: object) -> int:
+		bid = int(place.cost * self.bid_share * self.preferences[place.group])
+		return min(bid, player.getTotalMoney() - int(self.buy_reserve))
+
+	def proposeTrade(self, player: object) -> object:
+		trade = super().proposeTrade(player)
+		if trade != None and player.getTotalMoney() - trade.cash < self.buy_reserve: return None
+		return trade
+
+def randomGenes(rng: random.Random) -> list:
+	return [round(rng.uniform(low, high), DECIMALS) for _, low, high in GENES]
+
+def crossover(first: list, second: list, rng: random.Random) -> list:
+	"""takes each gene from one parent or the other"""
+	return [a if rng.random() < 0.5 else b for a, b in zip(first, second)]
+
+def mutate(genes: list, rate: float, rng: random.Random) -> list:
+	"""moves each gene by a normal step a tenth of its range wide with chance `rate`, staying inside its range"""
+	mutated = []
+	for gene, (_, low, high) in zip(genes, GENES):
+		if rng.random() < rate: gene = min(max(gene + rng.gauss(0, (high - low) / 10), low), high)
+		mutated.append(round(gene, DECIMALS))
+	return mutated
+
+def scoreGame(result: object, letter: str) -> float:
+	"""1 for a win, whether by outlasting everyone or by being the richest at the turn limit, 0 otherwise"""
+	return 1.0 if result.winner == letter else 0.0
+
+def fitness(task: tuple) -> float:
+	"""
+	the mean score of a strategy over seeded games against the opponents, moving it round the seats so no seat gets
+	an advantage. runs inside a worker process
+	"""
+	genes, opponents, games, max_turns, seed, ruleset_name = task
+	ruleset = loadRuleset(ruleset_name or DEFAULT_RULESET)
+	total = 0.0
+	for game in range(games):
+		seat = game % (len(opponents) + 1)
+		policies = [POLICIES[name]() for name in opponents]
+		policies.insert(seat, StrategyPolicy(genes))
+		result = playGame(policies, max_turns, gameSeed(seed, game), ruleset)
+		total += scoreGame(result, chr(ord("a") + seat))
+	return total / games
+
+class Optimizer():
+	"""
+	a genetic search over strategies. every generation keeps the best `elite`, and fills the rest with children of
+	parents picked by tournaments, crossed over and mutated
+	"""
+	def __init__(self, population: int = 24, opponents: list = None, games: int = 40, max_turns: int = 500,
+							 seed: int = 0, elite: int = 2, tournament: int = 3, mutation_rate: float = 0.2, ruleset_name: str = None):
+		self.population_size = population
+		self.opponents = opponents or ["buy-all", "reserve", "buy-all"]
+		self.games = games
+		self.max_turns = max_turns
+		self.seed = seed
+		self.elite = elite
+		self.tournament = tournament
+		self.mutation_rate = mutation_rate
+		self.ruleset_name = ruleset_name
+
+		self.rng = random.Random(seed)
+		self.generation = 0
+		self.population = [randomGenes(self.rng) for _ in range(population)]
+		self.cache = {} # tuple of genes -> fitness, for this optimizer's games
+		self.history = [] # (generation, best fitness, mean fitness) after each generation
+
+	def evaluate(self, pool: object = None) -> list:
+		"""the fitness of each of the population, playing only the strategies that aren't cached"""
+		new = list(dict.fromkeys(tuple(genes) for genes in self.population if tuple(genes) not in self.cache))
+		tasks = [(list(genes), self.opponents, self.games, self.max_turns, self.seed, self.ruleset_name) for genes in new]
+		scores = pool.map(fitness, tasks) if pool != None else [fitness(task) for task in tasks]
+		self.cache.update(zip(new, scores))
+		return [self.cache[tuple(genes)] for genes in self.population]
+
+	def pick(self, scored: list) -> list:
+		return max(self.rng.sample(scored, self.tournament), key=lambda entry: entry[0])[1]
+
+	def step(self, pool: object = None) -> tuple:
+		"""evaluates the population and breeds the next one. returns (best fitness, best genes)"""
+		scores = self.evaluate(pool)
+		scored = sorted(zip(scores, self.population), key=lambda entry: -entry[0])
+		self.history.append((self.generation, scored[0][0], sum(scores)/len(scores)))
+
+		children = [genes for _, genes in scored[:self.elite]]
+		while len(children) < self.population_size:
+			child = crossover(self.pick(scored), self.pick(scored), self.rng)
+			children.append(mutate(child, self.mutation_rate, self.rng))
+		self.population = children
+		self.generation += 1
+		return scored[0]
+
+	def best(self) -> tuple:
+		"""(fitness, genes) of the best strategy played so far"""
+		genes, score = max(self.cache.items(), key=lambda item: item[1])
+		return score, list(genes)
+
+	def save(self, path: str) -> None:
+		"""writes a checkpoint next to `path` and moves it over, so a crash mid write never leaves half a checkpoint"""
+		version, state, gauss = self.rng.getstate()
+		checkpoint = {
+			"settings": {"population": self.population_size, "opponents": self.opponents, "games": self.games,
+									 "max_turns": self.max_turns, "seed": self.seed, "elite": self.elite, "tournament": self.tournament,
+									 "mutation_rate": self.mutation_rate, "ruleset_name": self.ruleset_name},
+			"genes": [name for name, _, _ in GENES],
+			"generation": self.generation,
+			"population": self.population,
+			"cache": [[list(genes), score] for genes, score in self.cache.items()],
+			"history": self.history,
+			"rng": [version, list(state), gauss],
+		}
+		directory = os.path.dirname(os.path.abspath(path))
+		os.makedirs(directory, exist_ok=True)
+		temp_path = f"{path}.{os.getpid()}.tmp"
+		with open(temp_path, "w") as file: json.dump(checkpoint, file)
+		os.replace(temp_path, path)
+
+	@classmethod
+	def load(cls, path: str) -> "Optimizer":
+		with open(path) as file: checkpoint = json.load(file)
+		if checkpoint["genes"] != [name for name, _, _ in GENES]: raise ValueError(f"{path} was saved with different genes")
+		optimizer = cls(**checkpoint["settings"])
+		optimizer.generation = checkpoint["generation"]
+		optimizer.population = checkpoint["population"]
+		optimizer.cache = {tuple(genes): score for genes, score in checkpoint["cache"]}
+		optimizer.history = [tuple(entry) for entry in checkpoint["history"]]
+		version, state, gauss = checkpoint["rng"]
+		optimizer.rng.setstate((version, tuple(state), gauss))
+		return optimizer
+
+def run(argv: list = None) -> None:
+	parser = argparse.ArgumentParser(description="evolve bot strategies by playing them against fixed opponents")
+	parser.add_argument("-g", "--generations", type=int, default=20, help="generations to run, counting any already in the checkpoint")
+	parser.add_argument("-p", "--population", type=int, default=24)
+	parser.add_argument("--opponent", choices=POLICIES, action="append", dest="opponents",
+											help="policy for each opponent seat, repeat for more seats (default buy-all, reserve, buy-all)")
+	parser.add_argument("-n", "--games", type=int, default=40, help="games played to score each strategy")
+	parser.add_argument("--max-turns", type=int, default=500)
+	parser.add_argument("-s", "--seed", type=int, default=0)
+	parser.add_argument("-w", "--workers", type=int, default=0, help="worker processes, 0 for one per core")
+	parser.add_argument("-r", "--ruleset", help="a board from rulesets/ or the path of a ruleset json file (default uk)")
+	parser.add_argument("-c", "--checkpoint", default="optimize-checkpoint.json", help="saved after every generation")
+	parser.add_argument("--resume", action="store_true", help="carry on from the checkpoint, ignoring the other settings")
+	args = parser.parse_args(argv)
+
+	if args.resume and os.path.exists(args.checkpoint):
+		optimizer = Optimizer.load(args.checkpoint)
+		print(f"resumed at generation {optimizer.generation} with {len(optimizer.cache)} strategies scored")
+	else:
+		optimizer = Optimizer(args.population, args.opponents, args.games, args.max_turns, args.seed, ruleset_name=args.ruleset)
+
+	with multiprocessing.Pool(args.workers or None) as pool:
+		while optimizer.generation < args.generations:
+			optimizer.step(pool)
+			_, best, mean = optimizer.history[-1]
+			print(f"generation {optimizer.generation - 1}: best {best:.3f}, mean {mean:.3f}, {len(optimizer.cache)} scored")
+			optimizer.save(args.checkpoint)
+
+	score, genes = optimizer.best()
+	print(f"best strategy, scoring {score:.3f}:")
+	for (name, _, _), gene in zip(GENES, genes): print(f"  {name:<16} {gene}")
+
+if __name__ == "__main__":
+	run()
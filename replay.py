@@ -0,0 +1,294 @@
+"""
+a compact binary log of the dice rolls, deck shuffles and decisions of games, and a replayer that plays a logged game
+back at full speed with no prompts and can jump to any turn.
+
+the log is a stream of one byte events, so it can be appended to while a game runs and read back while it's written:
+	0-35     dice roll, (first die - 1)*6 + (second die - 1)
+	100/101  a decision, no/yes
+	102      the start of a player's turn
+	103      a deck shuffle, followed by the number of cards and their indices in the deck from the top down
+	104      an auction bid, followed by the amount
+	105      a trade offered at the start of a turn, followed by the receiver's seat, the number of places given and
+	         their squares, the number of places taken and their squares, and the cash. a turn that offers no trade
+	         logs a no decision instead
+amounts are a count of digits then that many base 64 digits, most significant first, so like everything after an
+event they're below 64 and any amount a game can reach fits
+	255      the start of a game, followed by a length byte and the players' letters in utf-8
+"""
+import argparse
+import random
+
+import main
+from main import BotPlayer, Policy
+from simulation import TurnOrder, playGame
+from state import GameState
+
+DICE_EVENTS = 36
+MAX_CARDS = 64 # so card indices can't be mistaken for turn or game events
+NO_EVENT = 100
+YES_EVENT = 101
+TURN_EVENT = 102
+SHUFFLE_EVENT = 103
+BID_EVENT = 104
+TRADE_EVENT = 105
+GAME_EVENT = 255
+
+class ReplayError(Exception):
+	"""the game being replayed asked for something the log doesn't have next"""
+
+class GameLog():
+	"""appends games to a log file. main.game_log is set to one of these while a game is being recorded"""
+	def __init__(self, path: str, flush_every: int = 0):
+		self._file = open(path, "ab")
+		self._buffer = bytearray()
+		self.flush_every = flush_every # turns between writes to the file, 0 to only write at the end of a game
+		self._turns = 0
+
+	def startGame(self, letters: list) -> None:
+		self.flush()
+		header = "".join(letters).encode()
+		self._buffer += bytes([GAME_EVENT, len(header)]) + header
+
+	def turn(self) -> None:
+		self._buffer.append(TURN_EVENT)
+		self._turns += 1
+		if self.flush_every and self._turns % self.flush_every == 0: self.flush()
+
+	def dice(self, roll1: int, roll2: int) -> None:
+		self._buffer.append((roll1 - 1)*6 + roll2 - 1)
+
+	def shuffle(self, order: list) -> None:
+		if len(order) > MAX_CARDS: raise ValueError(f"decks of more than {MAX_CARDS} cards can't be logged")
+		self._buffer += bytes([SHUFFLE_EVENT, len(order)] + order)
+
+	def decision(self, yes: bool) -> None:
+		self._buffer.append(YES_EVENT if yes else NO_EVENT)
+
+	def amount(self, amount: int) -> bytes:
+		if amount < 0: raise ValueError(f"negative amounts can't be logged, got {amount}")
+		digits = []
+		while True:
+			amount, digit = divmod(amount, MAX_CARDS)
+			digits.append(digit)
+			if amount == 0: break
+		return bytes([len(digits)] + digits[::-1])
+
+	def bid(self, amount: int) -> None:
+		self._buffer += bytes([BID_EVENT]) + self.amount(amount)
+
+	def trade(self, trade: main.Trade) -> None:
+		if trade == None: return self.decision(False)
+		seat = trade.proposer.getPlayerList().index(trade.receiver)
+		self._buffer += bytes([TRADE_EVENT, seat, len(trade.give)] + [place.position for place in trade.give])
+		self._buffer += bytes([len(trade.take)] + [place.position for place in trade.take]) + self.amount(trade.cash)
+
+	def flush(self) -> None:
+		if self._buffer:
+			self._file.write(self._buffer)
+			self._file.flush()
+			self._buffer.clear()
+
+	def close(self) -> None:
+		self.flush()
+		self._file.close()
+
+class LoggedGame():
+	"""the events of one game in a log, with where each turn starts so turns can be found without replaying"""
+	def __init__(self, letters: list, events: bytes):
+		self.letters = letters
+		self.events = events
+		self.turn_starts = [i for i, event in enumerate(events) if event == TURN_EVENT]
+
+	def turns(self) -> int:
+		return len(self.turn_starts)
+
+def readGames(path: str, chunk_size: int = 1 << 20):
+	"""yields every LoggedGame in a log, reading it a chunk at a time"""
+	letters = None
+	events = bytearray()
+	pending = bytearray()
+	with open(path, "rb") as file:
+		while True:
+			chunk = file.read(chunk_size)
+			pending += chunk
+			i = 0
+			while i < len(pending):
+				if pending[i] == GAME_EVENT:
+					if i + 1 >= len(pending) or i + 2 + pending[i+1] > len(pending): break # header split over chunks
+					if letters != None: yield LoggedGame(letters, bytes(events))
+					header = pending[i+1]
+					letters = list(pending[i+2:i+2+header].decode())
+					events = bytearray()
+					i += 2 + header
+				else:
+					end = pending.find(GAME_EVENT, i)
+					end = len(pending) if end == -1 else end
+					events += pending[i:end]
+					i = end
+			del pending[:i]
+			if not chunk: break
+	if letters != None: yield LoggedGame(letters, bytes(events))
+
+class EventCursor():
+	"""reads a game's events in order"""
+	def __init__(self, events: bytes):
+		self.events = events
+		self.position = 0
+
+	def next(self) -> int:
+		if self.position >= len(self.events): raise ReplayError("the log ended before the game did")
+		event = self.events[self.position]
+		self.position += 1
+		return event
+
+	def amount(self) -> int:
+		amount = 0
+		for _ in range(self.next()): amount = amount*MAX_CARDS + self.next()
+		return amount
+
+class ReplayRandom(random.Random):
+	"""stands in for main.rng, handing out the logged dice rolls and deck shuffles"""
+	def __init__(self, cursor: EventCursor):
+		super().__init__(0)
+		self.cursor = cursor
+		self._second_die = None
+
+	def randint(self, a: int, b: int) -> int:
+		if self._second_die != None:
+			die, self._second_die = self._second_die, None
+			return die
+		event = self.cursor.next()
+		if event >= DICE_EVENTS: raise ReplayError(f"expected a dice roll, got event {event}")
+		first, second = divmod(event, 6)
+		self._second_die = second + 1
+		return first + 1
+
+	def shuffle(self, x: list) -> None:
+		event = self.cursor.next()
+		if event != SHUFFLE_EVENT: raise ReplayError(f"expected a deck shuffle, got event {event}")
+		order = [self.cursor.next() for _ in range(self.cursor.next())]
+		if sorted(order) != sorted(x): raise ReplayError("the logged shuffle doesn't match the deck")
+		x[:] = order
+
+class ReplayPolicy(Policy):
+	"""makes the logged decisions"""
+	def __init__(self, cursor: EventCursor):
+		self.cursor = cursor
+
+	def decision(self) -> bool:
+		event = self.cursor.next()
+		if event not in (NO_EVENT, YES_EVENT): raise ReplayError(f"expected a decision, got event {event}")
+		return event == YES_EVENT
+
+	def wantsToBuy(self, player: BotPlayer, place: object) -> bool:
+		return self.decision()
+
+	def wantsToBuild(self, player: BotPlayer, place: object) -> bool:
+		return self.decision()
+
+	def wantsToUseJailCard(self, player: BotPlayer) -> bool:
+		return self.decision()
+
+	def wantsToUnmortgage(self, player: BotPlayer, place: object) -> bool:
+		return self.decision()
+
+	def acceptsTrade(self, player: BotPlayer, trade: main.Trade) -> bool:
+		return self.decision()
+
+	def auctionBid(self, player: BotPlayer, place: object) -> int:
+		event = self.cursor.next()
+		if event != BID_EVENT: raise ReplayError(f"expected an auction bid, got event {event}")
+		return self.cursor.amount()
+
+	def proposeTrade(self, player: BotPlayer) -> main.Trade:
+		event = self.cursor.next()
+		if event == NO_EVENT: return None
+		if event != TRADE_EVENT: raise ReplayError(f"expected a trade or none, got event {event}")
+		receiver = player.getPlayerList()[self.cursor.next()]
+		give = [main.game.board[self.cursor.next()] for _ in range(self.cursor.next())]
+		take = [main.game.board[self.cursor.next()] for _ in range(self.cursor.next())]
+		return main.Trade(player, receiver, give, take, self.cursor.amount())
+
+class Replayer():
+	"""
+	plays a LoggedGame back with bots. seek() moves to the start of any turn, going back to the nearest state saved
+	on an earlier pass instead of the beginning when it can
+	"""
+	def __init__(self, game: LoggedGame, keyframe_every: int = 100):
+		self.game = game
+		self.keyframe_every = keyframe_every
+		self._keyframes = {} # turn -> (GameState, turn order index, bankrupt turns, event position)
+		self.start()
+
+	def start(self) -> None:
+		self.cursor = EventCursor(self.game.events)
+		self.rng = ReplayRandom(self.cursor)
+		policy = ReplayPolicy(self.cursor)
+		self.player_list = [BotPlayer(letter, policy) for letter in self.game.letters]
+		main.setupBoard(self.player_list)
+		self.order = TurnOrder(self.player_list.copy())
+
+	def playTurn(self) -> None:
+		if self.cursor.next() != TURN_EVENT: raise ReplayError(f"expected turn {self.order.turns} to start")
+		live_rng = main.rng
+		main.rng = self.rng
+		try: self.order.playTurn()
+		finally: main.rng = live_rng
+
+		if self.order.turns % self.keyframe_every == 0 and self.order.turns not in self._keyframes:
+			state = GameState.capture(self.player_list, self.order.active)
+			state.rng_state = None
+			self._keyframes[self.order.turns] = (state, self.order.next, dict(self.order.bankrupt_turns), self.cursor.position)
+
+	def seek(self, turn: int) -> list:
+		"""replays up to the start of `turn` (counted from 0) and returns the players"""
+		turn = min(turn, self.game.turns())
+		keyframe = max((saved for saved in self._keyframes if saved <= turn), default=None)
+		if turn < self.order.turns or (keyframe != None and keyframe > self.order.turns):
+			self.start()
+			if keyframe != None: self.restoreKeyframe(keyframe)
+		while self.order.turns < turn and not self.order.finished(): self.playTurn()
+		return self.player_list
+
+	def restoreKeyframe(self, turn: int) -> None:
+		state, next_index, bankrupt_turns, position = self._keyframes[turn]
+		state.restore(self.player_list)
+		self.order.active = state.activePlayers(self.player_list)
+		self.order.next = next_index
+		self.order.turns = turn
+		self.order.bankrupt_turns = dict(bankrupt_turns)
+		self.cursor.position = position
+
+	def run(self) -> list:
+		"""replays the rest of the game and returns the players"""
+		return self.seek(self.game.turns())
+
+def recordGame(log: GameLog, policies: list, max_turns: int = 1000, seed: int = None):
+	"""plays a simulation.playGame with the game recorded to `log`, and returns its result"""
+	log.startGame([chr(ord("a") + i) for i in range(len(policies))])
+	main.game_log = log
+	try: return playGame(policies, max_turns, seed)
+	finally:
+		main.game_log = None
+		log.flush()
+
+def run(argv: list = None) -> None:
+	parser = argparse.ArgumentParser(description="replay a logged game")
+	parser.add_argument("log")
+	parser.add_argument("-g", "--game", type=int, default=0, help="which game in the log, counted from 0")
+	parser.add_argument("-t", "--turn", type=int, default=None, help="stop at the start of this turn")
+	args = parser.parse_args(argv)
+
+	for i, game in enumerate(readGames(args.log)):
+		if i == args.game: break
+	else: parser.error(f"the log has no game {args.game}")
+
+	replayer = Replayer(game)
+	player_list = replayer.seek(args.turn if args.turn != None else game.turns())
+	print(f"game {args.game}: turn {replayer.order.turns} of {game.turns()}")
+	for player in player_list:
+		status = "bankrupt" if player.bankrupt else f"£{player.getTotalMoney()} on square {player.position}"
+		print(f"  '{player.letter}' {status}")
+
+if __name__ == "__main__":
+	run()
@@ -0,0 +1,197 @@
+"""
+boards and house rules loaded from json files in rulesets/. a file is checked and compiled once into a flat table of
+plain values that's cached in .cache, so later loads skip the parsing and checking and only unmarshal the table
+"""
+import hashlib
+import json
+import marshal
+import os
+
+import main
+from main import ColourTypes
+
+RULESET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rulesets")
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+DEFAULT_RULESET = "uk"
+TABLE_VERSION = 3 # bump when compile() or validate() change, so old cached tables are ignored
+SQUARES = 40
+FIXED_SQUARES = {0: "go", 10: "jail"} # the display and jail rules expect these here
+
+SQUARE_TYPES = ("property", "station", "utility", "go", "jail", "free_parking", "go_to_jail", "tax", "community_chest", "chance")
+CARD_TYPES = ("go", "collect", "pay", "jail", "jail_free", "collect_from_players", "advance")
+DECKS = ("community_chest", "chance")
+DEFAULT_COSTS = {"station": 200, "utility": 150}
+DEFAULT_RENTS = {"station": (25, 50, 100, 200), "utility": (4, 10)} # by how many of them the owner has
+DEFAULT_CURRENCY = "£"
+
+_loaded = {} # path -> Ruleset, so a process only reads each ruleset once
+
+class RulesetError(ValueError):
+	"""a ruleset file that can't be played"""
+
+class Ruleset():
+	"""
+	a compiled ruleset. squares are (type, name, group, cost, house cost, rents, amount) and cards are
+	(type, text, amount, position, collect go) tuples
+	"""
+	def __init__(self, table: tuple, key: str = None):
+		if table[0] != TABLE_VERSION: raise RulesetError(f"compiled table is version {table[0]}, not {TABLE_VERSION}")
+		_, self.name, self.starting_money, self.go_salary, self.currency, self.squares, self.decks = table
+		self.key = key # a hash of the file it was loaded from, the same in every process
+
+	def buildBoard(self, player_list: list) -> list:
+		"""makes a fresh set of places for a game from the tables"""
+		decks = {name: main.Deck([self.buildCard(card, player_list) for card in cards]) for name, cards in self.decks.items()}
+		return [self.buildSquare(position, square, decks) for position, square in enumerate(self.squares)]
+
+	def buildSquare(self, position: int, square: tuple, decks: dict) -> main.Place:
+		kind, name, group, cost, house_cost, rents, amount = square
+		if kind == "property": return main.Property(name, position, ColourTypes[group], cost, house_cost, rents[0], rents if len(rents) > 1 else None)
+		if kind == "station": return main.Station(name, position, cost, rents)
+		if kind == "utility": return main.Utility(name, position, cost, rents)
+		if kind == "go": return main.Go(self.go_salary)
+		if kind == "jail": return main.Jail(position)
+		if kind == "free_parking": return main.FreeParking(position)
+		if kind == "go_to_jail": return main.GoToJail(position)
+		if kind == "tax": return main.TaxPlace(name, position, amount)
+		if kind == "community_chest": return main.CommunityChestManager(position, decks[kind])
+		return main.ChanceCardManager(position, decks[kind])
+
+	def buildCard(self, card: tuple, player_list: list) -> main.Card:
+		kind, text, amount, position, collect_go = card
+		currency = self.currency
+		if kind == "go": return main.goCard(self.go_salary, currency)
+		if kind == "collect": return main.collectCard(text, amount, currency)
+		if kind == "pay": return main.payCard(text, amount, currency)
+		if kind == "jail": return main.jailCard(self.go_salary, currency)
+		if kind == "jail_free": return main.jailFreeCard()
+		if kind == "collect_from_players": return main.collectPlayersCard(player_list, text, amount, currency)
+		return main.AdvanceCard(position, self.squares[position][1], collect_go, self.go_salary, currency)
+
+def rulesetPath(name: str) -> str:
+	"""a ruleset's file from its name in rulesets/, or a path to any json file"""
+	if os.path.exists(name): return name
+	return os.path.join(RULESET_DIR, f"{name}.json")
+
+def loadRuleset(name: str = DEFAULT_RULESET, cache_dir: str = CACHE_DIR) -> Ruleset:
+	path = rulesetPath(name)
+	if path in _loaded: return _loaded[path]
+	try:
+		with open(path, "rb") as file: source = file.read()
+	except OSError as error: raise RulesetError(f"can't read ruleset {name!r}: {error}")
+
+	key = hashlib.sha1(source + bytes([TABLE_VERSION])).hexdigest()[:16]
+	cache_path = os.path.join(cache_dir, f"ruleset-{key}.bin") if cache_dir else None
+	table = None
+	if cache_path and os.path.exists(cache_path):
+		with open(cache_path, "rb") as file:
+			try: table = marshal.loads(file.read())
+			except (EOFError, ValueError, TypeError): table = None # a damaged cache is rebuilt
+
+	if table == None:
+		table = compileRuleset(parseRuleset(source, path))
+		if cache_path:
+			os.makedirs(cache_dir, exist_ok=True)
+			temp_path = f"{cache_path}.{os.getpid()}.tmp"
+			with open(temp_path, "wb") as file: marshal.dump(table, file)
+			os.replace(temp_path, cache_path)
+
+	_loaded[path] = Ruleset(table, key)
+	return _loaded[path]
+
+def parseRuleset(source: bytes, path: str) -> dict:
+	try: data = json.loads(source)
+	except ValueError as error: raise RulesetError(f"{path} isn't valid json: {error}")
+	validate(data)
+	return data
+
+def expect(condition: bool, message: str) -> None:
+	if not condition: raise RulesetError(message)
+
+def isAmount(value: object) -> bool:
+	return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+def validate(data: dict) -> None:
+	"""raises RulesetError for the first thing wrong with a parsed ruleset"""
+	expect(isinstance(data, dict), "a ruleset is a json object")
+	for key in ("starting_money", "go_salary"):
+		expect(isAmount(data.get(key)), f"{key} must be a whole amount of money")
+	currency = data.get("currency", DEFAULT_CURRENCY)
+	expect(isinstance(currency, str) and currency, "currency must be the symbol cards put before amounts")
+
+	squares = data.get("squares")
+	expect(isinstance(squares, list) and len(squares) == SQUARES, f"squares must list all {SQUARES} squares in order")
+	for position, square in enumerate(squares):
+		where = f"square {position}"
+		expect(isinstance(square, dict) and square.get("type") in SQUARE_TYPES, f"{where} needs a type from {SQUARE_TYPES}")
+		kind = square["type"]
+		if position in FIXED_SQUARES: expect(kind == FIXED_SQUARES[position], f"{where} must be {FIXED_SQUARES[position]}")
+		elif kind in FIXED_SQUARES.values(): expect(False, f"{where} can't be {kind}, it has a fixed square")
+
+		if kind in ("property", "station", "utility", "tax"):
+			expect(isinstance(square.get("name"), str) and square["name"], f"{where} needs a name")
+		if kind == "property":
+			expect(square.get("group") in ColourTypes.__members__, f"{where} needs a group from {list(ColourTypes.__members__)}")
+			for key in ("cost", "house_cost"): expect(isAmount(square.get(key)), f"{where} needs a {key}")
+			rents = square.get("rents")
+			expect(isAmount(square.get("rent")) != (rents != None), f"{where} needs one of rent or rents")
+			if rents != None:
+				expect(isinstance(rents, list) and len(rents) == 7 and all(map(isAmount, rents)),
+							 f"{where} rents are: no houses, the whole group, 1-4 houses, a hotel")
+		if kind in ("station", "utility"):
+			if "cost" in square: expect(isAmount(square["cost"]), f"{where} cost must be a whole number")
+			rents = square.get("rents")
+			if rents != None: expect(isinstance(rents, list) and rents and all(map(isAmount, rents)), f"{where} rents must be whole numbers")
+		if kind == "tax": expect(isAmount(square.get("amount")), f"{where} needs an amount")
+
+	counts = {}
+	for square in squares:
+		if square["type"] in DEFAULT_RENTS: counts[square["type"]] = counts.get(square["type"], 0) + 1
+	for position, square in enumerate(squares):
+		kind = square["type"]
+		if kind in counts:
+			rents = square.get("rents") or DEFAULT_RENTS[kind]
+			expect(len(rents) >= counts[kind], f"square {position} needs a rent for each of the {counts[kind]} {kind} squares")
+
+	decks = data.get("decks")
+	expect(isinstance(decks, dict), "decks must be an object")
+	for deck in DECKS:
+		used = any(square["type"] == deck for square in squares)
+		cards = decks.get(deck)
+		if not used and cards == None: continue
+		expect(isinstance(cards, list) and 0 < len(cards) <= 64, f"the {deck} deck needs 1-64 cards")
+		for index, card in enumerate(cards):
+			where = f"{deck} card {index}"
+			expect(isinstance(card, dict) and card.get("type") in CARD_TYPES, f"{where} needs a type from {CARD_TYPES}")
+			if card["type"] in ("collect", "pay", "collect_from_players"):
+				expect(isinstance(card.get("text"), str), f"{where} needs text")
+				expect(isAmount(card.get("amount")), f"{where} needs an amount")
+			if card["type"] == "advance":
+				position = card.get("position")
+				expect(isinstance(position, int) and 0 <= position < SQUARES, f"{where} needs a position on the board")
+				expect(squares[position].get("name") != None, f"{where} must advance to a named square")
+		# held cards stay out of the pile, so a deck of nothing else could be left with nothing to draw
+		expect(any(card["type"] != "jail_free" for card in cards), f"the {deck} deck needs a card that isn't get out of jail free")
+
+def compileRuleset(data: dict) -> tuple:
+	"""flattens a validated ruleset into the tuples Ruleset reads"""
+	squares = []
+	for square in data["squares"]:
+		kind = square["type"]
+		rents = square.get("rents")
+		if kind == "property" and rents == None: rents = [square["rent"]]
+		elif kind in DEFAULT_RENTS and rents == None: rents = DEFAULT_RENTS[kind]
+		cost = square.get("cost", DEFAULT_COSTS.get(kind, 0))
+		squares.append((kind, square.get("name"), square.get("group"), cost, square.get("house_cost", 0),
+										tuple(rents) if rents != None else None, square.get("amount", 0)))
+
+	decks = {}
+	for deck in DECKS:
+		cards = data["decks"].get(deck) or []
+		decks[deck] = tuple((card["type"], card.get("text"), card.get("amount", 0), card.get("position"), bool(card.get("collect_go")))
+												for card in cards)
+	return (TABLE_VERSION, data.get("name", ""), data["starting_money"], data["go_salary"], data.get("currency", DEFAULT_CURRENCY),
+					tuple(squares), decks)
+
+def rulesetNames() -> list:
+	return sorted(name[:-5] for name in os.listdir(RULESET_DIR) if name.endswith(".json"))
@@ -0,0 +1,271 @@
+"""
+hosts many games at once in one process. every table is an asyncio task, so a table waiting on a player's decision
+costs nothing and never holds up the others.
+
+clients connect over a local socket and send and receive one json object per line:
+	-> {"type": "join", "table": "name", "letter": "a", "seats": 2, "bots": 1}   seats and bots only count for the first join
+	-> {"type": "watch", "table": "name"}   spectate a table that's been joined, instead of playing
+	<- {"type": "watching", "table": "name"}
+	<- {"type": "frame", "number": 3, "key": false, "data": "..."}   terminal output drawing the board, see broadcast.py
+	<- {"type": "joined", "table": "name", "seat": 0, "waiting": 0}
+	<- {"type": "start", "players": ["a", "b"]}
+	<- {"type": "decide", "kind": "buy" or "build", "place": "Mayfair", "cost": 400, "money": 1100}
+	-> {"type": "decide", "yes": true}
+	<- {"type": "turn", "player": "a", "turns": 1, "money": {"a": 1500, ...}, "positions": {"a": 7, ...}}
+	<- {"type": "game_over", "winner": "a", "turns": 250} (the richest player wins at the turn limit)
+	<- {"type": "error", "message": "..."}
+"""
+import argparse
+import asyncio
+import json
+import random
+
+import main
+from broadcast import Broadcaster
+from main import BotPlayer, Policy
+from simulation import POLICIES, TurnOrder
+
+BUY = "buy"
+BUILD = "build"
+MAX_WRITE_BUFFER = 1 << 20 # bytes a client can fall behind by before it's dropped
+
+class Connection():
+	"""one client's socket, and the decisions it has sent that haven't been used yet"""
+	def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+		self.reader = reader
+		self.writer = writer
+		self.decisions = asyncio.Queue()
+		self.closed = False
+
+	def send(self, message: dict) -> None:
+		"""writes without waiting for the client to read it, so a slow client can't stall its table"""
+		if self.closed: return
+		self.writer.write(json.dumps(message).encode() + b"\n")
+		if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER: self.close()
+
+	async def ask(self, message: dict, timeout: float) -> bool:
+		"""sends a question and waits for the answer. no answer in time, or a closed connection, counts as no"""
+		if self.closed: return False
+		while not self.decisions.empty(): self.decisions.get_nowait() # answers sent before the question was asked
+		self.send(message)
+		try: answer = await asyncio.wait_for(self.decisions.get(), timeout)
+		except asyncio.TimeoutError: return False
+		return bool(answer)
+
+	def close(self) -> None:
+		if self.closed: return
+		self.closed = True
+		self.decisions.put_nowait(None)
+		self.writer.close()
+
+class RemotePlayer(BotPlayer):
+	"""a seat played by a client. buys and builds are left pending for the table to ask the client about"""
+	def __init__(self, letter: str, connection: Connection):
+		super().__init__(letter, Policy())
+		self.connection = connection
+		self.pending = None # (BUY or BUILD, place) waiting on the client
+
+	def buyPlace(self, prompt_name: str) -> None:
+		self.pending = (BUY, main.game.board[self.position])
+
+	def ownedAction(self, place: object) -> None:
+		if place.canBuild(): self.pending = (BUILD, place)
+
+	def auctionBid(self, place: object) -> int:
+		return 0 # clients aren't asked about auctions or trades, so they stay out of them
+
+	def acceptsTrade(self, trade: main.Trade) -> bool:
+		return False
+
+	def manageAssets(self) -> None:
+		pass
+
+class Table():
+	"""
+	one game. main.game and main.rng are shared by every table in the process, so the table puts its own back with
+	activate() before running any game code, which is safe because tables only swap at an await
+	"""
+	def __init__(self, name: str, seats: int, bots: int = 0, bot_policy: str = "buy-all",
+							 max_turns: int = 1000, decision_timeout: float = 30.0, seed: int = None):
+		self.name = name
+		self.seats = seats
+		self.max_turns = max_turns
+		self.decision_timeout = decision_timeout
+		self.rng = random.Random(seed)
+		self.game = main.Game()
+		self.broadcaster = Broadcaster()
+		self.players = [BotPlayer(str(i + 1), POLICIES[bot_policy]()) for i in range(bots)]
+
+	def full(self) -> bool:
+		return len(self.players) >= self.seats
+
+	def join(self, letter: str, connection: Connection) -> RemotePlayer:
+		player = RemotePlayer(letter, connection)
+		self.players.append(player)
+		return player
+
+	def connections(self) -> list:
+		return [player.connection for player in self.players if isinstance(player, RemotePlayer)]
+
+	def broadcast(self, message: dict) -> None:
+		for connection in self.connections(): connection.send(message)
+
+	def activate(self) -> None:
+		main.game = self.game
+		main.rng = self.rng
+
+	async def play(self) -> None:
+		self.activate()
+		self.broadcaster.displayer.setPositionIndex(main.setupBoard(self.players))
+		order = TurnOrder(self.players.copy(), max_turns=self.max_turns)
+		self.broadcast({"type": "start", "players": [player.letter for player in self.players]})
+
+		while not order.finished():
+			player = order.current()
+			self.activate()
+			if player.startTurn():
+				while True:
+					self.activate()
+					again = player.rollTurn()
+					self.broadcaster.publish()
+					await self.resolve(player)
+					if not again: break
+			self.activate()
+			order.endTurn(player)
+			self.broadcaster.publish()
+			self.broadcast({
+				"type": "turn", "player": player.letter, "turns": order.turns,
+				"money": {other.letter: other.getTotalMoney() for other in self.players},
+				"positions": {other.letter: other.position for other in self.players},
+			})
+			await asyncio.sleep(0) # lets the other tables play between turns, even at tables of only bots
+
+		self.broadcast({"type": "game_over", "winner": order.winner().letter, "turns": order.turns})
+
+	async def resolve(self, player: BotPlayer) -> None:
+		"""asks a remote player about the buy or build their last roll left pending, and carries it out"""
+		if not isinstance(player, RemotePlayer) or player.pending == None: return
+		kind, place = player.pending
+		player.pending = None
+		cost = place.cost if kind == BUY else place.house_cost
+		question = {"type": "decide", "kind": kind, "place": place.name, "cost": cost, "money": player.getTotalMoney()}
+		yes = await player.connection.ask(question, self.decision_timeout)
+
+		self.activate()
+		if kind == BUY and place.owner == None:
+			if yes and player.getTotalMoney() >= place.cost: player.purchase(place)
+			else: main.auction(place, player)
+		elif kind == BUILD and yes and place.canBuild(): place.build()
+
+def wholeNumber(message: dict, key: str, default: int) -> int:
+	"""a field of a client's message that has to be an int. anything else is the client's mistake, so it's a ValueError"""
+	value = message.get(key, default)
+	if isinstance(value, bool) or not isinstance(value, int): raise ValueError(f"{key} has to be a whole number")
+	return value
+
+class GameServer():
+	"""accepts clients, seats them at tables by name and starts each table once it's full"""
+	def __init__(self, max_turns: int = 1000, decision_timeout: float = 30.0):
+		self.max_turns = max_turns
+		self.decision_timeout = decision_timeout
+		self.tables = {} # name -> Table that hasn't finished
+		self._games = set()
+		self._spectators = set()
+
+	def join(self, message: dict, connection: Connection) -> None:
+		name = str(message.get("table", ""))
+		table = self.tables.get(name)
+		if table == None:
+			seats = wholeNumber(message, "seats", 2)
+			bots = wholeNumber(message, "bots", 0)
+			if not 2 <= seats <= 8 or not 0 <= bots < seats: raise ValueError("a table needs 2-8 seats and a free seat")
+			table = Table(name, seats, bots, max_turns=self.max_turns, decision_timeout=self.decision_timeout)
+			self.tables[name] = table
+		if table.full(): raise ValueError(f"table {name!r} is full")
+
+		letter = str(message.get("letter", ""))[:1]
+		if not letter or letter in (player.letter for player in table.players): raise ValueError("pick a letter nobody at the table has")
+		table.join(letter, connection)
+		connection.send({"type": "joined", "table": name, "seat": len(table.players) - 1, "waiting": table.seats - len(table.players)})
+		if table.full(): self.start(table)
+
+	def start(self, table: Table) -> None:
+		game = asyncio.get_running_loop().create_task(table.play())
+		self._games.add(game)
+		game.add_done_callback(lambda _: self.finish(table, game))
+
+	def finish(self, table: Table, game: asyncio.Task) -> None:
+		self._games.discard(game)
+		if self.tables.get(table.name) is table: del self.tables[table.name]
+		for connection in table.connections(): connection.close()
+		table.broadcaster.close()
+
+	def watch(self, message: dict, connection: Connection) -> None:
+		name = str(message.get("table", ""))
+		table = self.tables.get(name)
+		if table == None: raise ValueError(f"there's no table {name!r} to watch")
+		viewer = table.broadcaster.subscribe()
+		connection.send({"type": "watching", "table": name})
+		spectator = asyncio.get_running_loop().create_task(self.spectate(table, viewer, connection))
+		self._spectators.add(spectator)
+		spectator.add_done_callback(self._spectators.discard)
+
+	async def spectate(self, table: Table, viewer: object, connection: Connection) -> None:
+		"""sends a viewer's frames, waiting for each to be written so a slow client backs up into its bounded queue"""
+		try:
+			while not connection.closed:
+				line = await viewer.get()
+				if line == None: break
+				connection.writer.write(line)
+				await connection.writer.drain()
+		except ConnectionError: pass
+		finally:
+			table.broadcaster.unsubscribe(viewer)
+			connection.close()
+
+	async def handleClient(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		connection = Connection(reader, writer)
+		joined = False # as a player or a spectator
+		try:
+			while not connection.closed:
+				line = await reader.readline()
+				if not line: break
+				try: message = json.loads(line)
+				except ValueError:
+					connection.send({"type": "error", "message": "messages are one json object per line"})
+					continue
+				if not isinstance(message, dict): message = {}
+
+				kind = message.get("type")
+				if kind == "join" and not joined:
+					try: self.join(message, connection)
+					except ValueError as error: connection.send({"type": "error", "message": str(error)})
+					else: joined = True
+				elif kind == "watch" and not joined:
+					try: self.watch(message, connection)
+					except ValueError as error: connection.send({"type": "error", "message": str(error)})
+					else: joined = True
+				elif kind == "decide": connection.decisions.put_nowait(bool(message.get("yes")))
+				else: connection.send({"type": "error", "message": f"unexpected message {kind!r}"})
+		except (ConnectionError, asyncio.LimitOverrunError, ValueError): pass # reset or a line too long to read
+		finally: connection.close()
+
+	async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+		server = await asyncio.start_server(self.handleClient, host, port)
+		async with server: await server.serve_forever()
+
+def run(argv: list = None) -> None:
+	parser = argparse.ArgumentParser(description="host monopoly tables for clients on a local socket")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=8765)
+	parser.add_argument("--max-turns", type=int, default=1000)
+	parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for a decision before it counts as no")
+	args = parser.parse_args(argv)
+
+	main.enableColour() # for spectators' frames
+	print(f"serving on {args.host}:{args.port}")
+	try: asyncio.run(GameServer(args.max_turns, args.timeout).serve(args.host, args.port))
+	except KeyboardInterrupt: pass
+
+if __name__ == "__main__":
+	run()
@@ -0,0 +1,215 @@
+"""plays whole games with bot players and no prompts, printing or sleeping, for testing house rules"""
+import argparse
+import multiprocessing
+import random
+import time
+
+import main
+from main import Player, BotPlayer, Policy, ReservePolicy, NeverBuyPolicy
+from ruleset import DEFAULT_RULESET, loadRuleset
+
+MAX_TURNS = 1000 # turns a game lasts at most. whoever has the highest Player.netWorth then wins
+
+POLICIES = {
+	"buy-all": Policy,
+	"reserve": lambda: ReservePolicy(200),
+	"never-buy": NeverBuyPolicy,
+}
+
+class GameResult():
+	def __init__(self, winner: str, turns: int, balances: dict, bankrupt_turns: dict, landings: list, timed_out: bool = False):
+		self.winner = winner # the last player left, or the richest if the game hit the turn limit
+		self.timed_out = timed_out # whether the game hit the turn limit
+		self.turns = turns
+		self.balances = balances
+		self.bankrupt_turns = bankrupt_turns
+		self.landings = landings
+
+class Stats():
+	"""totals over many games. stats from different workers are combined with merge"""
+	def __init__(self):
+		self.games = 0
+		self.turns = 0
+		self.wins = {} # seat letter -> games won
+		self.timed_out = 0 # games won on net worth at the turn limit
+		self.landings = [0]*40
+		self.bankruptcies = 0
+		self.bankrupt_turn_total = 0
+
+	def add(self, result: GameResult) -> None:
+		self.games += 1
+		self.turns += result.turns
+		self.wins[result.winner] = self.wins.get(result.winner, 0) + 1
+		self.timed_out += result.timed_out
+		for i, count in enumerate(result.landings): self.landings[i] += count
+		self.bankruptcies += len(result.bankrupt_turns)
+		self.bankrupt_turn_total += sum(result.bankrupt_turns.values())
+
+	def merge(self, other: "Stats") -> None:
+		self.games += other.games
+		self.turns += other.turns
+		for letter, count in other.wins.items(): self.wins[letter] = self.wins.get(letter, 0) + count
+		self.timed_out += other.timed_out
+		for i, count in enumerate(other.landings): self.landings[i] += count
+		self.bankruptcies += other.bankruptcies
+		self.bankrupt_turn_total += other.bankrupt_turn_total
+
+	def winRates(self) -> dict:
+		return {letter: count/self.games for letter, count in self.wins.items()}
+
+	def landingFrequencies(self) -> list:
+		total = sum(self.landings)
+		return [count/total if total else 0 for count in self.landings]
+
+	def meanBankruptTurn(self) -> float:
+		return self.bankrupt_turn_total/self.bankruptcies if self.bankruptcies else None
+
+def gameSeed(seed: int, game_index: int) -> int:
+	"""the seed for one game of a run. it only depends on the run's seed and the game number, not on the worker"""
+	return random.Random(f"{seed}:{game_index}").getrandbits(64)
+
+class TurnOrder():
+	"""
+	plays turns around the players still in the game. anyone left in debt at the end of a turn is eliminated, not
+	just the player whose turn it was, since cards and rent can take money from the others. the game ends when one
+	player is left or after max_turns turns, if it's given
+	"""
+	def __init__(self, active: list, first: int = 0, max_turns: int = None):
+		self.active = active
+		self.next = first # index in active of whose turn is next
+		self.max_turns = max_turns
+		self.turns = 0
+		self.bankrupt_turns = {} # letter -> turn they went bankrupt on
+
+	def finished(self) -> bool:
+		return len(self.active) <= 1 or (self.max_turns != None and self.turns >= self.max_turns)
+
+	def winner(self) -> Player:
+		"""the last player left, or the one with the highest net worth of those left when the turns ran out"""
+		return max(self.active, key=lambda player: player.netWorth(), default=None)
+
+	def current(self) -> Player:
+		return self.active[self.next]
+
+	def playTurn(self) -> None:
+		player = self.current()
+		player.turn()
+		self.endTurn(player)
+
+	def endTurn(self, player: Player) -> None:
+		"""counts the turn `player` just played and moves on to the next player"""
+		self.turns += 1
+		self.next += 1
+		for other in self.active:
+			if other.getTotalMoney() < 0: break
+		else: # nobody's in debt, which is nearly every turn
+			if self.next >= len(self.active): self.next = 0
+			return
+
+		broke = [other for other in self.active if other.getTotalMoney() < 0]
+		upcoming = [other for other in self.active[self.next:] + self.active[:self.next] if other not in broke]
+		for other in broke:
+			other.goBankrupt()
+			self.bankrupt_turns[other.letter] = self.turns
+		self.active[:] = [other for other in self.active if other not in broke] # in place, callers hold this list
+		self.next = self.active.index(upcoming[0]) if upcoming else 0
+
+def playTurns(active: list, max_turns: int, first: int = 0) -> tuple:
+	"""
+	plays turns around `active`, starting with active[first], until one player is left or max_turns turns have been
+	played. bankrupt players are eliminated and removed from active. returns (turns played, {letter: bankrupt turn})
+	"""
+	order = TurnOrder(active, first, max_turns)
+	while not order.finished(): order.playTurn()
+	return order.turns, order.bankrupt_turns
+
+def playGame(policies: list, max_turns: int = 1000, seed: int = None, ruleset: object = None) -> GameResult:
+	"""
+	plays one game with a bot for each policy until one player is left or max_turns turns have been played, when the
+	richest player wins
+	"""
+	if seed != None: main.rng.seed(seed)
+	player_list = [BotPlayer(chr(ord("a") + i), policy) for i, policy in enumerate(policies)]
+	main.setupBoard(player_list, ruleset)
+
+	active = player_list.copy()
+	turns, bankrupt_turns = playTurns(active, max_turns)
+	return gameResult(player_list, active, turns, bankrupt_turns)
+
+def gameResult(player_list: list, active: list, turns: int, bankrupt_turns: dict) -> GameResult:
+	"""the result of a game between bots that's finished or hit its turn limit, when the richest player left wins"""
+	winner = max(active, key=lambda player: player.netWorth()).letter if active else None
+	balances = {player.letter: player.getTotalMoney() for player in player_list}
+	landings = [sum(counts) for counts in zip(*(player.landings for player in player_list))]
+	return GameResult(winner, turns, balances, bankrupt_turns, landings, len(active) > 1)
+
+def playGames(games: int, policies: list, max_turns: int = 1000) -> list:
+	return [playGame(policies, max_turns) for _ in range(games)]
+
+def playChunk(task: tuple) -> Stats:
+	"""plays games [start, start+count) of a seeded run. runs inside a worker process"""
+	start, count, policy_names, max_turns, seed, ruleset_name = task
+	policies = [POLICIES[name]() for name in policy_names]
+	ruleset = loadRuleset(ruleset_name or DEFAULT_RULESET) # compiled tables are cached, so this is cheap in every worker
+	stats = Stats()
+	for game_index in range(start, start + count):
+		stats.add(playGame(policies, max_turns, gameSeed(seed, game_index), ruleset))
+	return stats
+
+def runParallel(games: int, policy_names: list, max_turns: int = 1000, seed: int = 0,
+								workers: int = None, chunk_size: int = 250, ruleset_name: str = None) -> Stats:
+	"""plays games spread over a process pool. the same seed always gives the same stats, whatever the worker count"""
+	tasks = [(start, min(chunk_size, games - start), policy_names, max_turns, seed, ruleset_name) for start in range(0, games, chunk_size)]
+	stats = Stats()
+	if workers == 1:
+		for task in tasks: stats.merge(playChunk(task))
+		return stats
+
+	with multiprocessing.Pool(workers) as pool:
+		for chunk_stats in pool.imap_unordered(playChunk, tasks): stats.merge(chunk_stats)
+	return stats
+
+def printSummary(stats: Stats, seconds: float) -> None:
+	print(f"games:         {stats.games}")
+	print(f"turns:         {stats.turns}")
+	print(f"time:          {seconds:.2f}s")
+	print(f"games/second:  {stats.games/seconds:.1f}")
+	print(f"turns/second:  {stats.turns/seconds:.0f}")
+
+	bankrupt_turn = stats.meanBankruptTurn()
+	if bankrupt_turn != None: print(f"mean bankruptcy turn: {bankrupt_turn:.1f}")
+
+	print(f"won at the turn limit: {stats.timed_out/stats.games:.1%}")
+	print("win rates:")
+	for letter, rate in sorted(stats.winRates().items(), key=lambda item: str(item[0])):
+		name = f"'{letter}'" if letter != None else "nobody"
+		print(f"  {name:<11} {rate:.1%}")
+
+	print("most landed on:")
+	frequencies = stats.landingFrequencies()
+	for position in sorted(range(40), key=lambda i: -frequencies[i])[:5]:
+		print(f"  {position:<11} {frequencies[position]:.2%}")
+
+def parseArgs(argv: list = None) -> argparse.Namespace:
+	parser = argparse.ArgumentParser(description="play monopoly games between bots with no prompts")
+	parser.add_argument("-n", "--games", type=int, default=1000)
+	parser.add_argument("-p", "--players", type=int, default=4)
+	parser.add_argument("--policy", choices=POLICIES, action="append", dest="policies",
+											help="policy for each seat, repeat to give seats different policies")
+	parser.add_argument("--max-turns", type=int, default=1000)
+	parser.add_argument("-s", "--seed", type=int, default=0)
+	parser.add_argument("-w", "--workers", type=int, default=0, help="worker processes, 0 for one per core")
+	parser.add_argument("-r", "--ruleset", help="a board from rulesets/ or the path of a ruleset json file (default uk)")
+	return parser.parse_args(argv)
+
+def run(argv: list = None) -> None:
+	args = parseArgs(argv)
+	names = args.policies or ["buy-all"]
+	policy_names = [names[i % len(names)] for i in range(args.players)]
+
+	start = time.perf_counter()
+	stats = runParallel(args.games, policy_names, args.max_turns, args.seed, args.workers or None, ruleset_name=args.ruleset)
+	printSummary(stats, time.perf_counter() - start)
+
+if __name__ == "__main__":
+	run()
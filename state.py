@@ -0,0 +1,172 @@
+"""a compact copy of a whole game in flat arrays, cheap to clone, snapshot and restore"""
+from array import array
+import marshal
+
+import main
+
+NO_OWNER = -1
+
+class GameState():
+	"""
+	the game as one array entry per seat and per square, with owners and creditors stored as seat numbers. rent
+	isn't stored because the places work it out from their owner and houses. capture() reads it from the live
+	objects and restore() writes all of it back onto them
+	"""
+	__slots__ = ("positions", "balances", "in_jail", "jail_turns", "active", "creditors", "owners", "houses", "hotels",
+							 "mortgaged", "decks", "jail_cards", "current", "rng_state")
+
+	def __init__(self, players: int, squares: int = 40):
+		self.positions = array("b", bytes(players))
+		self.balances = array("q", [0]*players)
+		self.in_jail = array("b", bytes(players))
+		self.jail_turns = array("b", bytes(players))
+		self.active = array("b", [1]*players)
+		self.creditors = array("b", [NO_OWNER]*players) # seat of whoever each player owes, NO_OWNER for the bank
+		self.owners = array("b", [NO_OWNER]*squares)
+		self.houses = array("b", bytes(squares))
+		self.hotels = array("b", bytes(squares))
+		self.mortgaged = array("b", bytes(squares))
+		self.decks = () # Deck.getState() of each of main.boardDecks()
+		self.jail_cards = () # for each seat, the (deck, card index) of the jail free cards it holds, oldest first
+		self.current = 0 # seat whose turn is next
+		self.rng_state = None # main.rng.getstate(), which covers how the decks will be shuffled next
+
+	@classmethod
+	def capture(cls, player_list: list, active: list = None, current: int = 0, rng: bool = True) -> "GameState":
+		"""
+		reads the state of main.game.board, the players and main.rng. `active` is the players still in the game, or
+		the ones that aren't bankrupt if it's not given. the rng state is most of the size of a state, so callers that
+		won't restore it can leave it out with `rng`
+		"""
+		state = cls(len(player_list), len(main.game.board))
+		seats = {player: seat for seat, player in enumerate(player_list)}
+		for seat, player in enumerate(player_list):
+			state.positions[seat] = player.position
+			state.balances[seat] = player.getTotalMoney()
+			state.in_jail[seat] = player.in_jail
+			state.jail_turns[seat] = player.jail_turns
+			state.active[seat] = player in active if active != None else not player.bankrupt
+			state.creditors[seat] = seats.get(player.creditor, NO_OWNER)
+
+		for position, place in enumerate(main.game.board):
+			owner = getattr(place, "owner", None)
+			if owner != None:
+				state.owners[position] = seats[owner]
+				state.mortgaged[position] = place.mortgaged
+			if isinstance(place, main.Property):
+				state.houses[position] = place._houses
+				state.hotels[position] = place._hotels
+		decks = main.boardDecks()
+		state.decks = tuple(deck.getState(seats) for deck in decks)
+		state.jail_cards = tuple(tuple((decks.index(card.deck), card.deck_index) for card in player.jail_free_cards) for player in player_list)
+
+		state.current = current
+		if rng: state.rng_state = main.rng.getstate()
+		return state
+
+	def restore(self, player_list: list) -> None:
+		"""
+		writes this state onto the players (in seat order), main.game and main.rng. players out of the game are
+		marked bankrupt and left out of main.game.position_index, and everyone else is put back in it
+		"""
+		position_index = main.game.position_index
+		if position_index != None: position_index.clear()
+		for seat, player in enumerate(player_list):
+			player._position_index = None
+			player.position = self.positions[seat]
+			player._total_money = self.balances[seat]
+			player.in_jail = bool(self.in_jail[seat])
+			player.jail_turns = self.jail_turns[seat]
+			player.bankrupt = not self.active[seat]
+			creditor = self.creditors[seat]
+			player.creditor = player_list[creditor] if creditor != NO_OWNER else None
+			if position_index != None and not player.bankrupt: player.setPositionIndex(position_index)
+
+		for position, place in enumerate(main.game.board):
+			if not hasattr(place, "owner"): continue
+			owner = self.owners[position]
+			place.owner = player_list[owner] if owner != NO_OWNER else None
+			place.mortgaged = bool(self.mortgaged[position])
+			if isinstance(place, main.Property): place.setHouses(self.houses[position], self.hotels[position])
+
+		decks = main.boardDecks()
+		for deck, deck_state in zip(decks, self.decks): deck.setState(deck_state, player_list)
+		for seat, player in enumerate(player_list):
+			player.jail_free_cards = [decks[deck].cards[index] for deck, index in self.jail_cards[seat]] if self.jail_cards else []
+
+		if self.rng_state != None: main.rng.setstate(self.rng_state)
+
+	def pack(self) -> bytes:
+		"""the state as bytes for saving. every array has a fixed size type, so it can be read back on any machine"""
+		version, rng, gauss = self.rng_state if self.rng_state != None else (None, (), None)
+		return marshal.dumps((len(self.positions), len(self.owners), self.positions.tobytes(), self.balances.tobytes(),
+													self.in_jail.tobytes(), self.jail_turns.tobytes(), self.active.tobytes(), self.creditors.tobytes(),
+													self.owners.tobytes(), self.houses.tobytes(), self.hotels.tobytes(), self.mortgaged.tobytes(), self.decks,
+													self.jail_cards, self.current, version, array("Q", rng).tobytes(), gauss))
+
+	@classmethod
+	def unpack(cls, data: bytes) -> "GameState":
+		(players, squares, positions, balances, in_jail, jail_turns, active, creditors, owners, houses, hotels, mortgaged, decks,
+		 jail_cards, current, version, rng, gauss) = marshal.loads(data)
+		state = cls(players, squares)
+		for name, values in (("positions", positions), ("balances", balances), ("in_jail", in_jail), ("jail_turns", jail_turns),
+												 ("active", active), ("creditors", creditors), ("owners", owners), ("houses", houses), ("hotels", hotels),
+												 ("mortgaged", mortgaged)):
+			column = getattr(state, name)
+			del column[:]
+			column.frombytes(values)
+		state.decks = decks
+		state.jail_cards = jail_cards
+		state.current = current
+		if version != None: state.rng_state = (version, tuple(array("Q", rng)), gauss)
+		return state
+
+	def activePlayers(self, player_list: list) -> list:
+		return [player for seat, player in enumerate(player_list) if self.active[seat]]
+
+	def copy(self) -> "GameState":
+		state = GameState.__new__(GameState)
+		state.positions = self.positions[:]
+		state.balances = self.balances[:]
+		state.in_jail = self.in_jail[:]
+		state.jail_turns = self.jail_turns[:]
+		state.active = self.active[:]
+		state.creditors = self.creditors[:]
+		state.owners = self.owners[:]
+		state.houses = self.houses[:]
+		state.hotels = self.hotels[:]
+		state.mortgaged = self.mortgaged[:]
+		state.decks = self.decks
+		state.jail_cards = self.jail_cards
+		state.current = self.current
+		state.rng_state = self.rng_state # tuples are immutable, so sharing them is safe
+		return state
+
+	__copy__ = copy
+
+	def __deepcopy__(self, memo: dict) -> "GameState":
+		return self.copy()
+
+	def __eq__(self, other: object) -> bool:
+		if not isinstance(other, GameState): return NotImplemented
+		return all(getattr(self, name) == getattr(other, name) for name in GameState.__slots__)
+
+class Snapshots():
+	"""a stack of game states, for undoing moves in a search or stepping back through a replay"""
+	def __init__(self, player_list: list):
+		self.player_list = player_list
+		self._states = []
+
+	def push(self, active: list = None, current: int = 0) -> GameState:
+		state = GameState.capture(self.player_list, active, current)
+		self._states.append(state)
+		return state
+
+	def pop(self) -> GameState:
+		"""restores the most recent snapshot and removes it"""
+		state = self._states.pop()
+		state.restore(self.player_list)
+		return state
+
+	def __len__(self) -> int:
+		return len(self._states)
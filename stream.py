@@ -0,0 +1,268 @@
+"""
+streams the events of simulated games into online aggregators and columnar files, so runs of any number of games
+use the same memory. events come out of gameEvents() a turn at a time and every aggregator keeps a fixed size summary
+"""
+import argparse
+import collections
+import json
+import math
+import os
+import sys
+from array import array
+
+import main
+from main import BotPlayer, ColourTypes
+from simulation import POLICIES, TurnOrder, gameSeed
+
+END_EVENT = 8 # stream only: a game finished. amount is its turns, seat the winner's (the richest at the turn limit)
+EVENT_NAMES = ("roll", "move", "land", "buy", "rent", "card", "jail", "bankrupt", "end")
+
+Event = collections.namedtuple("Event", ["game", "turn", "kind", "seat", "square", "amount"])
+
+def gameEvents(policies: list, games: int, max_turns: int = 1000, seed: int = 0, start: int = 0):
+	"""
+	plays games [start, start+games) of a seeded run with a bot for each policy and yields their Events. the games
+	are the same as simulation.runParallel's for the same seed. only one of these can be running at a time
+	"""
+	buffer = []
+	main.events = buffer
+	try:
+		for game in range(start, start + games):
+			main.rng.seed(gameSeed(seed, game))
+			player_list = [BotPlayer(chr(ord("a") + i), policy) for i, policy in enumerate(policies)]
+			main.setupBoard(player_list)
+			seats = {player: seat for seat, player in enumerate(player_list)}
+
+			order = TurnOrder(player_list.copy(), max_turns=max_turns)
+			while not order.finished():
+				turn = order.turns
+				order.playTurn()
+				for kind, player, square, amount in buffer: yield Event(game, turn, kind, seats[player], square, amount)
+				buffer.clear()
+
+			yield Event(game, order.turns, END_EVENT, seats[order.winner()], 0, order.turns)
+	finally: main.events = None
+
+class Aggregator():
+	"""takes events one at a time and keeps a fixed size summary of them. subclasses override add and result"""
+	def add(self, event: Event) -> None:
+		pass
+
+	def result(self) -> object:
+		return None
+
+	def consume(self, events) -> object:
+		for event in events: self.add(event)
+		return self.result()
+
+class RunningStats():
+	"""count, mean, variance, min and max of numbers added one at a time (welford's method)"""
+	def __init__(self):
+		self.count = 0
+		self.mean = 0.0
+		self._squares = 0.0 # sum of squared differences from the mean
+		self.min = None
+		self.max = None
+
+	def add(self, value: float) -> None:
+		self.count += 1
+		delta = value - self.mean
+		self.mean += delta / self.count
+		self._squares += delta * (value - self.mean)
+		self.min = value if self.min == None else min(self.min, value)
+		self.max = value if self.max == None else max(self.max, value)
+
+	def variance(self) -> float:
+		return self._squares / (self.count - 1) if self.count > 1 else 0.0
+
+	def merge(self, other: "RunningStats") -> None:
+		if not other.count: return
+		count = self.count + other.count
+		delta = other.mean - self.mean
+		self._squares += other._squares + delta*delta * self.count*other.count/count
+		self.mean += delta * other.count/count
+		self.count = count
+		self.min = other.min if self.min == None else min(self.min, other.min)
+		self.max = other.max if self.max == None else max(self.max, other.max)
+
+	def result(self) -> dict:
+		return {"count": self.count, "mean": self.mean, "variance": self.variance(), "min": self.min, "max": self.max}
+
+class QuantileSketch():
+	"""
+	approximate quantiles of numbers added one at a time. values are counted in buckets that grow geometrically, so
+	any quantile is within `relative_accuracy` of a real value and the buckets only grow with the log of the range
+	"""
+	QUANTILES = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+	def __init__(self, relative_accuracy: float = 0.01):
+		self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+		self._log_gamma = math.log(self.gamma)
+		self.positive = {} # bucket -> count
+		self.negative = {}
+		self.zeros = 0
+		self.count = 0
+		self.min = None
+		self.max = None
+
+	def bucket(self, value: float) -> int:
+		return math.ceil(math.log(value) / self._log_gamma)
+
+	def value(self, bucket: int) -> float:
+		return 2 * self.gamma**bucket / (self.gamma + 1) # middle of the bucket
+
+	def add(self, value: float) -> None:
+		self.count += 1
+		self.min = value if self.min == None else min(self.min, value)
+		self.max = value if self.max == None else max(self.max, value)
+		if value > 0:
+			key = self.bucket(value)
+			self.positive[key] = self.positive.get(key, 0) + 1
+		elif value < 0:
+			key = self.bucket(-value)
+			self.negative[key] = self.negative.get(key, 0) + 1
+		else: self.zeros += 1
+
+	def merge(self, other: "QuantileSketch") -> None:
+		for key, count in other.positive.items(): self.positive[key] = self.positive.get(key, 0) + count
+		for key, count in other.negative.items(): self.negative[key] = self.negative.get(key, 0) + count
+		self.zeros += other.zeros
+		self.count += other.count
+		if other.count:
+			self.min = other.min if self.min == None else min(self.min, other.min)
+			self.max = other.max if self.max == None else max(self.max, other.max)
+
+	def quantile(self, q: float) -> float:
+		if not self.count: return None
+		return min(max(self.estimate(q), self.min), self.max)
+
+	def estimate(self, q: float) -> float:
+		rank = q * (self.count - 1)
+		seen = 0
+		for key in sorted(self.negative, reverse=True):
+			seen += self.negative[key]
+			if seen > rank: return -self.value(key)
+		seen += self.zeros
+		if seen > rank: return 0.0
+		for key in sorted(self.positive):
+			seen += self.positive[key]
+			if seen > rank: return self.value(key)
+		return self.max
+
+	def result(self) -> dict:
+		return {f"p{round(q*100)}": self.quantile(q) for q in self.QUANTILES}
+
+class Values(Aggregator):
+	"""feeds one field of the events of one kind into a RunningStats, QuantileSketch or anything with add(value)"""
+	def __init__(self, kind: int, summary: object, field: str = "amount"):
+		self.kind = kind
+		self.summary = summary
+		self.field = field
+
+	def add(self, event: Event) -> None:
+		if event.kind == self.kind: self.summary.add(getattr(event, self.field))
+
+	def result(self) -> object:
+		return self.summary.result()
+
+class SquareIncome(Aggregator):
+	"""rent taken on each square"""
+	def __init__(self, squares: int = 40):
+		self.income = [0]*squares
+
+	def add(self, event: Event) -> None:
+		if event.kind == main.RENT_EVENT: self.income[event.square] += event.amount
+
+	def result(self) -> list:
+		return self.income
+
+def groupName(place: object) -> str:
+	group = getattr(place, "group", None)
+	return group.name if isinstance(group, ColourTypes) else group
+
+class GroupIncome(Aggregator):
+	"""rent taken on each colour group (and the stations and utilities), from the squares of main.game.board"""
+	def __init__(self, board: list = None):
+		self.groups = [groupName(place) for place in (board or main.game.board)]
+		self.income = {group: 0 for group in self.groups if group != None}
+
+	def add(self, event: Event) -> None:
+		if event.kind == main.RENT_EVENT: self.income[self.groups[event.square]] += event.amount
+
+	def result(self) -> dict:
+		return self.income
+
+class Tee(Aggregator):
+	"""passes every event to each of its aggregators. the result is theirs by name"""
+	def __init__(self, **aggregators):
+		self.aggregators = aggregators
+
+	def add(self, event: Event) -> None:
+		for aggregator in self.aggregators.values(): aggregator.add(event)
+
+	def result(self) -> dict:
+		return {name: aggregator.result() for name, aggregator in self.aggregators.items()}
+
+class ColumnWriter(Aggregator):
+	"""
+	appends events to one file per field in `directory`, writing every `flush_every` events. schema.json gives each
+	file's numpy dtype, so a column can be read back with numpy.fromfile
+	"""
+	COLUMNS = (("game", "I", "<u4"), ("turn", "I", "<u4"), ("kind", "B", "u1"), ("seat", "B", "u1"),
+						 ("square", "B", "u1"), ("amount", "i", "<i4"))
+
+	def __init__(self, directory: str, flush_every: int = 1 << 16):
+		self.directory = directory
+		self.flush_every = flush_every
+		self.rows = 0
+		self._columns = [array(typecode) for _, typecode, _ in self.COLUMNS]
+		os.makedirs(directory, exist_ok=True)
+		with open(os.path.join(directory, "schema.json"), "w") as file:
+			json.dump({"columns": {name: dtype for name, _, dtype in self.COLUMNS}, "kinds": EVENT_NAMES}, file, indent=1)
+
+	def add(self, event: Event) -> None:
+		for column, value in zip(self._columns, event): column.append(value)
+		if len(self._columns[0]) >= self.flush_every: self.flush()
+
+	def flush(self) -> None:
+		for (name, _, _), column in zip(self.COLUMNS, self._columns):
+			if sys.byteorder == "big": column.byteswap()
+			with open(os.path.join(self.directory, f"{name}.bin"), "ab") as file: column.tofile(file)
+		self.rows += len(self._columns[0])
+		self._columns = [array(typecode) for _, typecode, _ in self.COLUMNS]
+
+	def result(self) -> int:
+		self.flush()
+		return self.rows
+
+def defaultAggregators(out: str = None, flush_every: int = 1 << 16) -> Tee:
+	aggregators = {
+		"game_turns": Values(END_EVENT, RunningStats()),
+		"game_turn_quantiles": Values(END_EVENT, QuantileSketch()),
+		"rent": Values(main.RENT_EVENT, RunningStats()),
+		"rent_quantiles": Values(main.RENT_EVENT, QuantileSketch()),
+		"bankrupt_turns": Values(main.BANKRUPT_EVENT, RunningStats(), "turn"),
+		"square_income": SquareIncome(),
+		"group_income": GroupIncome(),
+	}
+	if out != None: aggregators["columns"] = ColumnWriter(out, flush_every)
+	return Tee(**aggregators)
+
+def run(argv: list = None) -> None:
+	parser = argparse.ArgumentParser(description="stream the events of many simulated games into running statistics")
+	parser.add_argument("-n", "--games", type=int, default=1000)
+	parser.add_argument("-p", "--players", type=int, default=4)
+	parser.add_argument("--policy", default="buy-all", choices=POLICIES)
+	parser.add_argument("--max-turns", type=int, default=1000)
+	parser.add_argument("-s", "--seed", type=int, default=0)
+	parser.add_argument("-o", "--out", metavar="DIR", help="also write every event to columnar files in DIR")
+	parser.add_argument("--flush-every", type=int, default=1 << 16, help="events buffered between writes to --out")
+	args = parser.parse_args(argv)
+
+	aggregators = defaultAggregators(args.out, args.flush_every)
+	policies = [POLICIES[args.policy]() for _ in range(args.players)]
+	results = aggregators.consume(gameEvents(policies, args.games, args.max_turns, args.seed))
+	print(json.dumps(results, indent=1))
+
+if __name__ == "__main__":
+	run()
@@ -0,0 +1,33 @@
+import main
+from advisor import Advisor
+from main import BotPlayer, Policy
+from markov import MarkovBoard
+
+def test_buying_the_last_of_a_group_counts_the_rent_it_adds_to_the_rest(tmp_path):
+	player = BotPlayer("a", Policy())
+	main.setupBoard([player])
+	advisor = Advisor(3, MarkovBoard(cache_dir=str(tmp_path)))
+	rents = advisor.rents
+	first, second = main.game.board[1], main.game.board[3]
+	assert advisor.adviseBuy(player, second).income == rents[3][0]
+
+	first.owner = player
+	advice = advisor.adviseBuy(player, second)
+	assert abs(advice.income - (rents[1][1] + rents[3][1] - rents[1][0])) < 1e-9
+	assert advice.payback == second.cost / advice.income
+
+def test_build_advice_is_the_rent_of_the_next_building(tmp_path):
+	player = BotPlayer("a", Policy())
+	main.setupBoard([player])
+	chain = MarkovBoard(cache_dir=str(tmp_path))
+	one, three = Advisor(1, chain), Advisor(3, chain)
+	place = main.game.board[39]
+	for other in place.group_places: other.owner = player
+	place.setHouses(2, 0)
+	advice = three.adviseBuild(place)
+	assert advice.cost == place.house_cost
+	assert abs(advice.income - (three.rents[39][4] - three.rents[39][3])) < 1e-9
+	assert abs(advice.income - 3*one.adviseBuild(place).income) < 1e-9
+
+	place.setHouses(0, 1)
+	assert three.adviseBuild(place) == None
@@ -0,0 +1,13 @@
+import main
+from main import BotPlayer, Policy
+
+def test_bankrupt_players_leave_the_board():
+	player_list = [BotPlayer("a", Policy()), BotPlayer("b", Policy())]
+	position_index = main.setupBoard(player_list)
+	player_list[0].position = 5
+	player_list[0].payMoney(2000, creditor=player_list[1])
+	player_list[0].goBankrupt()
+	assert position_index.playersAt(5) == []
+	player_list[0].position = 6 # a bankrupt player being moved doesn't put them back
+	assert position_index.playersAt(6) == []
+	assert position_index.playersAt(0) == [player_list[1]]
@@ -0,0 +1,44 @@
+import numpy as np
+
+from batch import NOBODY, BatchEngine, playBatch
+from simulation import runParallel
+
+def test_batch_games_match_the_scalar_engine():
+	reference = runParallel(200, ["buy-all"]*4, 1000, seed=0, workers=1)
+	batched = playBatch(500, ["buy-all"]*4, 1000, seed=0)
+	difference = np.abs(np.array(reference.landingFrequencies()) - np.array(batched.landingFrequencies()))
+	assert difference.max() < 0.003
+	finished = [1 - stats.timed_out/stats.games for stats in (reference, batched)]
+	assert abs(finished[0] - finished[1]) < 0.1
+	assert abs(reference.turns/reference.games - batched.turns/batched.games) < 50
+
+def test_auctions_go_for_a_pound_over_the_second_bid():
+	engine = BatchEngine(["never-buy", "buy-all", "buy-all"], games=1)
+	engine.money[0] = [1500, 1500, 70]
+	engine.auction(np.array([0]), np.array([0]), np.array([1])) # a £60 place nobody wanted at full price
+	assert engine.owner[0, 1] == 1
+	assert engine.money[0].tolist() == [1500, 1500 - 60, 70]
+
+	engine.money[0] = [1500, 30, 0]
+	engine.auction(np.array([0]), np.array([0]), np.array([3]))
+	assert engine.owner[0, 3] == 1 and engine.money[0, 1] == 29 # nobody else bid
+
+def test_debts_are_covered_by_mortgages_and_go_to_the_creditor():
+	engine = BatchEngine(["buy-all", "buy-all"], games=1)
+	engine.owner[0, [1, 3]] = 0
+	engine.money[0] = [0, 1500]
+	paid = engine.payMoney(np.array([0]), np.array([0]), np.array([20]), np.array([1]))
+	assert paid.tolist() == [20] and engine.mortgaged[0, 1]
+	assert engine.creditor[0, 0] == NOBODY
+
+	paid = engine.payMoney(np.array([0]), np.array([0]), np.array([500]), np.array([1]))
+	assert paid.tolist() == [40] and engine.creditor[0, 0] == 1
+	engine.bankrupt(np.array([0]), np.array([[True, False]]))
+	assert engine.owner[0, 1] == engine.owner[0, 3] == 1 and not engine.alive[0, 0]
+
+def test_get_out_of_jail_free_cards_are_kept_and_used():
+	engine = BatchEngine(["buy-all", "buy-all"], games=1)
+	engine.jail_cards[0, 0, 0] = 1
+	engine.goToJail(np.array([0]), np.array([0]))
+	engine.startTurn(np.array([0]), np.array([0]))
+	assert not engine.in_jail[0, 0] and engine.jail_cards[0].sum() == 0
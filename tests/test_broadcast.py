@@ -0,0 +1,44 @@
+import json
+
+import main
+from broadcast import Broadcaster
+from main import BotPlayer, Policy
+
+def startGame(queue_size: int = 64) -> tuple:
+	player_list = [BotPlayer("a", Policy()), BotPlayer("b", Policy())]
+	broadcaster = Broadcaster(queue_size=queue_size)
+	broadcaster.displayer.setPositionIndex(main.setupBoard(player_list))
+	return player_list, broadcaster
+
+def frames(viewer) -> list:
+	lines = []
+	while not viewer.queue.empty(): lines.append(json.loads(viewer.queue.get_nowait()))
+	return lines
+
+def test_viewers_get_a_keyframe_then_shared_diffs():
+	player_list, broadcaster = startGame()
+	first, second = broadcaster.subscribe(), broadcaster.subscribe()
+	broadcaster.publish()
+	assert [frame["key"] for frame in frames(first)] == [frame["key"] for frame in frames(second)] == [True]
+
+	player_list[0].position = 7
+	frame = broadcaster.publish()
+	assert first.queue.get_nowait() is second.queue.get_nowait() is frame.line()
+	assert not json.loads(frame.line())["key"] and len(frame.diff) < len(frame.line(True))
+	assert broadcaster.publish() == None # nothing moved
+
+	late = broadcaster.subscribe()
+	broadcaster.publish()
+	assert frames(first) == [] and [frame["key"] for frame in frames(late)] == [True]
+
+def test_a_slow_viewer_is_dropped_to_a_keyframe():
+	player_list, broadcaster = startGame(queue_size=2)
+	viewer = broadcaster.subscribe()
+	for position in range(1, 5):
+		player_list[0].position = position
+		broadcaster.publish()
+	assert viewer.dropped == 1
+	assert [(frame["number"], frame["key"]) for frame in frames(viewer)] == [(2, True), (3, False)]
+
+	broadcaster.close()
+	assert viewer.queue.get_nowait() == None
@@ -0,0 +1,46 @@
+import main
+from main import BotPlayer, Policy
+
+def ownBrowns() -> tuple:
+	owner = BotPlayer("a", Policy())
+	main.setupBoard([owner])
+	first, second = main.game.board[1], main.game.board[3]
+	first.owner = owner
+	assert not first.canBuild() # not the whole colour set yet
+	second.owner = owner
+	return owner, first, second
+
+def test_houses_are_built_evenly():
+	owner, first, second = ownBrowns()
+	first.build()
+	assert not first.canBuild() and second.canBuild()
+	second.build()
+	assert first.canBuild()
+
+	second.mortgaged = True
+	assert not first.canBuild()
+
+def test_the_bank_runs_out_of_houses():
+	owner, first, second = ownBrowns()
+	bank = first.bank
+	bank.houses = 1
+	first.build()
+	assert bank.houses == 0 and not second.canBuild()
+
+	first.sellBuilding()
+	assert bank.houses == 1 and second.canBuild()
+
+def test_hotels_give_their_houses_back_to_the_bank():
+	owner, first, second = ownBrowns()
+	houses = first.bank.houses
+	for _ in range(4):
+		first.build()
+		second.build()
+	first.build()
+	assert first.buildings == main.HOTEL_LEVEL and first.bank.houses == houses - 4
+
+	first.bank.houses = 2
+	money = owner.getTotalMoney()
+	first.sellBuilding() # only 2 houses to go back on the place, so the other 2 are sold too
+	assert first.buildings == 2 and first.bank.houses == 0
+	assert owner.getTotalMoney() - money == first.hotel_cost // 2 + first.house_cost
@@ -0,0 +1,43 @@
+import main
+from main import BotPlayer, Policy
+
+def jailFreeDeck() -> main.Deck:
+	return next(deck for deck in main.game.decks if any(isinstance(card, main.jailFreeCard) for card in deck.cards))
+
+def test_every_card_is_drawn_once_before_the_pile_is_shuffled_again():
+	main.setupBoard([BotPlayer("a", Policy())])
+	deck = main.game.decks[0]
+	main.rng.seed(5)
+	first = [deck.draw() for _ in range(2*len(deck.cards))]
+	size = len(deck.cards)
+	assert sorted(card.deck_index for card in first[:size]) == list(range(size))
+	assert sorted(card.deck_index for card in first[size:]) == list(range(size))
+
+	main.setupBoard([BotPlayer("a", Policy())])
+	main.rng.seed(5)
+	assert [deck.draw() for _ in range(2*size)] == first
+
+def test_held_cards_stay_out_of_the_pile_until_used():
+	player = BotPlayer("a", Policy())
+	main.setupBoard([player])
+	deck = jailFreeDeck()
+	card = next(card for card in deck.cards if isinstance(card, main.jailFreeCard))
+	card.play(player)
+	assert player.jail_free_cards == [card]
+
+	drawn = [deck.draw() for _ in range(3*len(deck.cards))]
+	assert card not in drawn
+
+	player.goToJail()
+	player.useJailFreeCard()
+	assert not player.in_jail and player.jail_free_cards == []
+	assert card in [deck.draw() for _ in range(2*len(deck.cards))]
+
+def test_a_bankrupt_players_cards_go_to_their_creditor():
+	player_list = [BotPlayer("a", Policy()), BotPlayer("b", Policy())]
+	main.setupBoard(player_list)
+	card = next(card for card in jailFreeDeck().cards if isinstance(card, main.jailFreeCard))
+	card.play(player_list[1])
+	player_list[1].payMoney(5000, False, creditor=player_list[0])
+	player_list[1].goBankrupt()
+	assert player_list[0].jail_free_cards == [card] and card.deck.held[card.deck_index] is player_list[0]
@@ -0,0 +1,35 @@
+import main
+from main import BELOW_BOARD, LOCK_BOARD, BoardDisplayer, BotPlayer, Policy
+
+def drawn(capsys, displayer: BoardDisplayer) -> str:
+	displayer.printBoard()
+	return capsys.readouterr().out
+
+def test_only_changed_squares_are_drawn(capsys):
+	player_list = [BotPlayer("a", Policy()), BotPlayer("b", Policy())]
+	displayer = BoardDisplayer()
+	displayer.setPositionIndex(main.setupBoard(player_list))
+	assert drawn(capsys, displayer).startswith(LOCK_BOARD) # the first draw is the whole board
+	assert drawn(capsys, displayer) == BELOW_BOARD
+
+	moves = displayer.cellPositions()
+	player_list[0].position = 7
+	output = drawn(capsys, displayer)
+	assert moves[7] in output and moves[0] in output # where they went, and square 0 still has 'b' on it
+	assert output.count("\033[") == 2 + BELOW_BOARD.count("\033[")
+
+	main.game.board[1].owner = player_list[1] # marked, but squares don't show owners so nothing's drawn
+	assert drawn(capsys, displayer) == BELOW_BOARD
+
+	displayer.redraw()
+	assert drawn(capsys, displayer).startswith(LOCK_BOARD)
+
+def test_leaving_jail_marks_the_jail_square(capsys):
+	player = BotPlayer("a", Policy())
+	position_index = main.setupBoard([player])
+	displayer = BoardDisplayer()
+	displayer.setPositionIndex(position_index)
+	player.goToJail()
+	drawn(capsys, displayer)
+	player.getOutJail() # only the colour of the letter changes, and colours are off in tests
+	assert position_index.changed == {10}
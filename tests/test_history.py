@@ -0,0 +1,29 @@
+import numpy as np
+
+import main
+from history import HistoryReader, HistoryWriter, recordGames
+from main import BotPlayer, Policy
+from state import GameState
+
+def test_games_are_found_whatever_order_they_were_appended_in(tmp_path):
+	path = str(tmp_path / "games.history")
+	policies = [Policy(), Policy()]
+	later = recordGames(path, policies, 2, max_turns=30, start=5)
+	earlier = recordGames(path, policies, 2, max_turns=30, start=0)
+	reader = HistoryReader(path)
+	assert len(reader) == (later + earlier) * 2
+
+	for game in (0, 1, 5, 6):
+		rows = reader.game(game)
+		assert len(rows) and (rows["game"] == game).all()
+		assert (np.diff(rows["turn"][::2]) == 1).all()
+	assert len(reader.game(3)) == 0
+
+def test_a_game_split_across_flushes_has_one_entry(tmp_path):
+	path = str(tmp_path / "games.history")
+	player_list = [BotPlayer("a", Policy()), BotPlayer("b", Policy())]
+	main.setupBoard(player_list)
+	writer = HistoryWriter(path, flush_every=4)
+	for turn in range(5): writer.recordTurn(7, turn, GameState.capture(player_list, rng=False))
+	writer.close()
+	assert HistoryReader(path).games == {7: (0, 10)}
@@ -0,0 +1,32 @@
+import pstats
+
+import instrument
+import main
+from main import BotPlayer, Policy
+
+def test_caller_totals_are_in_pstats_order(tmp_path):
+	instruments = instrument.Instrumentation()
+	stats = instruments.functions.setdefault(("main.py", 1, "Player.standingAction"), instrument.FunctionStats())
+	caller = ("main.py", 2, "Player.rollTurn")
+	stats.add(caller, 2.0, 1.0, True)
+	stats.add(caller, 0.5, 0.5, False) # a card moved them and they landed again
+	path = str(tmp_path / "turns.prof")
+	instruments.dumpStats(path)
+
+	calls, primitive_calls, total_time, cumulative_time = pstats.Stats(path).stats[("main.py", 1, "Player.standingAction")][4][caller]
+	assert (calls, primitive_calls, total_time, cumulative_time) == (2, 1, 1.5, 2.0)
+
+def test_rent_paid_counts_what_the_owner_got():
+	payer, owner = BotPlayer("a", Policy()), BotPlayer("b", Policy())
+	main.setupBoard([payer, owner])
+	mortgaged, rented = main.game.board[1], main.game.board[3]
+	mortgaged.owner = payer
+	rented.owner = owner
+	payer.payMoney(payer.getTotalMoney() - 1, False) # £1 left, so the rent needs the mortgage to cover it
+	payer.position = rented.position
+	payer.dice_total = 3
+
+	with instrument.Instrumentation() as instruments:
+		payer.payRent()
+	assert payer.getTotalMoney() == 1 + mortgaged.mortgage_value - rented.getRent(3)
+	assert instruments.per_turn["rent_paid"] == [rented.getRent(3)]
@@ -0,0 +1,19 @@
+import numpy as np
+
+import main
+from landing import LandingEngine
+from main import BotPlayer, Policy
+
+def test_seeded_engines_land_the_same_way():
+	main.setupBoard([BotPlayer("a", Policy())])
+	first, second = (LandingEngine(1000, seed=4).run(20000) for _ in range(2))
+	assert (first == second).all()
+
+def test_tokens_end_up_in_jail_not_on_go_to_jail():
+	main.setupBoard([BotPlayer("a", Policy())])
+	engine = LandingEngine(20000, seed=1)
+	hits = engine.run(200000)
+	go_to_jail = next(place.position for place in engine.tables.board if isinstance(place, main.GoToJail))
+	assert hits[go_to_jail] == 0
+	assert np.argmax(hits) == engine.tables.jail_position
+	assert hits.sum() == 200000
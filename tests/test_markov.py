@@ -0,0 +1,23 @@
+import numpy as np
+
+import main
+from landing import LandingEngine
+from main import BotPlayer, Policy
+from markov import MarkovBoard
+
+def test_occupancy_agrees_with_sampled_landings(tmp_path):
+	main.setupBoard([BotPlayer("a", Policy())])
+	board = MarkovBoard(cache_dir=str(tmp_path))
+	occupancy = board.occupancy()
+	assert abs(occupancy.sum() - 1) < 1e-9
+
+	hits = LandingEngine(100000, seed=2, tables=board.tables).run(2000000)
+	assert np.abs(hits/hits.sum() - occupancy).max() < 0.002
+
+def test_cached_solutions_are_reused(tmp_path):
+	main.setupBoard([BotPlayer("a", Policy())])
+	solved = MarkovBoard(cache_dir=str(tmp_path))
+	assert len(list(tmp_path.iterdir())) == 1
+	cached = MarkovBoard(cache_dir=str(tmp_path))
+	assert (solved.stationary == cached.stationary).all()
+	assert solved.expectedRent() == cached.expectedRent()
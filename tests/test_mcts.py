@@ -0,0 +1,23 @@
+import main
+import mcts
+from main import BotPlayer, Policy
+from ruleset import loadRuleset
+from simulation import playTurns
+
+def test_rollouts_are_played_on_the_game_being_searched():
+	for name in ("uk", "us"):
+		main.rng.seed(0)
+		player_list = [mcts.MCTSPlayer("a", 0.002, workers=0), BotPlayer("b", Policy())]
+		main.setupBoard(player_list, loadRuleset(name))
+		playTurns(player_list.copy(), 20)
+		bots, game = mcts._rollout_games[(loadRuleset(name).key, 2)]
+		assert [place.name for place in game.board if hasattr(place, "name")] == [place.name for place in main.game.board if hasattr(place, "name")]
+
+def test_pools_close():
+	main.rng.seed(0)
+	player_list = [mcts.MCTSPlayer("a", 0.002, workers=1), BotPlayer("b", Policy())]
+	main.setupBoard(player_list, loadRuleset("uk"))
+	playTurns(player_list.copy(), 20)
+	assert mcts._pools
+	mcts.closePools()
+	assert not mcts._pools
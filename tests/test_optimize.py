@@ -0,0 +1,35 @@
+import random
+
+import optimize
+from optimize import GENES, Optimizer, mutate, randomGenes
+
+def tinyOptimizer() -> Optimizer:
+	return Optimizer(population=4, games=2, max_turns=60, seed=3, elite=1, tournament=2)
+
+def test_mutated_genes_stay_in_range():
+	rng = random.Random(0)
+	genes = randomGenes(rng)
+	for _ in range(200):
+		genes = mutate(genes, 1.0, rng)
+		assert all(low <= gene <= high and gene == round(gene, optimize.DECIMALS) for gene, (_, low, high) in zip(genes, GENES))
+
+def test_cached_strategies_are_not_played_again(monkeypatch):
+	optimizer = tinyOptimizer()
+	played = []
+	monkeypatch.setattr(optimize, "fitness", lambda task: played.append(task) or 0.5)
+	optimizer.evaluate()
+	assert len(played) == len({tuple(genes) for genes in optimizer.population})
+	optimizer.evaluate()
+	assert len(played) == len(optimizer.cache)
+
+def test_a_resumed_search_carries_on_the_same_way(tmp_path):
+	straight = tinyOptimizer()
+	for _ in range(2): straight.step()
+
+	path = str(tmp_path / "search.json")
+	stopped = tinyOptimizer()
+	stopped.step()
+	stopped.save(path)
+	resumed = Optimizer.load(path)
+	resumed.step()
+	assert (resumed.population, resumed.cache, resumed.history) == (straight.population, straight.cache, straight.history)
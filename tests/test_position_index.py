@@ -0,0 +1,21 @@
+import main
+from main import BotPlayer, Policy
+from simulation import playGame
+
+def test_the_index_follows_players_through_a_game():
+	for seed in range(3):
+		result = playGame([Policy(), Policy(), Policy(), Policy()], max_turns=300, seed=seed)
+		position_index = main.game.position_index
+		indexed = [(player, position) for position in range(40) for player in position_index.playersAt(position)]
+		assert all(player.position == position and not player.bankrupt for player, position in indexed)
+		assert len(indexed) == 4 - len(result.bankrupt_turns)
+
+def test_bankrupt_players_leave_the_index():
+	player_list = [BotPlayer("a", Policy()), BotPlayer("b", Policy())]
+	position_index = main.setupBoard(player_list)
+	player_list[1].position = 5
+	assert position_index.playersAt(0) == [player_list[0]] and position_index.playersAt(5) == [player_list[1]]
+
+	position_index.changed.clear()
+	player_list[1].goBankrupt()
+	assert position_index.playersAt(5) == [] and position_index.changed == {5}
@@ -0,0 +1,46 @@
+import main
+from main import BotPlayer, Policy
+
+def test_property_rent_follows_the_colour_set_and_buildings():
+	owner = BotPlayer("a", Policy())
+	main.setupBoard([owner])
+	first, second = main.game.board[1], main.game.board[3]
+	first.owner = owner
+	assert first.getRent(7) == first.rent_table[0]
+	second.owner = owner
+	assert first.getRent(7) == first.rent_table[1] == 2*first.rent_table[0]
+	first.setHouses(3, 0)
+	assert first.getRent(7) == first.rent_table[4]
+	first.setHouses(0, 1)
+	assert first.getRent(7) == first.rent_table[6]
+	first.setHouses(0, 0)
+	second.owner = None
+	assert first.getRent(7) == first.rent_table[0]
+
+def test_station_and_utility_rent_count_how_many_are_owned():
+	owner = BotPlayer("a", Policy())
+	main.setupBoard([owner])
+	stations = [place for place in main.game.board if isinstance(place, main.Station)]
+	for owned, station in enumerate(stations):
+		station.owner = owner
+		assert stations[0].getRent(7) == station.getRent(7) == station.rent_table[owned]
+
+	utilities = [place for place in main.game.board if isinstance(place, main.Utility)]
+	utilities[0].owner = owner
+	assert utilities[0].getRent(9) == 9*utilities[0].rent_table[0]
+	utilities[1].owner = owner
+	assert utilities[0].getRent(9) == 9*utilities[0].rent_table[1]
+
+def test_landing_pays_the_rent_in_the_table():
+	owner, visitor = BotPlayer("a", Policy()), BotPlayer("b", Policy())
+	main.setupBoard([owner, visitor])
+	place = main.game.board[5]
+	place.owner = owner
+	visitor.position = 5
+	money = owner.getTotalMoney(), visitor.getTotalMoney()
+	place.landAction(visitor)
+	assert owner.getTotalMoney() - money[0] == money[1] - visitor.getTotalMoney() == place.rent_table[0]
+
+	place.mortgaged = True
+	place.landAction(visitor)
+	assert owner.getTotalMoney() - money[0] == place.rent_table[0]
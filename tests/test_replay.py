@@ -0,0 +1,79 @@
+import builtins
+import contextlib
+import io
+import random
+
+import main
+import replay
+from main import BotPlayer, Player, Policy
+from simulation import TurnOrder
+
+def recordMixedGame(path: str, turns: int, seed: int) -> list:
+	"""plays a game between a person answering prompts at random and a bot, recording it. returns the players"""
+	answers = random.Random(seed)
+	old_input, old_sleep, old_log = builtins.input, main.time.sleep, main.game_log
+	builtins.input = lambda prompt="": answers.choice(["y", "n", "e", "", "1", "0", "15"])
+	main.time.sleep = lambda seconds: None
+	main.rng.seed(seed)
+	player_list = [Player("a"), BotPlayer("b", Policy())]
+	displayer = main.BoardDisplayer()
+	displayer.setPositionIndex(main.setupBoard(player_list))
+	for player in player_list: player.setBoardDisplayer(displayer)
+
+	log = replay.GameLog(path)
+	log.startGame([player.letter for player in player_list])
+	main.game_log = log
+	try:
+		with contextlib.redirect_stdout(io.StringIO()):
+			order = TurnOrder(player_list.copy())
+			while not order.finished() and order.turns < turns: order.playTurn()
+	finally:
+		builtins.input, main.time.sleep, main.game_log = old_input, old_sleep, old_log
+		log.close()
+	return player_list
+
+def test_replays_a_game_with_a_person_playing(tmp_path):
+	path = str(tmp_path / "game.log")
+	for seed in range(3):
+		recorded = recordMixedGame(path, 120, seed)
+		game = list(replay.readGames(path))[seed]
+		replayed = replay.Replayer(game).run()
+		assert [player.getTotalMoney() for player in replayed] == [player.getTotalMoney() for player in recorded]
+		assert [player.position for player in replayed] == [player.position for player in recorded]
+
+def test_replays_a_game_with_an_mcts_seat(tmp_path):
+	import mcts
+	path = str(tmp_path / "game.log")
+	for workers in (0, 1):
+		log = replay.GameLog(path)
+		try: result = replay.recordGame(log, [mcts.MCTSPolicy(0.002, workers, seed=workers), Policy()], 200, workers)
+		finally: log.close()
+		game = list(replay.readGames(path))[workers]
+		replayed = replay.Replayer(game).run()
+		assert {player.letter: player.getTotalMoney() for player in replayed} == result.balances
+	mcts.closePools()
+
+def test_amounts_of_any_size_round_trip(tmp_path):
+	log = replay.GameLog(str(tmp_path / "game.log"))
+	for amount in (0, 63, 64, 262143, 262144, 10**9):
+		encoded = log.amount(amount)
+		assert all(byte < replay.MAX_CARDS for byte in encoded)
+		assert replay.EventCursor(encoded).amount() == amount
+	log.close()
+
+def test_seeking_back_keeps_the_bankruptcies_before_the_keyframe(tmp_path):
+	for seed in range(50): # a game where somebody goes bankrupt well before it ends
+		path = str(tmp_path / f"{seed}.log")
+		log = replay.GameLog(path)
+		try: result = replay.recordGame(log, [Policy() for _ in range(4)], 1000, seed)
+		finally: log.close()
+		if result.bankrupt_turns and min(result.bankrupt_turns.values()) + 20 < result.turns: break
+	game = next(replay.readGames(path))
+	replayer = replay.Replayer(game, keyframe_every=10)
+	replayer.run()
+	assert replayer.order.bankrupt_turns == result.bankrupt_turns
+
+	first = min(result.bankrupt_turns.values())
+	turn = first - first % 10 + 10 # a keyframe after the first bankruptcy
+	replayer.seek(turn)
+	assert replayer.order.bankrupt_turns == {letter: bankrupt for letter, bankrupt in result.bankrupt_turns.items() if bankrupt <= turn}
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+import ruleset
+
+def test_decks_of_only_get_out_of_jail_free_cards_are_rejected(tmp_path):
+	with open(ruleset.rulesetPath("uk")) as file: data = json.load(file)
+	data["decks"]["chance"] = [{"type": "jail_free"}, {"type": "jail_free"}]
+	path = tmp_path / "jail-free.json"
+	path.write_text(json.dumps(data))
+	with pytest.raises(ruleset.RulesetError, match="isn't get out of jail free"):
+		ruleset.loadRuleset(str(path), str(tmp_path / "cache"))
+
+def test_us_cards_have_their_own_decks_and_currency(tmp_path):
+	uk = ruleset.loadRuleset("uk", str(tmp_path))
+	us = ruleset.loadRuleset("us", str(tmp_path))
+	assert (uk.currency, us.currency) == ("£", "$")
+	assert us.decks["chance"] != uk.decks["chance"]
+	cards = [us.buildCard(card, []) for deck in us.decks.values() for card in deck]
+	described = [card.description for card in cards if "£" in card.description or "$" in card.description]
+	assert described and all("£" not in text for text in described)
+
+def test_a_blank_currency_is_rejected(tmp_path):
+	with open(ruleset.rulesetPath("uk")) as file: data = json.load(file)
+	data["currency"] = ""
+	path = tmp_path / "blank.json"
+	path.write_text(json.dumps(data))
+	with pytest.raises(ruleset.RulesetError, match="currency"):
+		ruleset.loadRuleset(str(path), str(tmp_path / "cache"))
@@ -0,0 +1,38 @@
+import asyncio
+import json
+
+from server import GameServer
+
+async def playAtTable(messages: list) -> list:
+	"""sends `messages` to a server with one table and reads what comes back until the connection closes"""
+	game_server = GameServer(max_turns=20, decision_timeout=0.01)
+	server = await asyncio.start_server(game_server.handleClient, "127.0.0.1", 0)
+	port = server.sockets[0].getsockname()[1]
+	async with server:
+		reader, writer = await asyncio.open_connection("127.0.0.1", port)
+		for message in messages: writer.write(json.dumps(message).encode() + b"\n")
+		await writer.drain()
+		received = []
+		while True:
+			line = await asyncio.wait_for(reader.readline(), 10)
+			if not line: break
+			received.append(json.loads(line))
+		writer.close()
+	return received
+
+def test_a_bad_join_is_an_error_not_a_dropped_connection():
+	received = asyncio.run(playAtTable([
+		{"type": "join", "table": "t", "letter": "a", "seats": None},
+		{"type": "join", "table": "t", "letter": "a", "bots": []},
+		{"type": "join", "table": "t", "letter": "a", "seats": 2, "bots": 1},
+	]))
+	assert [message["type"] for message in received[:3]] == ["error", "error", "joined"]
+	assert received[2]["seat"] == 1 and received[2]["waiting"] == 0
+
+def test_a_table_plays_to_the_end_when_nobody_answers():
+	received = asyncio.run(playAtTable([{"type": "join", "table": "t", "letter": "a", "seats": 2, "bots": 1}]))
+	kinds = [message["type"] for message in received]
+	assert kinds[:2] == ["joined", "start"]
+	assert kinds.count("turn") == 20 and "decide" in kinds # every question timed out as a no
+	assert received[-1] == {"type": "game_over", "winner": received[-1]["winner"], "turns": 20}
+	assert received[-1]["winner"] in ("1", "a")
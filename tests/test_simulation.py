@@ -0,0 +1,51 @@
+import main
+from main import BotPlayer, Policy
+from simulation import TurnOrder, gameResult, playGame, runParallel
+
+def test_the_richest_player_wins_at_the_turn_limit():
+	player_list = [BotPlayer("a", Policy()), BotPlayer("b", Policy()), BotPlayer("c", Policy())]
+	main.setupBoard(player_list)
+	player_list[1].giveMoney(500)
+	order = TurnOrder(player_list.copy(), max_turns=0)
+	assert order.finished()
+	assert order.winner() == player_list[1]
+
+	result = gameResult(player_list, order.active, order.turns, order.bankrupt_turns)
+	assert result.winner == "b" and result.timed_out
+
+def test_net_worth_counts_places_and_buildings():
+	player = BotPlayer("a", Policy())
+	main.setupBoard([player])
+	place = main.game.board[1]
+	place.owner = player
+	place.setHouses(2, 0)
+	assert player.netWorth() == player.getTotalMoney() + place.cost + 2*place.house_cost
+
+def test_every_game_has_a_winner():
+	for seed in range(5):
+		result = playGame([Policy(), Policy(), Policy(), Policy()], max_turns=100, seed=seed)
+		assert result.winner in "abcd"
+		assert result.timed_out == (result.turns == 100)
+
+def test_seeded_games_play_the_same_way():
+	first, second = (playGame([Policy(), Policy(), Policy()], max_turns=200, seed=3) for _ in range(2))
+	assert (first.winner, first.turns, first.balances, first.landings) == (second.winner, second.turns, second.balances, second.landings)
+
+def test_players_in_debt_go_bankrupt_at_the_end_of_the_turn():
+	player_list = [BotPlayer("a", Policy()), BotPlayer("b", Policy()), BotPlayer("c", Policy())]
+	main.setupBoard(player_list)
+	main.game.board[1].owner = player_list[2]
+	player_list[2].payMoney(5000, False, creditor=player_list[0]) # owes more than their place can raise
+	order = TurnOrder(player_list.copy())
+	order.endTurn(player_list[0])
+
+	assert order.active == player_list[:2] and order.current() == player_list[1]
+	assert player_list[2].bankrupt and order.bankrupt_turns == {"c": 1}
+	assert main.game.board[1].owner == player_list[0]
+
+def test_parallel_runs_do_not_depend_on_the_worker_count():
+	names = ["buy-all", "reserve", "never-buy"]
+	single = runParallel(12, names, max_turns=150, seed=7, workers=1, chunk_size=5)
+	pooled = runParallel(12, names, max_turns=150, seed=7, workers=2, chunk_size=3)
+	assert single.games == pooled.games == 12
+	assert vars(single) == vars(pooled)
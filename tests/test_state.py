@@ -0,0 +1,34 @@
+import main
+from main import BotPlayer, Policy
+from simulation import TurnOrder
+from state import GameState
+
+def playUntilBankrupt(seed: int) -> tuple:
+	main.rng.seed(seed)
+	player_list = [BotPlayer(letter, Policy()) for letter in "abcd"]
+	main.setupBoard(player_list)
+	order = TurnOrder(player_list.copy())
+	while len(order.active) == len(player_list): order.playTurn()
+	return player_list, order
+
+def test_restore_puts_back_bankruptcy_creditors_and_the_position_index():
+	player_list, order = playUntilBankrupt(1)
+	state = GameState.capture(player_list, order.active)
+	bankrupt = [player.bankrupt for player in player_list]
+	squares = [list(main.game.position_index.playersAt(square)) for square in range(40)]
+
+	for player in player_list:
+		player.bankrupt = False
+		player.creditor = player_list[0]
+		player.position = 7 if player._position_index != None else player.position
+	GameState.unpack(state.pack()).restore(player_list)
+
+	assert [player.bankrupt for player in player_list] == bankrupt
+	assert [main.game.position_index.playersAt(square) for square in range(40)] == squares
+	assert GameState.capture(player_list, order.active) == state
+
+def test_packed_states_have_the_same_size_on_every_machine():
+	player_list, order = playUntilBankrupt(1)
+	state = GameState.capture(player_list, order.active)
+	assert state.balances.itemsize == 8
+	assert GameState.unpack(state.pack()) == state
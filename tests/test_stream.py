@@ -0,0 +1,45 @@
+import random
+import statistics
+
+import numpy as np
+
+from main import Policy
+from simulation import runParallel
+from stream import END_EVENT, ColumnWriter, QuantileSketch, RunningStats, gameEvents
+
+def test_running_stats_match_the_whole_data():
+	rng = random.Random(1)
+	values = [rng.gauss(100, 30) for _ in range(1000)]
+	first, second = RunningStats(), RunningStats()
+	for value in values[:300]: first.add(value)
+	for value in values[300:]: second.add(value)
+	first.merge(second)
+	assert first.count == len(values) and (first.min, first.max) == (min(values), max(values))
+	assert abs(first.mean - statistics.mean(values)) < 1e-9
+	assert abs(first.variance() - statistics.variance(values)) < 1e-6
+
+def test_quantiles_are_within_the_relative_accuracy():
+	rng = random.Random(2)
+	values = [rng.expovariate(0.01) for _ in range(2000)]
+	sketch = QuantileSketch(0.01)
+	for value in values: sketch.add(value)
+	ordered = sorted(values)
+	for q in (0.1, 0.5, 0.9):
+		exact = ordered[round(q*(len(values) - 1))]
+		assert abs(sketch.quantile(q) - exact) <= 0.03*exact
+
+def test_streamed_games_are_the_seeded_runs():
+	ends = [event for event in gameEvents([Policy(), Policy(), Policy()], 6, max_turns=150, seed=2) if event.kind == END_EVENT]
+	stats = runParallel(6, ["buy-all"]*3, max_turns=150, seed=2, workers=1)
+	assert sum(event.amount for event in ends) == stats.turns
+	wins = {}
+	for event in ends: wins["abc"[event.seat]] = wins.get("abc"[event.seat], 0) + 1
+	assert wins == stats.wins
+
+def test_columns_read_back_as_the_events(tmp_path):
+	events = list(gameEvents([Policy(), Policy()], 2, max_turns=50, seed=1))
+	writer = ColumnWriter(str(tmp_path), flush_every=100)
+	assert writer.consume(events) == len(events)
+	for field, dtype in (("turn", "<u4"), ("square", "u1"), ("amount", "<i4")):
+		column = np.fromfile(str(tmp_path / f"{field}.bin"), dtype=dtype)
+		assert column.tolist() == [getattr(event, field) for event in events]
@@ -0,0 +1,25 @@
+import pytest
+
+import tournament
+from simulation import runParallel
+from tournament import Tournament, TournamentGame
+
+def test_a_resumed_tournament_matches_a_parallel_run(tmp_path, monkeypatch):
+	names = ["buy-all", "reserve", "never-buy"]
+	path = str(tmp_path / "checkpoint.bin")
+	play = TournamentGame.play
+	slices = []
+	def dies(game: TournamentGame, turns: int, max_turns: int) -> None:
+		slices.append(game.index)
+		if len(slices) == 12: raise KeyboardInterrupt
+		play(game, turns, max_turns)
+	monkeypatch.setattr(TournamentGame, "play", dies)
+	monkeypatch.setattr(tournament, "SLICE_TURNS", 10)
+	with pytest.raises(KeyboardInterrupt):
+		Tournament(8, names, max_turns=120, seed=4, in_flight=3).run(path, interval=0)
+
+	monkeypatch.setattr(TournamentGame, "play", play)
+	resumed = Tournament.load(path)
+	assert resumed.playing and resumed.started < 8
+	stats = resumed.run(path, interval=0)
+	assert vars(stats) == vars(runParallel(8, names, max_turns=120, seed=4, workers=1))
@@ -0,0 +1,236 @@
+"""
+plays a long tournament of seeded bot games with many of them in flight at once, each taking a slice of turns in
+turn, and checkpoints it so a run that dies can carry on. a checkpoint is a state.GameState of every game in flight
+(which covers its rng) and the totals of the finished ones. capturing it between slices only copies arrays. packing,
+compressing and writing it happen on a background thread while the games carry on, and the file is written next to
+the checkpoint, synced and moved over it, so a crash always leaves the last whole checkpoint.
+
+every game has its own rng seeded with simulation.gameSeed, so the stats match simulation.runParallel's for the same
+seed however many times the tournament was stopped and resumed
+"""
+import argparse
+import marshal
+import os
+import random
+import threading
+import time
+import zlib
+from array import array
+
+import main
+from main import BotPlayer
+from ruleset import DEFAULT_RULESET, loadRuleset
+from simulation import POLICIES, Stats, TurnOrder, gameResult, gameSeed, printSummary
+from state import GameState
+
+CHECKPOINT_VERSION = 3
+SLICE_TURNS = 20 # turns a game plays before the next game in flight gets a go
+
+class TournamentGame():
+	"""one game in flight, with a board, players and rng of its own. like server tables, it swaps them in with activate()"""
+	def __init__(self, index: int, policies: list, seed: int, ruleset: object):
+		self.index = index
+		self.rng = random.Random(gameSeed(seed, index))
+		self.game = main.Game(ruleset)
+		self.activate()
+		self.players = [BotPlayer(chr(ord("a") + seat), policy) for seat, policy in enumerate(policies)]
+		main.setupBoard(self.players)
+		self.order = TurnOrder(self.players.copy())
+
+	def activate(self) -> None:
+		main.game = self.game
+		main.rng = self.rng
+
+	def finished(self, max_turns: int) -> bool:
+		return self.order.finished() or self.order.turns >= max_turns
+
+	def play(self, turns: int, max_turns: int) -> None:
+		self.activate()
+		for _ in range(turns):
+			if self.finished(max_turns): return
+			self.order.playTurn()
+
+	def result(self) -> object:
+		return gameResult(self.players, self.order.active, self.order.turns, self.order.bankrupt_turns)
+
+	def capture(self) -> tuple:
+		"""the game between turns as (index, GameState, turns, bankrupt turns, landings), sharing nothing that changes"""
+		self.activate()
+		current = self.players.index(self.order.current()) if self.order.active else 0
+		state = GameState.capture(self.players, self.order.active, current)
+		landings = array("q", [count for player in self.players for count in player.landings])
+		return (self.index, state, self.order.turns, tuple(self.order.bankrupt_turns.items()), landings)
+
+	@classmethod
+	def restore(cls, captured: tuple, policies: list, seed: int, ruleset: object) -> "TournamentGame":
+		index, state, turns, bankrupt_turns, landings = captured
+		game = cls(index, policies, seed, ruleset)
+		state.restore(game.players) # game.rng is main.rng, so this puts it back too
+		active = state.activePlayers(game.players)
+		for seat, player in enumerate(game.players):
+			player.landings = landings[seat*len(player.landings):(seat + 1)*len(player.landings)].tolist()
+		game.order.active[:] = active
+		game.order.next = active.index(game.players[state.current]) if active else 0
+		game.order.turns = turns
+		game.order.bankrupt_turns = dict(bankrupt_turns)
+		return game
+
+class CheckpointWriter():
+	"""
+	writes checkpoints on a background thread. a checkpoint submitted while the last is still being written waits,
+	and is replaced if a newer one comes first, so a slow disk costs checkpoints rather than turns
+	"""
+	def __init__(self, path: str):
+		self.path = path
+		self.written = 0
+		self.error = None
+		self._pending = None
+		self._closed = False
+		self._condition = threading.Condition()
+		self._thread = threading.Thread(target=self.work, daemon=True)
+		self._thread.start()
+
+	def submit(self, checkpoint: tuple) -> None:
+		if self.error != None: raise self.error
+		with self._condition:
+			self._pending = checkpoint
+			self._condition.notify()
+
+	def work(self) -> None:
+		while True:
+			with self._condition:
+				while self._pending == None and not self._closed: self._condition.wait()
+				if self._pending == None: return
+				checkpoint, self._pending = self._pending, None
+			try: writeCheckpoint(self.path, checkpoint)
+			except OSError as error:
+				self.error = error
+				return
+			self.written += 1
+
+	def close(self) -> None:
+		"""waits for the last checkpoint submitted to be written"""
+		with self._condition:
+			self._closed = True
+			self._condition.notify()
+		self._thread.join()
+		if self.error != None: raise self.error
+
+def writeCheckpoint(path: str, checkpoint: tuple) -> None:
+	settings, started, stats, games = checkpoint
+	games = tuple((index, state.pack(), turns, bankrupt_turns, landings.tobytes()) for index, state, turns, bankrupt_turns, landings in games)
+	data = zlib.compress(marshal.dumps((CHECKPOINT_VERSION, settings, started, stats, games)), 1)
+
+	directory = os.path.dirname(os.path.abspath(path))
+	os.makedirs(directory, exist_ok=True)
+	temp_path = f"{path}.{os.getpid()}.tmp"
+	with open(temp_path, "wb") as file:
+		file.write(data)
+		file.flush()
+		os.fsync(file.fileno())
+	os.replace(temp_path, path)
+
+class Tournament():
+	"""`games` seeded games between bots with the policies in `policy_names`, `in_flight` of them being played at once"""
+	def __init__(self, games: int, policy_names: list, max_turns: int = 1000, seed: int = 0, in_flight: int = 1000,
+							 ruleset_name: str = None):
+		self.games = games
+		self.policy_names = policy_names
+		self.max_turns = max_turns
+		self.seed = seed
+		self.in_flight = in_flight
+		self.ruleset_name = ruleset_name
+
+		self.ruleset = loadRuleset(ruleset_name or DEFAULT_RULESET)
+		self.policies = [POLICIES[name]() for name in policy_names]
+		self.stats = Stats()
+		self.started = 0 # games started, so the next game's index
+		self.playing = []
+
+	def settings(self) -> dict:
+		return {"games": self.games, "policy_names": self.policy_names, "max_turns": self.max_turns, "seed": self.seed,
+						"in_flight": self.in_flight, "ruleset_name": self.ruleset_name}
+
+	def fill(self) -> None:
+		while len(self.playing) < self.in_flight and self.started < self.games:
+			self.playing.append(TournamentGame(self.started, self.policies, self.seed, self.ruleset))
+			self.started += 1
+
+	def run(self, checkpoint_path: str = None, interval: float = 10.0) -> Stats:
+		"""plays every game, checkpointing to `checkpoint_path` every `interval` seconds and when it's done"""
+		writer = CheckpointWriter(checkpoint_path) if checkpoint_path else None
+		live_game, live_rng = main.game, main.rng
+		last_checkpoint = time.perf_counter()
+		try:
+			self.fill()
+			while self.playing:
+				for game in self.playing: game.play(SLICE_TURNS, self.max_turns)
+				for game in self.playing:
+					if game.finished(self.max_turns): self.stats.add(game.result())
+				self.playing = [game for game in self.playing if not game.finished(self.max_turns)]
+				self.fill()
+				if writer != None and time.perf_counter() - last_checkpoint >= interval:
+					writer.submit(self.capture())
+					last_checkpoint = time.perf_counter()
+			if writer != None: writer.submit(self.capture())
+		finally:
+			main.game, main.rng = live_game, live_rng
+			if writer != None: writer.close()
+		return self.stats
+
+	def capture(self) -> tuple:
+		stats = self.stats
+		totals = (stats.games, stats.turns, tuple(stats.wins.items()), stats.timed_out, tuple(stats.landings), stats.bankruptcies,
+			stats.bankrupt_turn_total)
+		return (self.settings(), self.started, totals, tuple(game.capture() for game in self.playing))
+
+	@classmethod
+	def load(cls, path: str) -> "Tournament":
+		with open(path, "rb") as file: data = file.read()
+		version, settings, started, totals, games = marshal.loads(zlib.decompress(data))
+		if version != CHECKPOINT_VERSION: raise ValueError(f"{path} is a version {version} checkpoint, not {CHECKPOINT_VERSION}")
+
+		tournament = cls(**settings)
+		tournament.started = started
+		stats = tournament.stats
+		stats.games, stats.turns, wins, stats.timed_out, landings, stats.bankruptcies, stats.bankrupt_turn_total = totals
+		stats.wins = dict(wins)
+		stats.landings = list(landings)
+
+		live_game, live_rng = main.game, main.rng
+		try:
+			for index, state, turns, bankrupt_turns, landings in games:
+				captured = (index, GameState.unpack(state), turns, bankrupt_turns, array("q", landings))
+				tournament.playing.append(TournamentGame.restore(captured, tournament.policies, tournament.seed, tournament.ruleset))
+		finally: main.game, main.rng = live_game, live_rng
+		return tournament
+
+def run(argv: list = None) -> None:
+	parser = argparse.ArgumentParser(description="play a long bot tournament that can be stopped and resumed")
+	parser.add_argument("-n", "--games", type=int, default=10000)
+	parser.add_argument("-p", "--players", type=int, default=4)
+	parser.add_argument("--policy", choices=POLICIES, action="append", dest="policies",
+											help="policy for each seat, repeat to give seats different policies")
+	parser.add_argument("--max-turns", type=int, default=1000)
+	parser.add_argument("-s", "--seed", type=int, default=0)
+	parser.add_argument("--in-flight", type=int, default=1000, help="games played at once")
+	parser.add_argument("-r", "--ruleset", help="a board from rulesets/ or the path of a ruleset json file (default uk)")
+	parser.add_argument("-c", "--checkpoint", default="tournament-checkpoint.bin")
+	parser.add_argument("-i", "--interval", type=float, default=10.0, help="seconds between checkpoints")
+	parser.add_argument("--resume", action="store_true", help="carry on from the checkpoint, ignoring the other settings")
+	args = parser.parse_args(argv)
+
+	start = time.perf_counter()
+	if args.resume and os.path.exists(args.checkpoint):
+		tournament = Tournament.load(args.checkpoint)
+		print(f"resumed {len(tournament.playing)} games in flight and {tournament.stats.games} finished in {time.perf_counter() - start:.2f}s")
+	else:
+		names = args.policies or ["buy-all"]
+		policy_names = [names[i % len(names)] for i in range(args.players)]
+		tournament = Tournament(args.games, policy_names, args.max_turns, args.seed, args.in_flight, args.ruleset)
+
+	stats = tournament.run(args.checkpoint, args.interval)
+	printSummary(stats, time.perf_counter() - start)
+
+if __name__ == "__main__":
+	run()